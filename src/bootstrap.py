@@ -9,7 +9,6 @@ from loguru import logger
 from pydantic.alias_generators import to_camel
 from sentry_sdk.integrations.loguru import LoggingLevels, LoguruIntegration
 from starlette.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 
 from integrations.redis.client import RedisClient
 from integrations.sql_alchemy.client import SQLAlchemyClient
@@ -17,12 +16,20 @@ from logger import AppLogger
 from settings import Settings
 from transport.depends import get_current_user, init_ctx_db_session
 from transport.error_handlers import setup_fastapi_error_handlers
-from transport.handlers import admin_router, market_router, notification_router, order_router, user_router
+from transport.handlers import (
+    admin_router,
+    market_router,
+    notification_router,
+    order_router,
+    user_router,
+    waiting_room_router,
+)
 from transport.handlers.client.cdek_widget.entrypoints import cdek_router
 from transport.middlewares import FastAPILoggingRoute, TraceIdMiddleware
 from transport.middlewares.errors_handler_middleware import ErrorsHandlerMiddleware
-from transport.middlewares.prepare_session_middleware import PrepareSessionMiddleware
+from transport.middlewares.redis_session_middleware import RedisSessionMiddleware
 from utils import get_release_version
+from workers import WORKERS
 
 
 @asynccontextmanager
@@ -38,8 +45,15 @@ async def _lifespan(
     await redis.check_connection()
     redis.init_cache()
 
+    workers = [worker() for worker in WORKERS if worker.is_enabled()] if Settings().env.workers_enabled else []
+    for worker in workers:
+        worker.start()
+
     yield
 
+    for worker in workers:
+        await worker.stop()
+
     await SQLAlchemyClient().close()
     await RedisClient().close()
     logger.trace('Lifespan finished')
@@ -72,6 +86,7 @@ def setup_api_routers(
     api_router.include_router(callback_router)
 
     app.include_router(api_router)
+    app.include_router(waiting_room_router, prefix='/api')
 
 
 def setup_entrypoints_query_params_camel_case_alias(app: FastAPI) -> None:
@@ -107,8 +122,7 @@ def setup_middlewares(
 
     setup_fastapi_error_handlers(app, is_debug=settings.env.debug)
     app.add_middleware(ErrorsHandlerMiddleware, is_debug=settings.env.debug)
-    app.add_middleware(PrepareSessionMiddleware)
-    app.add_middleware(SessionMiddleware, secret_key=settings.env.backend.session_secret_key)
+    app.add_middleware(RedisSessionMiddleware)
     app.add_middleware(TraceIdMiddleware)
 
     app.add_middleware(
@@ -9,6 +9,8 @@ CONSTRAINT_NAMING_CONVENTIONS = {
     'pk': 'pk_%(table_name)s',
 }
 
+SEARCH_TEXT_CONFIG = 'russian'
+
 
 class InvoiceStatus(StrEnum):
     CREATED = 'CREATED'
@@ -32,3 +34,9 @@ class DeliveryCostType(StrEnum):
     FULL = 'FULL'
     FOREIGN = 'FOREIGN'
     NOT = 'NOT'
+
+
+class CatalogSortOrder(StrEnum):
+    NEWEST = 'NEWEST'
+    PRICE_ASC = 'PRICE_ASC'
+    PRICE_DESC = 'PRICE_DESC'
@@ -9,7 +9,10 @@ from pydantic.alias_generators import to_snake
 from sqlalchemy import (
     BigInteger,
     CheckConstraint,
+    Computed,
     DateTime as SQLAlchemyDateTime,
+    DDL,
+    event,
     ForeignKey,
     Index,
     JSON,
@@ -18,10 +21,11 @@ from sqlalchemy import (
     UniqueConstraint,
     Date as SQLAlchemyDate,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, declared_attr, Mapped, mapped_column, relationship
 
-from database.constants import CONSTRAINT_NAMING_CONVENTIONS
+from database.constants import CONSTRAINT_NAMING_CONVENTIONS, SEARCH_TEXT_CONFIG
 from integrations.sql_alchemy.utils import force_default_column_arguments_before_commit
 
 force_default_column_arguments_before_commit()
@@ -38,6 +42,9 @@ class BaseDeclarative(DeclarativeBase):
     }
 
 
+event.listen(BaseDeclarative.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+
+
 class BaseORM(AsyncAttrs, BaseDeclarative):
     __abstract__ = True
 
@@ -93,11 +100,25 @@ class AttachmentORM(BaseORM):
 
 
 class ProductORM(BaseORM):
+    __table_args__ = (
+        Index('idx_product_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_product_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+    )
+
     category_id: Mapped[UUID] = mapped_column(ForeignKey('product_category.id'), nullable=False)
 
     title: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     physical_properties: Mapped[Json] = mapped_column(nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     filters: Mapped[list[FilterORM]] = relationship(
         secondary='product_filter',
@@ -114,6 +135,11 @@ class ProductORM(BaseORM):
 
 
 class ProductFilterORM(BaseORM):
+    __table_args__ = (
+        Index('idx_product_filter_filter_product', 'filter_id', 'product_id'),
+        Index('idx_product_filter_product_filter', 'product_id', 'filter_id'),
+    )
+
     filter_id: Mapped[UUID] = mapped_column(ForeignKey('filter.id'), nullable=False)
     product_id: Mapped[UUID] = mapped_column(ForeignKey('product.id'), nullable=False)
 
@@ -152,6 +178,8 @@ class PreorderORM(BaseORM):
 
 
 class PublicationORM(BaseORM):
+    __table_args__ = (Index('idx_publication_type_id', 'type', 'id'),)
+
     preorder_id: Mapped[UUID | None] = mapped_column(ForeignKey('preorder.id'), nullable=True, index=True)
     type: Mapped[str] = mapped_column(nullable=False, index=True)
     link: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
@@ -178,7 +206,12 @@ class CreditPlanORM(BaseORM):
 
 
 class CatalogItemORM(BaseORM):
-    __table_args__ = (CheckConstraint('quantity IS NULL OR ordered_quantity <= quantity', name='quantity_limit'),)
+    __table_args__ = (
+        CheckConstraint('quantity IS NULL OR ordered_quantity <= quantity', name='quantity_limit'),
+        Index('idx_catalog_item_active_price', 'is_active', 'price', 'id'),
+        Index('idx_catalog_item_active_created_at', 'is_active', 'created_at', 'id'),
+        Index('idx_catalog_item_publication_active', 'publication_id', 'is_active'),
+    )
 
     publication_id: Mapped[UUID] = mapped_column(ForeignKey('publication.id'), nullable=False, index=True)
     product_id: Mapped[UUID] = mapped_column(ForeignKey('product.id'), nullable=False)
@@ -189,12 +222,36 @@ class CatalogItemORM(BaseORM):
     index: Mapped[int | None] = mapped_column(nullable=True)
     quantity: Mapped[int] = mapped_column(nullable=True)
     ordered_quantity: Mapped[int] = mapped_column(nullable=False, default=0)
+    stock_shards: Mapped[int] = mapped_column(nullable=False, default=1, server_default='1')
 
     credit_plan: Mapped[CreditPlanORM] = relationship(back_populates='catalog_items', lazy='selectin')
     product: Mapped[ProductORM] = relationship(back_populates='catalog_items', lazy='selectin')
     publication_info: Mapped[PublicationORM] = relationship(back_populates='items', lazy='selectin')
 
 
+class CatalogItemStockShardORM(BaseORM):
+    __table_args__ = (
+        CheckConstraint('quantity IS NULL OR ordered_quantity <= quantity', name='stock_shard_quantity_limit'),
+        UniqueConstraint('catalog_item_id', 'index'),
+    )
+
+    catalog_item_id: Mapped[UUID] = mapped_column(ForeignKey('catalog_item.id'), nullable=False)
+    index: Mapped[int] = mapped_column(nullable=False)
+    quantity: Mapped[int | None] = mapped_column(nullable=True)
+    ordered_quantity: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+class ItemRecommendationORM(BaseORM):
+    __table_args__ = (
+        UniqueConstraint('item_id', 'recommended_item_id'),
+        Index('idx_item_recommendation_item_score', 'item_id', 'score'),
+    )
+
+    item_id: Mapped[UUID] = mapped_column(ForeignKey('catalog_item.id'), nullable=False)
+    recommended_item_id: Mapped[UUID] = mapped_column(ForeignKey('catalog_item.id'), nullable=False)
+    score: Mapped[int] = mapped_column(nullable=False)
+
+
 #
 # class Discount(BaseORM):
 #     title: Mapped[str] = mapped_column(nullable=False)
@@ -207,6 +264,12 @@ class CatalogItemORM(BaseORM):
 
 
 class OrderORM(BaseORM):
+    __table_args__ = (
+        Index('idx_order_updated_at', 'updated_at'),
+        Index('idx_order_status_created_at', 'status', 'created_at'),
+        Index('idx_order_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     user_id: Mapped[UUID] = mapped_column(nullable=False, index=True)
     preorder_id: Mapped[UUID] = mapped_column(ForeignKey('preorder.id'), nullable=True)
     delivery_id: Mapped[UUID | None] = mapped_column(ForeignKey('delivery.id'), nullable=True)
@@ -232,6 +295,8 @@ class OrderORM(BaseORM):
 
 
 class OrderItemORM(BaseORM):
+    __table_args__ = (Index('idx_order_item_item_order', 'item_id', 'order_id'),)
+
     item_id: Mapped[UUID] = mapped_column(ForeignKey('catalog_item.id'))
     order_id: Mapped[UUID] = mapped_column(ForeignKey('order.id'), index=True)
     quantity: Mapped[int] = mapped_column(nullable=False)
@@ -256,6 +321,7 @@ class PaymentORM(BaseORM):
     url: Mapped[str] = mapped_column(nullable=False)
     status: Mapped[str] = mapped_column(nullable=False)
     external_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    expires_at: Mapped[DateTime | None] = mapped_column(nullable=True)
 
     invoice: Mapped[InvoiceORM] = relationship(
         'InvoiceORM',
@@ -264,7 +330,35 @@ class PaymentORM(BaseORM):
     )
 
 
+class PaymentNotificationORM(BaseORM):
+    __table_args__ = (
+        UniqueConstraint('payment_id', 'status'),
+        Index('idx_payment_notification_processed_at_created_at', 'processed_at', 'created_at'),
+    )
+
+    invoice_id: Mapped[UUID] = mapped_column(nullable=False)
+    payment_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False)
+    processed_at: Mapped[DateTime | None] = mapped_column(nullable=True)
+
+
+class PaymentInitORM(BaseORM):
+    __table_args__ = (Index('idx_payment_init_status_next_attempt_at', 'status', 'next_attempt_at'),)
+
+    order_id: Mapped[UUID] = mapped_column(ForeignKey('order.id'), nullable=False, index=True)
+    invoice_id: Mapped[UUID] = mapped_column(ForeignKey('invoice.id'), nullable=False, unique=True)
+
+    payload: Mapped[dict] = mapped_column(nullable=False)
+    redirect_due_date: Mapped[DateTime] = mapped_column(nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False)
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    next_attempt_at: Mapped[DateTime] = mapped_column(nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
 class InvoiceORM(BaseORM):
+    __table_args__ = (Index('idx_invoice_status_type', 'status', 'type'),)
+
     order_id: Mapped[UUID] = mapped_column(ForeignKey('order.id'), nullable=False, index=True)
     order_item_id: Mapped[UUID | None] = mapped_column(ForeignKey('order_item.id'), nullable=True, index=True)
 
@@ -313,6 +407,7 @@ class CartItemORM(BaseORM):
 
     info: Mapped[CatalogItemORM] = relationship(lazy='selectin')
 
+
 class FaqEntriesORM(BaseORM):
     question: Mapped[str] = mapped_column(Text, nullable=False)
     answer: Mapped[str] = mapped_column(Text, nullable=False)
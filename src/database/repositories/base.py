@@ -1,9 +1,9 @@
 from abc import ABC
-from collections.abc import Sequence
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import BaseORM
@@ -17,6 +17,15 @@ class ISqlAlchemyRepository(ABC):
     def session(self) -> AsyncSession:
         return SQLAlchemyClient().get_session()
 
+    def add_after_commit_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        SQLAlchemyClient().add_after_commit_callback(callback)
+
+    def add_rollback_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        SQLAlchemyClient().add_rollback_callback(callback)
+
+    async def release_connection(self) -> None:
+        await self.session.close()
+
     async def create(self, db_object: ORMModel) -> UUID:
         self.session.add(db_object)
         await self.session.flush()
@@ -26,6 +35,13 @@ class ISqlAlchemyRepository(ABC):
         self.session.add_all(db_objects)
         return [db_object.id for db_object in db_objects]
 
+    async def bulk_create(self, db_model: type[ORMModel], rows: list[dict[str, Any]]) -> Sequence[UUID]:
+        if not rows:
+            return []
+
+        result = await self.session.execute(insert(db_model).values(rows).returning(db_model.id))
+        return result.scalars().all()
+
     async def read_by(self, db_model: type[ORMModel], count: int | None = None, **kwargs) -> Sequence[ORMModel]:
         stmt = select(db_model).where(**kwargs).limit(count)
         db_objects = await self.session.execute(stmt)
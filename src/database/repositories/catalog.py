@@ -1,24 +1,55 @@
-from operator import or_
+from collections import defaultdict
+from datetime import datetime
 from uuid import UUID
 
-from pendulum import Date
-from psycopg2.errorcodes import CHECK_VIOLATION
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
+from pendulum import Date, DateTime
+from pydantic import Field
+from sqlalchemy import (
+    and_,
+    case,
+    column,
+    ColumnElement,
+    delete,
+    distinct,
+    exists,
+    func,
+    insert,
+    Integer,
+    literal,
+    literal_column,
+    not_,
+    or_,
+    select,
+    Text,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.sql.selectable import FromClause, TableValuedAlias
 
 from base_objects.models import SGBaseModel
+from database.constants import CatalogSortOrder, PublicationType, SEARCH_TEXT_CONFIG
 from database.models import (
     AttachmentORM,
     CatalogItemORM,
+    CatalogItemStockShardORM,
+    CreditPartORM,
     FilterGroupORM,
+    FilterORM,
+    ItemRecommendationORM,
+    OrderItemORM,
+    OrderORM,
+    PreorderORM,
     ProductCategoryORM,
+    ProductFilterORM,
     ProductORM,
     PublicationORM,
 )
 from database.repositories.base import ISqlAlchemyRepository
-from errors.base import BaseError, ExpectedError
+from database.repositories.projections import catalog_item_json, EMPTY_JSON_ARRAY, publication_json
+from errors.base import ExpectedError, ServerError
 
 
 class CatalogItemNotFoundError(ExpectedError):
@@ -26,9 +57,17 @@ class CatalogItemNotFoundError(ExpectedError):
     message: str = 'Товар не найден'
 
 
-class CatalogItemOutOfStockError(BaseError):
+class CatalogItemOutOfStockError(ServerError):
     status_code = 400
     message = 'Отсутствует необходимое кол-во товаров'
+    capture_by_sentry = False
+
+    def __init__(self, item_ids: list[UUID]):
+        self.item_ids = item_ids
+        super().__init__(debug=f'Out of stock items: {item_ids}')
+
+    def as_dict(self, *, is_debug: bool = False) -> dict:
+        return super().as_dict(is_debug=is_debug) | {'itemIds': [str(item_id) for item_id in self.item_ids]}
 
 
 class CreditPart(SGBaseModel):
@@ -50,22 +89,419 @@ class CatalogItemCheckoutDataDTO(SGBaseModel):
         return (self.total - self.ordered) if self.total else None
 
 
-class CatalogRepository(ISqlAlchemyRepository):
-    async def get_publications(
-        self,
-    ) -> list[PublicationORM]:
-        result = await self.session.scalars(select(PublicationORM))
-        return list(result.all())
+class CheckoutDataDTO(SGBaseModel):
+    items: dict[UUID, CatalogItemCheckoutDataDTO]
+    is_single_preorder: bool
+
+
+class CatalogItemStockDTO(SGBaseModel):
+    id: UUID
+    total: int | None
+    ordered: int
+    publication_link: str | None = None
+
+    @property
+    def available(self) -> int | None:
+        return None if self.total is None else self.total - self.ordered
+
+    @property
+    def is_available(self) -> bool:
+        return self.total is None or self.ordered < self.total
+
+
+class CatalogItemsFilterDTO(SGBaseModel):
+    category_link: str | None = None
+    filter_ids: list[UUID] = Field(default_factory=list)
+    publication_type: PublicationType | None = None
+    min_price: int | None = None
+    max_price: int | None = None
+    is_available: bool | None = None
 
+
+class FacetFilterDTO(SGBaseModel):
+    id: UUID
+    value: str
+    group_id: UUID
+    group_title: str
+    category_link: str
+
+
+class FacetItemDTO(SGBaseModel):
+    id: UUID
+    category_link: str
+    publication_type: PublicationType
+    is_active: bool
+    is_available: bool
+    filter_ids: list[UUID]
+    updated_at: datetime
+
+
+class CatalogItemsKeyDTO(SGBaseModel):
+    value: int | datetime
+    id: UUID
+
+
+CATALOG_SORT_COLUMNS = {
+    CatalogSortOrder.NEWEST: CatalogItemORM.created_at,
+    CatalogSortOrder.PRICE_ASC: CatalogItemORM.price,
+    CatalogSortOrder.PRICE_DESC: CatalogItemORM.price,
+}
+
+
+def _matches_filters(filter_ids: list[UUID]) -> ColumnElement:
+    requested_filter = FilterORM.__table__.alias('requested_filter')
+    product_filter = FilterORM.__table__.alias('product_filter_value')
+
+    product_has_group_filter = (
+        select(ProductFilterORM.product_id)
+        .join(product_filter, product_filter.c.id == ProductFilterORM.filter_id)
+        .where(
+            ProductFilterORM.product_id == CatalogItemORM.product_id,
+            product_filter.c.filter_group_id == requested_filter.c.filter_group_id,
+            product_filter.c.id.in_(filter_ids),
+        )
+        .correlate(CatalogItemORM, requested_filter)
+        .exists()
+    )
+
+    known_filters_count = (
+        select(func.count(requested_filter.c.id)).where(requested_filter.c.id.in_(filter_ids)).scalar_subquery()
+    )
+    return and_(
+        known_filters_count == len(set(filter_ids)),
+        not_(
+            select(requested_filter.c.id)
+            .where(requested_filter.c.id.in_(filter_ids), not_(product_has_group_filter))
+            .correlate(CatalogItemORM)
+            .exists()
+        ),
+    )
+
+
+def _ordered_quantity() -> ColumnElement:
+    shards_ordered_quantity = (
+        select(func.sum(CatalogItemStockShardORM.ordered_quantity))
+        .where(CatalogItemStockShardORM.catalog_item_id == CatalogItemORM.id)
+        .scalar_subquery()
+    )
+    return case(
+        (CatalogItemORM.stock_shards > 1, func.coalesce(shards_ordered_quantity, 0)),
+        else_=CatalogItemORM.ordered_quantity,
+    )
+
+
+def _credit_parts(parts: list[dict] | None) -> list[CreditPart] | None:
+    if parts is None:
+        return None
+    return [CreditPart(sum=part['sum'], deadline=Date.fromisoformat(part['deadline'])) for part in parts]
+
+
+def _requested_quantities(items: dict[UUID, int]) -> TableValuedAlias:
+    return (
+        func.unnest(
+            literal(list(items.keys()), ARRAY(PG_UUID)),
+            literal(list(items.values()), ARRAY(Integer)),
+        )
+        .table_valued(column('item_id', PG_UUID), column('quantity', Integer))
+        .render_derived()
+    )
+
+
+class CatalogRepository(ISqlAlchemyRepository):
     async def get_publication(self, publication_id: UUID) -> PublicationORM:
         return await self.session.get(PublicationORM(), publication_id)
 
+    async def get_publications_json(self) -> str:
+        publications = (
+            select(publication_json().label('publication'), PublicationORM.created_at)
+            .outerjoin(PreorderORM, PreorderORM.id == PublicationORM.preorder_id)
+            .where(
+                exists().where(
+                    CatalogItemORM.publication_id == PublicationORM.id,
+                    CatalogItemORM.is_active,
+                ),
+            )
+            .subquery()
+        )
+
+        query = select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(publications.c.publication, publications.c.created_at)),
+                EMPTY_JSON_ARRAY,
+            ).cast(Text),
+        )
+        return await self.session.scalar(query)
+
+    async def get_publication_json(self, publication_id: UUID) -> str | None:
+        query = (
+            select(publication_json().cast(Text))
+            .outerjoin(PreorderORM, PreorderORM.id == PublicationORM.preorder_id)
+            .where(PublicationORM.id == publication_id)
+        )
+        return await self.session.scalar(query)
+
+    async def get_catalog_items_page_json(
+        self,
+        filters: CatalogItemsFilterDTO,
+        sort: CatalogSortOrder,
+        after: CatalogItemsKeyDTO | None,
+        limit: int,
+    ) -> str:
+        sort_column = CATALOG_SORT_COLUMNS[sort]
+        is_ascending = sort == CatalogSortOrder.PRICE_ASC
+
+        conditions = [CatalogItemORM.is_active]
+        if filters.category_link is not None:
+            conditions.append(ProductCategoryORM.link == filters.category_link)
+        if filters.filter_ids:
+            conditions.append(_matches_filters(filters.filter_ids))
+        if filters.publication_type is not None:
+            conditions.append(PublicationORM.type == filters.publication_type.value)
+        if filters.min_price is not None:
+            conditions.append(CatalogItemORM.price >= filters.min_price)
+        if filters.max_price is not None:
+            conditions.append(CatalogItemORM.price <= filters.max_price)
+        if filters.is_available is not None:
+            is_available = or_(
+                CatalogItemORM.quantity.is_(None),
+                _ordered_quantity() < CatalogItemORM.quantity,
+            )
+            conditions.append(is_available if filters.is_available else not_(is_available))
+        if after is not None:
+            key, after_key = tuple_(sort_column, CatalogItemORM.id), tuple_(after.value, after.id)
+            conditions.append(key > after_key if is_ascending else key < after_key)
+
+        page = (
+            select(
+                catalog_item_json(
+                    'publication_id',
+                    PublicationORM.id,
+                    'publication_link',
+                    PublicationORM.link,
+                    'publication_type',
+                    PublicationORM.type,
+                ).label('item'),
+                sort_column.label('sort_value'),
+                CatalogItemORM.id,
+            )
+            .join(PublicationORM, PublicationORM.id == CatalogItemORM.publication_id)
+            .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+            .join(ProductCategoryORM, ProductCategoryORM.id == ProductORM.category_id)
+            .where(and_(*conditions))
+            .order_by(
+                *(
+                    (sort_column.asc(), CatalogItemORM.id.asc())
+                    if is_ascending
+                    else (sort_column.desc(), CatalogItemORM.id.desc())
+                )
+            )
+            .limit(limit)
+            .subquery()
+        )
+
+        order_by = (
+            (page.c.sort_value.asc(), page.c.id.asc()) if is_ascending else (page.c.sort_value.desc(), page.c.id.desc())
+        )
+        query = select(
+            func.coalesce(func.json_agg(aggregate_order_by(page.c.item, *order_by)), EMPTY_JSON_ARRAY).cast(Text)
+        )
+        return await self.session.scalar(query)
+
+    async def search_catalog_items_json(self, text: str, limit: int, offset: int) -> str:
+        ts_query = func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, text)
+        rank = func.greatest(func.ts_rank(ProductORM.search_vector, ts_query), func.similarity(ProductORM.title, text))
+
+        products = (
+            select(ProductORM.id, rank.label('rank'))
+            .where(or_(ProductORM.search_vector.op('@@')(ts_query), ProductORM.title.op('%')(text)))
+            .subquery()
+        )
+        page = (
+            select(
+                catalog_item_json(
+                    'publication_id',
+                    PublicationORM.id,
+                    'publication_link',
+                    PublicationORM.link,
+                    'publication_type',
+                    PublicationORM.type,
+                ).label('item'),
+                products.c.rank,
+                CatalogItemORM.created_at,
+                CatalogItemORM.id,
+            )
+            .join(products, products.c.id == CatalogItemORM.product_id)
+            .join(PublicationORM, PublicationORM.id == CatalogItemORM.publication_id)
+            .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+            .join(ProductCategoryORM, ProductCategoryORM.id == ProductORM.category_id)
+            .where(CatalogItemORM.is_active)
+            .order_by(products.c.rank.desc(), CatalogItemORM.created_at.desc(), CatalogItemORM.id)
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+
+        query = select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(page.c.item, page.c.rank.desc(), page.c.created_at.desc(), page.c.id)),
+                EMPTY_JSON_ARRAY,
+            ).cast(Text)
+        )
+        return await self.session.scalar(query)
+
+    async def get_facet_filters(self) -> list[FacetFilterDTO]:
+        query = (
+            select(
+                FilterORM.id,
+                FilterORM.value,
+                FilterGroupORM.id.label('group_id'),
+                FilterGroupORM.title.label('group_title'),
+                ProductCategoryORM.link.label('category_link'),
+            )
+            .join(FilterGroupORM, FilterGroupORM.id == FilterORM.filter_group_id)
+            .join(ProductCategoryORM, ProductCategoryORM.id == FilterGroupORM.product_category_id)
+            .order_by(FilterGroupORM.title, FilterORM.value)
+        )
+
+        result = await self.session.execute(query)
+        return [FacetFilterDTO.model_validate(row) for row in result.mappings()]
+
+    async def get_facet_items(self, updated_since: datetime | None = None) -> list[FacetItemDTO]:
+        filter_ids = (
+            select(func.coalesce(func.array_agg(ProductFilterORM.filter_id), literal_column("'{}'::uuid[]")))
+            .where(ProductFilterORM.product_id == ProductORM.id)
+            .scalar_subquery()
+        )
+        updated_at = func.greatest(CatalogItemORM.updated_at, ProductORM.updated_at)
+
+        query = (
+            select(
+                CatalogItemORM.id,
+                ProductCategoryORM.link.label('category_link'),
+                PublicationORM.type.label('publication_type'),
+                CatalogItemORM.is_active,
+                or_(
+                    CatalogItemORM.quantity.is_(None),
+                    _ordered_quantity() < CatalogItemORM.quantity,
+                ).label('is_available'),
+                filter_ids.label('filter_ids'),
+                updated_at.label('updated_at'),
+            )
+            .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+            .join(ProductCategoryORM, ProductCategoryORM.id == ProductORM.category_id)
+            .join(PublicationORM, PublicationORM.id == CatalogItemORM.publication_id)
+        )
+        if updated_since is not None:
+            query = query.where(updated_at >= updated_since)
+
+        result = await self.session.execute(query)
+        return [FacetItemDTO.model_validate(row) for row in result.mappings()]
+
+    async def get_publication_items_stock(self, link: str) -> list[CatalogItemStockDTO] | None:
+        query = (
+            select(
+                PublicationORM.id.label('publication_id'),
+                CatalogItemORM.id,
+                CatalogItemORM.quantity.label('total'),
+                _ordered_quantity().label('ordered'),
+            )
+            .select_from(PublicationORM)
+            .outerjoin(
+                CatalogItemORM,
+                and_(CatalogItemORM.publication_id == PublicationORM.id, CatalogItemORM.is_active),
+            )
+            .where(PublicationORM.link == link)
+            .order_by(CatalogItemORM.index, CatalogItemORM.created_at)
+        )
+
+        if not (rows := (await self.session.execute(query)).mappings().all()):
+            return None
+
+        return [CatalogItemStockDTO.model_validate(row) for row in rows if row['id'] is not None]
+
+    async def get_ordered_item_ids(self, updated_since: datetime | None = None) -> tuple[list[UUID], datetime | None]:
+        query = select(
+            func.array_agg(distinct(OrderItemORM.item_id)),
+            func.max(OrderORM.updated_at),
+        ).join(OrderORM, OrderORM.id == OrderItemORM.order_id)
+        if updated_since is not None:
+            query = query.where(OrderORM.updated_at >= updated_since)
+
+        item_ids, last_updated_at = (await self.session.execute(query)).one()
+        return item_ids or [], last_updated_at
+
+    async def refresh_item_recommendations(self, item_ids: list[UUID], excluded_order_statuses: list[str]) -> None:
+        source_item, target_item = aliased(OrderItemORM), aliased(OrderItemORM)
+        scores = (
+            select(
+                func.gen_random_uuid(),
+                func.now(),
+                func.now(),
+                source_item.item_id,
+                target_item.item_id,
+                func.count(distinct(source_item.order_id)),
+            )
+            .join(
+                target_item,
+                and_(target_item.order_id == source_item.order_id, target_item.item_id != source_item.item_id),
+            )
+            .join(OrderORM, OrderORM.id == source_item.order_id)
+            .where(
+                source_item.item_id.in_(item_ids),
+                OrderORM.status.not_in(excluded_order_statuses),
+            )
+            .group_by(source_item.item_id, target_item.item_id)
+        )
+
+        await self.session.execute(delete(ItemRecommendationORM).where(ItemRecommendationORM.item_id.in_(item_ids)))
+        await self.session.execute(
+            insert(ItemRecommendationORM).from_select(
+                [
+                    ItemRecommendationORM.id,
+                    ItemRecommendationORM.created_at,
+                    ItemRecommendationORM.updated_at,
+                    ItemRecommendationORM.item_id,
+                    ItemRecommendationORM.recommended_item_id,
+                    ItemRecommendationORM.score,
+                ],
+                scores,
+            )
+        )
+
+    async def get_top_recommendations(self, item_ids: list[UUID], limit: int) -> dict[UUID, list[UUID]]:
+        ranked = (
+            select(
+                ItemRecommendationORM.item_id,
+                ItemRecommendationORM.recommended_item_id,
+                func.row_number()
+                .over(
+                    partition_by=ItemRecommendationORM.item_id,
+                    order_by=(ItemRecommendationORM.score.desc(), ItemRecommendationORM.recommended_item_id),
+                )
+                .label('position'),
+            )
+            .join(CatalogItemORM, CatalogItemORM.id == ItemRecommendationORM.recommended_item_id)
+            .where(ItemRecommendationORM.item_id.in_(item_ids), CatalogItemORM.is_active)
+            .subquery()
+        )
+        query = (
+            select(
+                ranked.c.item_id,
+                func.array_agg(aggregate_order_by(ranked.c.recommended_item_id, ranked.c.position)),
+            )
+            .where(ranked.c.position <= limit)
+            .group_by(ranked.c.item_id)
+        )
+
+        result = await self.session.execute(query)
+        return dict(result.tuples().all())
+
     async def get_available_catalog_item_ids(self) -> list[UUID]:
         query = select(CatalogItemORM.id).where(
             CatalogItemORM.is_active,
             or_(
-                CatalogItemORM.quantity > CatalogItemORM.ordered_quantity,
-                not CatalogItemORM.quantity,
+                CatalogItemORM.quantity > _ordered_quantity(),
+                CatalogItemORM.quantity.is_(None),
             ),
         )
 
@@ -96,7 +532,7 @@ class CatalogRepository(ISqlAlchemyRepository):
     async def get_catalog_item_quantity(self, item_id: UUID) -> CatalogItemCheckoutDataDTO | None:
         query = select(
             CatalogItemORM.quantity,
-            CatalogItemORM.ordered_quantity,
+            _ordered_quantity(),
         ).where(
             CatalogItemORM.id == item_id,
         )
@@ -106,33 +542,55 @@ class CatalogRepository(ISqlAlchemyRepository):
 
         return CatalogItemCheckoutDataDTO(id=item_id, total=result[0], ordered=result[1]) if result else None
 
-    async def get_catalog_items_checkout_data(self, item_ids: list[UUID]) -> dict[UUID, CatalogItemCheckoutDataDTO]:
-        query = select(CatalogItemORM).where(
-            CatalogItemORM.is_active,
-            CatalogItemORM.id.in_(item_ids),
+    async def get_catalog_items_checkout_data(self, item_ids: list[UUID]) -> CheckoutDataDTO:
+        credit_parts = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object('sum', CreditPartORM.sum, 'deadline', CreditPartORM.deadline),
+                        CreditPartORM.deadline,
+                    )
+                )
+            )
+            .where(CreditPartORM.credit_plan_id == CatalogItemORM.credit_plan_id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                CatalogItemORM.id,
+                CatalogItemORM.quantity.label('total'),
+                _ordered_quantity().label('ordered'),
+                CatalogItemORM.price,
+                PublicationORM.preorder_id,
+                ProductORM.title,
+                case(
+                    (CatalogItemORM.credit_plan_id.is_not(None), func.coalesce(credit_parts, EMPTY_JSON_ARRAY)),
+                ).label('credit_parts'),
+                (func.count().over(partition_by=PublicationORM.preorder_id) == func.count().over()).label(
+                    'is_single_preorder'
+                ),
+            )
+            .join(PublicationORM, PublicationORM.id == CatalogItemORM.publication_id)
+            .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+            .where(
+                CatalogItemORM.is_active,
+                CatalogItemORM.id.in_(item_ids),
+            )
         )
 
-        result = await self.session.scalars(query)
-
-        if len(result_items := list(result)) != len(item_ids):
+        rows = (await self.session.execute(query)).mappings().all()
+        if len(rows) != len(item_ids):
             raise CatalogItemNotFoundError
 
-        return {
-            item.id: CatalogItemCheckoutDataDTO(
-                id=item.id,
-                total=item.quantity,
-                ordered=item.ordered_quantity,
-                preorder_id=item.publication_info.preorder_id,
-                price=item.price,
-                title=item.product.title,
-                credit_parts=(
-                    [CreditPart(sum=int(part.sum), deadline=str(part.deadline)) for part in item.credit_plan.parts]
-                    if item.credit_plan
-                    else None
-                ),
-            )
-            for item in result_items
-        }
+        return CheckoutDataDTO(
+            items={
+                row['id']: CatalogItemCheckoutDataDTO.model_validate(
+                    {**row, 'credit_parts': _credit_parts(row['credit_parts'])},
+                )
+                for row in rows
+            },
+            is_single_preorder=all(row['is_single_preorder'] for row in rows),
+        )
 
     async def get_all_products(self) -> list[ProductORM]:
         result = await self.session.scalars(select(ProductORM))
@@ -148,17 +606,263 @@ class CatalogRepository(ISqlAlchemyRepository):
         )
         return result.one_or_none()
 
-    async def increase_catalog_items_ordered_quantity(self, items_to_update: dict[UUID, int]) -> None:
-        catalog_items = await self.session.scalars(
-            select(CatalogItemORM).where(CatalogItemORM.id.in_(items_to_update.keys())).with_for_update()
+    async def increase_catalog_items_ordered_quantity(
+        self,
+        items_to_update: dict[UUID, int],
+    ) -> list[CatalogItemStockDTO]:
+        requested = _requested_quantities(items_to_update)
+        reserved_items = await self._update_ordered_quantity(
+            requested=requested,
+            ordered_quantity=CatalogItemORM.ordered_quantity + requested.c.quantity,
+            condition=and_(
+                CatalogItemORM.stock_shards == 1,
+                or_(
+                    CatalogItemORM.quantity.is_(None),
+                    CatalogItemORM.ordered_quantity + requested.c.quantity <= CatalogItemORM.quantity,
+                ),
+            ),
+        )
+
+        if len(reserved_items) != len(items_to_update):
+            reserved_ids = {item.id for item in reserved_items}
+            reserved_items += await self._reserve_stock_shards(
+                {item_id: quantity for item_id, quantity in items_to_update.items() if item_id not in reserved_ids},
+            )
+
+        if len(reserved_items) != len(items_to_update):
+            reserved_ids = {item.id for item in reserved_items}
+            raise CatalogItemOutOfStockError(
+                item_ids=[item_id for item_id in items_to_update if item_id not in reserved_ids],
+            )
+
+        return reserved_items
+
+    async def apply_catalog_items_ordered_quantity(
+        self,
+        items_to_update: dict[UUID, int],
+    ) -> tuple[list[CatalogItemStockDTO], list[UUID]]:
+        requested = _requested_quantities(items_to_update)
+        oversold_ids = list(
+            await self.session.scalars(
+                select(CatalogItemORM.id)
+                .join(requested, requested.c.item_id == CatalogItemORM.id)
+                .where(
+                    CatalogItemORM.quantity.is_not(None),
+                    _ordered_quantity() + requested.c.quantity > CatalogItemORM.quantity,
+                )
+                .with_for_update(of=CatalogItemORM)
+            )
+        )
+        applied_items = await self._update_ordered_quantity(
+            requested=requested,
+            ordered_quantity=case(
+                (CatalogItemORM.quantity.is_(None), CatalogItemORM.ordered_quantity + requested.c.quantity),
+                else_=func.least(CatalogItemORM.quantity, CatalogItemORM.ordered_quantity + requested.c.quantity),
+            ),
+            condition=CatalogItemORM.stock_shards == 1,
+        )
+        applied_items += await self._spread_over_stock_shards(
+            requested=requested,
+            capacity=func.coalesce(
+                CatalogItemStockShardORM.quantity - CatalogItemStockShardORM.ordered_quantity,
+                requested.c.quantity,
+            ),
+            sign=1,
+        )
+        return applied_items, oversold_ids
+
+    async def release_catalog_items_ordered_quantity(
+        self,
+        items_to_update: dict[UUID, int],
+    ) -> list[CatalogItemStockDTO]:
+        requested = _requested_quantities(items_to_update)
+        released_items = await self._update_ordered_quantity(
+            requested=requested,
+            ordered_quantity=func.greatest(CatalogItemORM.ordered_quantity - requested.c.quantity, 0),
+            condition=CatalogItemORM.stock_shards == 1,
+        )
+        return released_items + await self._spread_over_stock_shards(
+            requested=requested,
+            capacity=CatalogItemStockShardORM.ordered_quantity,
+            sign=-1,
+        )
+
+    async def _reserve_stock_shards(self, items_to_update: dict[UUID, int]) -> list[CatalogItemStockDTO]:
+        reserved_ids = []
+        for skip_locked in (True, False):
+            if not (pending := {key: value for key, value in items_to_update.items() if key not in reserved_ids}):
+                break
+
+            requested = _requested_quantities(pending)
+            shard = (
+                select(CatalogItemStockShardORM.id)
+                .where(
+                    CatalogItemStockShardORM.catalog_item_id == requested.c.item_id,
+                    or_(
+                        CatalogItemStockShardORM.quantity.is_(None),
+                        CatalogItemStockShardORM.ordered_quantity + requested.c.quantity
+                        <= CatalogItemStockShardORM.quantity,
+                    ),
+                )
+                .order_by(func.random())
+                .limit(1)
+                .with_for_update(skip_locked=skip_locked)
+                .lateral()
+            )
+            picked = select(shard.c.id, requested.c.quantity).select_from(requested.join(shard, true())).subquery()
+            reserved_ids += await self.session.scalars(
+                update(CatalogItemStockShardORM.__table__)
+                .where(CatalogItemStockShardORM.id == picked.c.id)
+                .values(ordered_quantity=CatalogItemStockShardORM.ordered_quantity + picked.c.quantity)
+                .returning(CatalogItemStockShardORM.catalog_item_id)
+            )
+
+        reserved_items = await self.get_catalog_items_stock(reserved_ids) if reserved_ids else []
+        if not (pending := {key: value for key, value in items_to_update.items() if key not in reserved_ids}):
+            return reserved_items
+
+        capacity = CatalogItemStockShardORM.quantity - CatalogItemStockShardORM.ordered_quantity
+        shards = await self.session.execute(
+            select(CatalogItemStockShardORM.catalog_item_id, capacity)
+            .where(
+                CatalogItemStockShardORM.catalog_item_id.in_(pending),
+                CatalogItemStockShardORM.quantity.is_not(None),
+            )
+            .order_by(CatalogItemStockShardORM.id)
+            .with_for_update()
+        )
+        available = defaultdict(int)
+        for item_id, shard_capacity in shards.tuples():
+            available[item_id] += shard_capacity
+
+        if fitting := {item_id: quantity for item_id, quantity in pending.items() if available[item_id] >= quantity}:
+            reserved_items += await self._spread_over_stock_shards(
+                requested=_requested_quantities(fitting),
+                capacity=capacity,
+                sign=1,
+            )
+        return reserved_items
+
+    async def _spread_over_stock_shards(
+        self,
+        requested: TableValuedAlias,
+        capacity: ColumnElement,
+        sign: int,
+    ) -> list[CatalogItemStockDTO]:
+        shards = (
+            select(
+                CatalogItemStockShardORM.id,
+                CatalogItemStockShardORM.catalog_item_id,
+                requested.c.quantity,
+                capacity.label('capacity'),
+                (
+                    func.sum(capacity).over(
+                        partition_by=CatalogItemStockShardORM.catalog_item_id,
+                        order_by=(capacity.desc(), CatalogItemStockShardORM.id),
+                    )
+                    - capacity
+                ).label('preceding'),
+            )
+            .where(CatalogItemStockShardORM.catalog_item_id == requested.c.item_id)
+            .subquery()
+        )
+        amount = func.least(shards.c.capacity, func.greatest(shards.c.quantity - shards.c.preceding, 0))
+
+        item_ids = await self.session.scalars(
+            update(CatalogItemStockShardORM.__table__)
+            .where(CatalogItemStockShardORM.id == shards.c.id, amount > 0)
+            .values(ordered_quantity=CatalogItemStockShardORM.ordered_quantity + sign * amount)
+            .returning(CatalogItemStockShardORM.catalog_item_id)
+        )
+        return await self.get_catalog_items_stock(item_ids) if (item_ids := list(set(item_ids))) else []
+
+    async def sync_stock_shards_ordered_quantity(self) -> list[CatalogItemStockDTO]:
+        shards = (
+            select(
+                CatalogItemStockShardORM.catalog_item_id.label('item_id'),
+                func.sum(CatalogItemStockShardORM.ordered_quantity).label('quantity'),
+            )
+            .group_by(CatalogItemStockShardORM.catalog_item_id)
+            .subquery()
+        )
+        return await self._update_ordered_quantity(
+            requested=shards,
+            ordered_quantity=shards.c.quantity,
+            condition=and_(CatalogItemORM.stock_shards > 1, CatalogItemORM.ordered_quantity != shards.c.quantity),
         )
 
-        for item in catalog_items:
-            item.ordered_quantity = item.ordered_quantity + items_to_update[item.id]
+    async def split_catalog_item_stock(self, item_id: UUID, shard_count: int) -> None:
+        item = await self.session.scalar(select(CatalogItemORM).where(CatalogItemORM.id == item_id).with_for_update())
+        if not item:
+            raise CatalogItemNotFoundError
+
+        shards = list(
+            await self.session.scalars(
+                select(CatalogItemStockShardORM)
+                .where(CatalogItemStockShardORM.catalog_item_id == item_id)
+                .with_for_update()
+            )
+        )
+        ordered = sum(shard.ordered_quantity for shard in shards) if shards else item.ordered_quantity
+        await self.session.execute(
+            delete(CatalogItemStockShardORM).where(CatalogItemStockShardORM.catalog_item_id == item_id)
+        )
 
-        try:
-            await self.session.flush()
-        except IntegrityError as ex:
-            if isinstance(ex.orig, AsyncAdapt_asyncpg_dbapi.IntegrityError) and ex.orig.pgcode == CHECK_VIOLATION:
-                raise CatalogItemOutOfStockError from ex
-            raise
+        if shard_count > 1:
+            available, remainder = divmod(item.quantity - ordered, shard_count) if item.quantity is not None else (0, 0)
+            self.session.add_all(
+                CatalogItemStockShardORM(
+                    catalog_item_id=item_id,
+                    index=index,
+                    quantity=(
+                        available + (index < remainder) + (ordered if index == 0 else 0)
+                        if item.quantity is not None
+                        else None
+                    ),
+                    ordered_quantity=ordered if index == 0 else 0,
+                )
+                for index in range(shard_count)
+            )
+
+        item.ordered_quantity = ordered
+        item.stock_shards = shard_count
+        await self.session.flush()
+
+    async def _update_ordered_quantity(
+        self,
+        requested: FromClause,
+        ordered_quantity: ColumnElement,
+        condition: ColumnElement | None = None,
+    ) -> list[CatalogItemStockDTO]:
+        query = (
+            update(CatalogItemORM.__table__)
+            .where(
+                CatalogItemORM.id == requested.c.item_id,
+                PublicationORM.id == CatalogItemORM.publication_id,
+            )
+            .values(ordered_quantity=ordered_quantity, updated_at=DateTime.now())
+            .returning(
+                CatalogItemORM.id,
+                CatalogItemORM.quantity.label('total'),
+                CatalogItemORM.ordered_quantity.label('ordered'),
+                PublicationORM.link.label('publication_link'),
+            )
+        )
+        if condition is not None:
+            query = query.where(condition)
+
+        result = await self.session.execute(query)
+        return [CatalogItemStockDTO.model_validate(row) for row in result.mappings()]
+
+    async def get_catalog_items_stock(self, item_ids: list[UUID]) -> list[CatalogItemStockDTO]:
+        result = await self.session.execute(
+            select(
+                CatalogItemORM.id,
+                CatalogItemORM.quantity.label('total'),
+                _ordered_quantity().label('ordered'),
+                PublicationORM.link.label('publication_link'),
+            )
+            .join(PublicationORM, PublicationORM.id == CatalogItemORM.publication_id)
+            .where(CatalogItemORM.id.in_(item_ids), CatalogItemORM.is_active)
+        )
+        return [CatalogItemStockDTO.model_validate(row) for row in result.mappings()]
@@ -1,5 +1,546 @@
+from datetime import datetime
+from uuid import UUID
+
+import pendulum
+from pendulum import Date, DateTime
+from pydantic import Field
+from sqlalchemy import BigInteger, column, func, literal, not_, or_, select, String, Text, true, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, ARRAY, insert, UUID as PG_UUID
+
+from sqlalchemy.sql.elements import Label
+from sqlalchemy.sql.selectable import TableValuedAlias
+
+from base_objects.models import SGBaseModel
+from database.constants import AttachmentType
+from database.models import (
+    AttachmentORM,
+    CatalogItemORM,
+    CreditPartORM,
+    DeliveryORM,
+    InvoiceORM,
+    OrderItemORM,
+    OrderORM,
+    PaymentInitORM,
+    PaymentNotificationORM,
+    PaymentORM,
+    PreorderORM,
+    ProductORM,
+)
 from database.repositories.base import ISqlAlchemyRepository
+from database.repositories.catalog import CreditPart
+from database.repositories.projections import EMPTY_JSON_ARRAY
+
+
+class PaymentInitStateDTO(SGBaseModel):
+    status: str
+    payment_url: str | None
+
+
+class PaymentStatusDTO(SGBaseModel):
+    invoice_id: UUID
+    payment_id: int
+    status: str
+
+
+class PaymentStatusUpdateDTO(PaymentStatusDTO):
+    old_status: str | None = None
+
+
+class UnsettledPaymentDTO(PaymentStatusDTO):
+    id: UUID
+
+
+class InvoiceStatusDTO(SGBaseModel):
+    id: UUID
+    order_id: UUID
+    type: str
+    status: str
+
+
+class OrderInvoiceDTO(SGBaseModel):
+    id: UUID
+    order_item_id: UUID | None
+    credit_part_index: int | None
+    type: str
+    amount: int
+    status: str
+
+
+class OrderDetailsItemDTO(SGBaseModel):
+    id: UUID
+    item_id: UUID
+    title: str
+    image: str | None
+    quantity: int
+    price: float
+    by_credit: bool
+    credit_parts: list[CreditPart] = Field(default_factory=list)
+    invoices: list[OrderInvoiceDTO] = Field(default_factory=list)
+
+
+class OrderDetailsDTO(SGBaseModel):
+    id: UUID
+    user_id: UUID
+    created_at: DateTime
+    status: str
+    preorder: PreorderORM | None
+    delivery: DeliveryORM | None
+    items: list[OrderDetailsItemDTO]
+    invoices: list[OrderInvoiceDTO]
+
+
+class DueCreditInvoiceDTO(SGBaseModel):
+    id: UUID
+    order_id: UUID
+    user_id: UUID
+    amount: int
+    credit_part_index: int
+    title: str
+    email: str | None
+    phone: str | None
+
+
+class OrderListKeyDTO(SGBaseModel):
+    created_at: datetime
+    id: UUID
+
+
+def _statuses(statuses: dict[UUID, str]) -> TableValuedAlias:
+    return (
+        func.unnest(
+            literal(list(statuses.keys()), ARRAY(PG_UUID)),
+            literal(list(statuses.values()), ARRAY(String)),
+        )
+        .table_valued(column('id', PG_UUID), column('status', String))
+        .render_derived()
+    )
+
+
+def _first_image() -> Label:
+    return (
+        select(AttachmentORM.url)
+        .where(
+            AttachmentORM.product_id == ProductORM.id,
+            AttachmentORM.type == AttachmentType.IMAGE.value,
+        )
+        .order_by(AttachmentORM.index)
+        .limit(1)
+        .scalar_subquery()
+        .label('image')
+    )
 
 
 class OrderRepository(ISqlAlchemyRepository):
-    pass
+    async def lock_expired_order_ids(
+        self,
+        status: str,
+        created_before: datetime,
+        initial_invoice_type: str,
+        settled_invoice_statuses: list[str],
+        limit: int,
+    ) -> list[UUID]:
+        is_settled = (
+            select(InvoiceORM.id)
+            .where(
+                InvoiceORM.order_id == OrderORM.id,
+                InvoiceORM.type == initial_invoice_type,
+                InvoiceORM.status.in_(settled_invoice_statuses),
+            )
+            .exists()
+        )
+        has_pending_notifications = (
+            select(PaymentNotificationORM.id)
+            .join(InvoiceORM, InvoiceORM.id == PaymentNotificationORM.invoice_id)
+            .where(
+                InvoiceORM.order_id == OrderORM.id,
+                PaymentNotificationORM.processed_at.is_(None),
+            )
+            .exists()
+        )
+        query = (
+            select(OrderORM.id)
+            .where(
+                OrderORM.status == status,
+                OrderORM.created_at < created_before,
+                not_(is_settled),
+                not_(has_pending_notifications),
+            )
+            .order_by(OrderORM.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(await self.session.scalars(query))
+
+    async def cancel_orders(
+        self,
+        order_ids: list[UUID],
+        order_status: str,
+        invoice_status: str,
+        cancelable_invoice_statuses: list[str],
+    ) -> dict[UUID, int]:
+        now = DateTime.now()
+        await self.session.execute(
+            update(OrderORM)
+            .where(OrderORM.id.in_(order_ids))
+            .values(status=order_status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            update(InvoiceORM)
+            .where(
+                InvoiceORM.order_id.in_(order_ids),
+                InvoiceORM.status.in_(cancelable_invoice_statuses),
+            )
+            .values(status=invoice_status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.session.execute(
+            select(OrderItemORM.item_id, func.sum(OrderItemORM.quantity))
+            .where(OrderItemORM.order_id.in_(order_ids))
+            .group_by(OrderItemORM.item_id)
+        )
+        return dict(result.tuples().all())
+
+    async def lock_due_payment_inits(self, status: str, due_before: datetime, limit: int) -> list[PaymentInitORM]:
+        query = (
+            select(PaymentInitORM)
+            .where(
+                PaymentInitORM.status == status,
+                PaymentInitORM.next_attempt_at <= due_before,
+            )
+            .order_by(PaymentInitORM.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(await self.session.scalars(query))
+
+    async def get_payment_init_state(self, order_id: UUID, user_id: UUID) -> PaymentInitStateDTO | None:
+        query = (
+            select(PaymentInitORM.status, PaymentORM.url.label('payment_url'))
+            .join(OrderORM, OrderORM.id == PaymentInitORM.order_id)
+            .outerjoin(PaymentORM, PaymentORM.invoice_id == PaymentInitORM.invoice_id)
+            .where(
+                OrderORM.id == order_id,
+                OrderORM.user_id == user_id,
+            )
+            .order_by(PaymentORM.created_at.desc())
+            .limit(1)
+        )
+        if (row := (await self.session.execute(query)).mappings().one_or_none()) is None:
+            return None
+        return PaymentInitStateDTO.model_validate(row)
+
+    async def enqueue_payment_notification(self, invoice_id: UUID, payment_id: int, status: str) -> None:
+        await self.session.execute(
+            insert(PaymentNotificationORM)
+            .values(invoice_id=invoice_id, payment_id=payment_id, status=status)
+            .on_conflict_do_nothing(index_elements=['payment_id', 'status'])
+        )
+
+    async def lock_pending_payment_notifications(self, limit: int) -> list[PaymentNotificationORM]:
+        query = (
+            select(PaymentNotificationORM)
+            .where(PaymentNotificationORM.processed_at.is_(None))
+            .order_by(PaymentNotificationORM.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(await self.session.scalars(query))
+
+    async def mark_payment_notifications_processed(self, notification_ids: list[UUID]) -> None:
+        await self.session.execute(
+            update(PaymentNotificationORM)
+            .where(PaymentNotificationORM.id.in_(notification_ids))
+            .values(processed_at=DateTime.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_unsettled_payments(
+        self,
+        final_statuses: list[str],
+        created_before: datetime,
+        after_id: UUID | None,
+        limit: int,
+    ) -> list[UnsettledPaymentDTO]:
+        conditions = [
+            PaymentORM.status.not_in(final_statuses),
+            PaymentORM.created_at < created_before,
+        ]
+        if after_id is not None:
+            conditions.append(PaymentORM.id > after_id)
+
+        query = (
+            select(
+                PaymentORM.id,
+                PaymentORM.invoice_id,
+                PaymentORM.external_id.label('payment_id'),
+                PaymentORM.status,
+            )
+            .where(*conditions)
+            .order_by(PaymentORM.id)
+            .limit(limit)
+        )
+        return [UnsettledPaymentDTO.model_validate(row) for row in (await self.session.execute(query)).mappings()]
+
+    async def update_payment_statuses(
+        self,
+        payments: list[PaymentStatusUpdateDTO],
+        final_statuses: list[str],
+    ) -> list[PaymentStatusDTO]:
+        if not payments:
+            return []
+
+        updates = (
+            func.unnest(
+                literal([payment.invoice_id for payment in payments], ARRAY(PG_UUID)),
+                literal([payment.payment_id for payment in payments], ARRAY(BigInteger)),
+                literal([payment.status for payment in payments], ARRAY(String)),
+                literal([payment.old_status for payment in payments], ARRAY(String)),
+            )
+            .table_valued(
+                column('invoice_id', PG_UUID),
+                column('payment_id', BigInteger),
+                column('status', String),
+                column('old_status', String),
+            )
+            .render_derived()
+        )
+        result = await self.session.execute(
+            update(PaymentORM)
+            .where(
+                PaymentORM.invoice_id == updates.c.invoice_id,
+                PaymentORM.external_id == updates.c.payment_id,
+                PaymentORM.status.not_in(final_statuses),
+                or_(updates.c.old_status.is_(None), PaymentORM.status == updates.c.old_status),
+            )
+            .values(status=updates.c.status, updated_at=DateTime.now())
+            .returning(PaymentORM.invoice_id, PaymentORM.external_id.label('payment_id'), PaymentORM.status)
+            .execution_options(synchronize_session=False)
+        )
+        return [PaymentStatusDTO.model_validate(row) for row in result.mappings()]
+
+    async def update_invoice_statuses(self, statuses: dict[UUID, str]) -> list[InvoiceStatusDTO]:
+        if not statuses:
+            return []
+
+        updates = _statuses(statuses)
+        result = await self.session.execute(
+            update(InvoiceORM)
+            .where(InvoiceORM.id == updates.c.id, InvoiceORM.status.is_distinct_from(updates.c.status))
+            .values(status=updates.c.status, updated_at=DateTime.now())
+            .returning(InvoiceORM.id, InvoiceORM.order_id, InvoiceORM.type, InvoiceORM.status)
+            .execution_options(synchronize_session=False)
+        )
+        return [InvoiceStatusDTO.model_validate(row) for row in result.mappings()]
+
+    async def update_order_statuses(self, statuses: dict[UUID, str], current_status: str) -> None:
+        if not statuses:
+            return
+
+        updates = _statuses(statuses)
+        await self.session.execute(
+            update(OrderORM)
+            .where(OrderORM.id == updates.c.id, OrderORM.status == current_status)
+            .values(status=updates.c.status, updated_at=DateTime.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_order_details(self, order_id: UUID) -> OrderDetailsDTO | None:
+        order = (
+            await self.session.execute(
+                select(OrderORM.id, OrderORM.user_id, OrderORM.created_at, OrderORM.status, PreorderORM, DeliveryORM)
+                .outerjoin(PreorderORM, PreorderORM.id == OrderORM.preorder_id)
+                .outerjoin(DeliveryORM, DeliveryORM.id == OrderORM.delivery_id)
+                .where(OrderORM.id == order_id)
+            )
+        ).one_or_none()
+        if order is None:
+            return None
+
+        items = (
+            await self.session.execute(
+                select(
+                    OrderItemORM.id,
+                    OrderItemORM.item_id,
+                    ProductORM.title,
+                    _first_image(),
+                    OrderItemORM.quantity,
+                    OrderItemORM.price,
+                    OrderItemORM.by_credit,
+                    CatalogItemORM.credit_plan_id,
+                )
+                .join(CatalogItemORM, CatalogItemORM.id == OrderItemORM.item_id)
+                .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+                .where(OrderItemORM.order_id == order_id)
+                .order_by(OrderItemORM.created_at)
+            )
+        ).all()
+
+        invoices = [
+            OrderInvoiceDTO.model_validate(row)
+            for row in (
+                await self.session.execute(
+                    select(
+                        InvoiceORM.id,
+                        InvoiceORM.order_item_id,
+                        InvoiceORM.credit_part_index,
+                        InvoiceORM.type,
+                        InvoiceORM.amount,
+                        InvoiceORM.status,
+                    )
+                    .where(InvoiceORM.order_id == order_id)
+                    .order_by(InvoiceORM.credit_part_index.nulls_first(), InvoiceORM.created_at)
+                )
+            ).mappings()
+        ]
+
+        credit_parts: dict[UUID, list[CreditPart]] = {}
+        if credit_plan_ids := {item.credit_plan_id for item in items if item.by_credit and item.credit_plan_id}:
+            parts = await self.session.execute(
+                select(CreditPartORM.credit_plan_id, CreditPartORM.sum, CreditPartORM.deadline)
+                .where(CreditPartORM.credit_plan_id.in_(credit_plan_ids))
+                .order_by(CreditPartORM.deadline)
+            )
+            for part in parts:
+                credit_parts.setdefault(part.credit_plan_id, []).append(
+                    CreditPart(sum=part.sum, deadline=pendulum.instance(part.deadline))
+                )
+
+        return OrderDetailsDTO(
+            id=order.id,
+            user_id=order.user_id,
+            created_at=pendulum.instance(order.created_at),
+            status=order.status,
+            preorder=order.PreorderORM,
+            delivery=order.DeliveryORM,
+            items=[
+                OrderDetailsItemDTO.model_validate(
+                    {
+                        **item._mapping,
+                        'credit_parts': credit_parts.get(item.credit_plan_id, []),
+                        'invoices': [invoice for invoice in invoices if invoice.order_item_id == item.id],
+                    }
+                )
+                for item in items
+            ],
+            invoices=invoices,
+        )
+
+    async def get_user_orders_page_json(self, user_id: UUID, after: OrderListKeyDTO | None, limit: int) -> str:
+        conditions = [OrderORM.user_id == user_id]
+        if after is not None:
+            conditions.append(tuple_(OrderORM.created_at, OrderORM.id) < tuple_(after.created_at, after.id))
+
+        page = (
+            select(OrderORM.id, OrderORM.created_at, OrderORM.status)
+            .where(*conditions)
+            .order_by(OrderORM.created_at.desc(), OrderORM.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+
+        items = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            'id',
+                            OrderItemORM.item_id,
+                            'title',
+                            ProductORM.title,
+                            'image',
+                            _first_image(),
+                            'quantity',
+                            OrderItemORM.quantity,
+                        ),
+                        OrderItemORM.created_at,
+                    )
+                ).label('items'),
+                func.sum(OrderItemORM.quantity * OrderItemORM.price).label('amount'),
+            )
+            .join(CatalogItemORM, CatalogItemORM.id == OrderItemORM.item_id)
+            .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+            .where(OrderItemORM.order_id == page.c.id)
+            .lateral()
+        )
+
+        order = func.json_build_object(
+            'id',
+            page.c.id,
+            'created_at',
+            page.c.created_at,
+            'status',
+            page.c.status,
+            'amount',
+            func.coalesce(items.c.amount, 0),
+            'items',
+            func.coalesce(items.c['items'], EMPTY_JSON_ARRAY),
+        )
+        query = select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(order, page.c.created_at.desc(), page.c.id.desc())),
+                EMPTY_JSON_ARRAY,
+            ).cast(Text)
+        ).select_from(page.join(items, true()))
+        return await self.session.scalar(query)
+
+    async def lock_due_credit_invoices(
+        self,
+        *,
+        status: str,
+        invoice_type: str,
+        due_on: Date,
+        billable_order_statuses: list[str],
+        final_payment_statuses: list[str],
+        payment_expires_after: datetime,
+        limit: int,
+    ) -> list[DueCreditInvoiceDTO]:
+        deadline = (
+            select(
+                func.array_agg(aggregate_order_by(CreditPartORM.deadline, CreditPartORM.deadline))[
+                    InvoiceORM.credit_part_index + 1
+                ]
+            )
+            .where(CreditPartORM.credit_plan_id == CatalogItemORM.credit_plan_id)
+            .scalar_subquery()
+        )
+        has_active_payment = (
+            select(PaymentORM.id)
+            .where(
+                PaymentORM.invoice_id == InvoiceORM.id,
+                PaymentORM.status.not_in(final_payment_statuses),
+                func.coalesce(PaymentORM.expires_at, PaymentORM.updated_at) > payment_expires_after,
+            )
+            .exists()
+        )
+        receipt = PaymentInitORM.payload['Receipt']
+        query = (
+            select(
+                InvoiceORM.id,
+                InvoiceORM.order_id,
+                OrderORM.user_id,
+                InvoiceORM.amount,
+                InvoiceORM.credit_part_index,
+                ProductORM.title,
+                receipt['Email'].as_string().label('email'),
+                func.coalesce(receipt['Phone'].as_string(), DeliveryORM.recipient_phone).label('phone'),
+            )
+            .join(OrderORM, OrderORM.id == InvoiceORM.order_id)
+            .join(OrderItemORM, OrderItemORM.id == InvoiceORM.order_item_id)
+            .join(CatalogItemORM, CatalogItemORM.id == OrderItemORM.item_id)
+            .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+            .outerjoin(PaymentInitORM, PaymentInitORM.order_id == OrderORM.id)
+            .outerjoin(DeliveryORM, DeliveryORM.id == OrderORM.delivery_id)
+            .where(
+                InvoiceORM.status == status,
+                InvoiceORM.type == invoice_type,
+                OrderORM.status.in_(billable_order_statuses),
+                deadline <= due_on,
+                not_(has_active_payment),
+            )
+            .order_by(InvoiceORM.created_at)
+            .limit(limit)
+            .with_for_update(of=InvoiceORM, skip_locked=True)
+        )
+        return [DueCreditInvoiceDTO.model_validate(row) for row in (await self.session.execute(query)).mappings()]
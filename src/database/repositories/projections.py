@@ -0,0 +1,181 @@
+from sqlalchemy import case, ColumnElement, func, literal_column, null, or_, select, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from database.constants import AttachmentType, PublicationType
+from database.models import (
+    AttachmentORM,
+    CatalogItemORM,
+    CreditPartORM,
+    FilterGroupORM,
+    FilterORM,
+    PreorderORM,
+    ProductCategoryORM,
+    ProductFilterORM,
+    ProductORM,
+    PublicationORM,
+)
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _json_array(expression: ColumnElement, *order_by: ColumnElement) -> ColumnElement:
+    return func.coalesce(func.json_agg(aggregate_order_by(expression, *order_by)), EMPTY_JSON_ARRAY)
+
+
+def credit_info_json() -> ColumnElement:
+    payments = (
+        select(
+            _json_array(
+                func.json_build_object(
+                    'sum',
+                    CreditPartORM.sum,
+                    'deadline',
+                    CreditPartORM.deadline.cast(Text),
+                ),
+                CreditPartORM.deadline,
+            )
+        )
+        .where(CreditPartORM.credit_plan_id == CatalogItemORM.credit_plan_id)
+        .scalar_subquery()
+    )
+
+    return case(
+        (CatalogItemORM.credit_plan_id.is_(None), null()),
+        else_=func.json_build_object('payments', payments),
+    )
+
+
+def product_json() -> ColumnElement:
+    group_filters = (
+        select(
+            FilterGroupORM.title,
+            func.json_build_object(
+                'id',
+                FilterGroupORM.id,
+                'title',
+                FilterGroupORM.title,
+                'filters',
+                _json_array(func.json_build_object('id', FilterORM.id, 'value', FilterORM.value), FilterORM.value),
+            ).label('filter_group'),
+        )
+        .join(FilterORM, FilterORM.filter_group_id == FilterGroupORM.id)
+        .join(ProductFilterORM, ProductFilterORM.filter_id == FilterORM.id)
+        .where(ProductFilterORM.product_id == ProductORM.id)
+        .group_by(FilterGroupORM.id, FilterGroupORM.title)
+        .correlate(ProductORM)
+        .subquery()
+    )
+    filter_groups = select(_json_array(group_filters.c.filter_group, group_filters.c.title)).scalar_subquery()
+
+    images = (
+        select(_json_array(AttachmentORM.url, AttachmentORM.index))
+        .where(
+            AttachmentORM.product_id == ProductORM.id,
+            AttachmentORM.type == AttachmentType.IMAGE.value,
+        )
+        .scalar_subquery()
+    )
+
+    return func.json_build_object(
+        'id',
+        ProductORM.id,
+        'created_at',
+        ProductORM.created_at,
+        'updated_at',
+        ProductORM.updated_at,
+        'title',
+        ProductORM.title,
+        'description',
+        ProductORM.description,
+        'physical_properties',
+        ProductORM.physical_properties,
+        'category',
+        func.json_build_object(
+            'id',
+            ProductCategoryORM.id,
+            'created_at',
+            ProductCategoryORM.created_at,
+            'updated_at',
+            ProductCategoryORM.updated_at,
+            'title',
+            ProductCategoryORM.title,
+            'link',
+            ProductCategoryORM.link,
+        ),
+        'filter_groups',
+        filter_groups,
+        'images',
+        images,
+    )
+
+
+def catalog_item_json(*extra_fields: str | ColumnElement) -> ColumnElement:
+    return func.json_build_object(
+        'id',
+        CatalogItemORM.id,
+        'created_at',
+        CatalogItemORM.created_at,
+        'updated_at',
+        CatalogItemORM.updated_at,
+        'price',
+        CatalogItemORM.price,
+        'quantity',
+        CatalogItemORM.quantity,
+        'is_active',
+        CatalogItemORM.is_active,
+        'index',
+        CatalogItemORM.index,
+        'credit_info',
+        credit_info_json(),
+        'product',
+        product_json(),
+        *extra_fields,
+    )
+
+
+def publication_json() -> ColumnElement:
+    items = (
+        select(_json_array(catalog_item_json(), CatalogItemORM.index, CatalogItemORM.created_at))
+        .join(ProductORM, ProductORM.id == CatalogItemORM.product_id)
+        .join(ProductCategoryORM, ProductCategoryORM.id == ProductORM.category_id)
+        .where(
+            CatalogItemORM.publication_id == PublicationORM.id,
+            CatalogItemORM.is_active,
+        )
+        .scalar_subquery()
+    )
+
+    return func.json_build_object(
+        'id',
+        PublicationORM.id,
+        'created_at',
+        PublicationORM.created_at,
+        'updated_at',
+        PublicationORM.updated_at,
+        'link',
+        PublicationORM.link,
+        'type',
+        PublicationORM.type,
+        'delivery_cost_included',
+        PublicationORM.delivery_cost_included,
+        'preorder',
+        case(
+            (or_(PreorderORM.id.is_(None), PublicationORM.type != PublicationType.PREORDER.value), null()),
+            else_=func.json_build_object(
+                'id',
+                PreorderORM.id,
+                'created_at',
+                PreorderORM.created_at,
+                'updated_at',
+                PreorderORM.updated_at,
+                'title',
+                PreorderORM.title,
+                'expected_arrival',
+                PreorderORM.expected_arrival,
+                'status',
+                PreorderORM.status,
+            ),
+        ),
+        'items',
+        items,
+    )
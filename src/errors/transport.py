@@ -20,6 +20,12 @@ class InputValidationError(ServerError):
     capture_by_sentry = False
 
 
+class InvalidCursorError(ServerError):
+    status_code = 400
+    message = 'Некорректный курсор пагинации'
+    capture_by_sentry = False
+
+
 class ResponseValidationError(ServerError):
     message = 'Ошибка валидации ответа'
     status_code = 500
@@ -35,3 +41,8 @@ class NotFoundError(ServerError):
 class LoggingError(ExpectedError):
     status_code = 500
     message = 'Внутренняя ошибка при работе c логами'
+
+
+class SessionNotLoadedError(ServerError):
+    status_code = 500
+    message = 'Сессия не загружена'
@@ -1,11 +1,21 @@
+import asyncio
 from contextlib import suppress
-from time import time
+from time import monotonic, time
 from typing import Any, ClassVar
 
 from collections.abc import Callable
 
 import sentry_sdk
-from httpx import AsyncClient, AsyncHTTPTransport, ConnectError, HTTPStatusError, Request, Response, TimeoutException
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    ConnectError,
+    HTTPStatusError,
+    Request,
+    Response,
+    TimeoutException,
+)
 from loguru import logger
 from pydantic.alias_generators import to_snake
 from sentry_sdk import Scope
@@ -182,12 +192,25 @@ class BaseApiClient(AsyncClient):
             base_url=self._base_url,
             headers=self._headers,
             timeout=self._timeout,
-            transport=(
-                LoggingAsyncHTTPTransport(
-                    destination=self._destination,
-                )
-                if self._logging
-                else None
-            ),
+            transport=self._make_transport(),
         )
         self.event_hooks.update(self._default_event_hooks)
+
+    def _make_transport(self) -> AsyncBaseTransport | None:
+        if self._logging:
+            return LoggingAsyncHTTPTransport(destination=self._destination)
+        return None
+
+
+class RateLimiter:
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self._interval
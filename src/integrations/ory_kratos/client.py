@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from httpx import HTTPStatusError
 from loguru import logger
 
@@ -22,3 +24,18 @@ class OryKratosClient(BaseApiClient):
 
         logger.debug(response.json())
         return response.json()
+
+
+class OryKratosAdminClient(BaseApiClient):
+    _base_url = Settings().env.ory_kratos.admin_url
+
+    async def get_identity(self, identity_id: UUID) -> dict | None:
+        response = await self.get(url=f'/admin/identities/{identity_id}')
+
+        try:
+            response.raise_for_status()
+        except HTTPStatusError as ex:
+            logger.error(ex)
+            return None
+
+        return response.json()
@@ -4,6 +4,7 @@ from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from loguru import logger
 from redis import asyncio as asyncio_redis
+from singleton_decorator import singleton
 
 from settings import Settings
 
@@ -11,6 +12,7 @@ if TYPE_CHECKING:
     from redis.asyncio.client import Redis
 
 
+@singleton
 class RedisClient:
     def __init__(self):
         self._client: Redis = asyncio_redis.from_url(
@@ -19,6 +21,10 @@ class RedisClient:
             decode_responses=True,
         )
 
+    @property
+    def client(self) -> 'Redis':
+        return self._client
+
     def init_cache(self) -> None:
         FastAPICache.init(
             backend=RedisBackend(self._client),
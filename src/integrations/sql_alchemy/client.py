@@ -1,4 +1,6 @@
 import contextlib
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from uuid import uuid4
 
 from jinja2 import Template
 from loguru import logger
@@ -12,6 +14,9 @@ from settings import Settings
 
 from utils import TRACE_ID
 
+AFTER_COMMIT_CALLBACKS_KEY = 'after_commit_callbacks'
+ROLLBACK_CALLBACKS_KEY = 'rollback_callbacks'
+
 
 @singleton
 class SQLAlchemyClient:
@@ -42,6 +47,45 @@ class SQLAlchemyClient:
     async def close_ctx_session(self) -> None:
         await self._ctx_session_manager.remove()
 
+    @contextlib.asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        token = TRACE_ID.set(str(uuid4()))
+        try:
+            session = self.get_session()
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                await self.run_rollback_callbacks()
+                raise
+            await self.run_after_commit_callbacks()
+        finally:
+            await self.close_ctx_session()
+            TRACE_ID.reset(token)
+
+    def add_after_commit_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self.get_session().info.setdefault(AFTER_COMMIT_CALLBACKS_KEY, []).append(callback)
+
+    async def run_after_commit_callbacks(self) -> None:
+        self.get_session().info.pop(ROLLBACK_CALLBACKS_KEY, None)
+        for callback in self.get_session().info.pop(AFTER_COMMIT_CALLBACKS_KEY, []):
+            try:
+                await callback()
+            except Exception as exc:
+                logger.error(f'After commit callback {callback} failed: {exc}')
+
+    def add_rollback_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self.get_session().info.setdefault(ROLLBACK_CALLBACKS_KEY, []).append(callback)
+
+    async def run_rollback_callbacks(self) -> None:
+        self.get_session().info.pop(AFTER_COMMIT_CALLBACKS_KEY, None)
+        for callback in self.get_session().info.pop(ROLLBACK_CALLBACKS_KEY, []):
+            try:
+                await callback()
+            except Exception as exc:
+                logger.error(f'Rollback callback {callback} failed: {exc}')
+
     def connect(self):
         self.engine.connect()
         logger.trace('Database connected')
@@ -1,8 +1,19 @@
+from functools import cache
 from typing import Any
 
 import sqlalchemy
 from sqlalchemy.orm import Mapper
 from sqlalchemy.orm.decl_api import DeclarativeAttributeIntercept
+from sqlalchemy.sql.schema import ColumnDefault
+
+
+@cache
+def _id_column_defaults(model: type) -> tuple[tuple[str, ColumnDefault], ...]:
+    return tuple(
+        (key, column.default)
+        for key, column in sqlalchemy.inspect(model).columns.items()
+        if column.description == 'id' and hasattr(column, 'default') and column.default is not None
+    )
 
 
 def force_default_column_arguments_before_commit(mapper: Mapper | None = None) -> None:
@@ -14,16 +25,8 @@ def force_default_column_arguments_before_commit(mapper: Mapper | None = None) -
         _: Any,
         kwargs: dict[str, Any],
     ) -> None:
-        original = kwargs.copy()
-        kwargs.clear()
-
-        for key, column in sqlalchemy.inspect(target.__class__).columns.items():
-            if column.description == 'id' and hasattr(column, 'default') and column.default is not None:
-                if callable(column.default.arg):
-                    kwargs[key] = column.default.arg(target)
-                else:
-                    kwargs[key] = column.default.arg
-
-        kwargs.update(original)
+        for key, default in _id_column_defaults(target.__class__):
+            if key not in kwargs:
+                kwargs[key] = default.arg(target) if callable(default.arg) else default.arg
 
     sqlalchemy.event.listen(mapper, 'init', instant_defaults_listener)
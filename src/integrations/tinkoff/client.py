@@ -1,14 +1,21 @@
+from httpx import AsyncBaseTransport
 from loguru import logger
 
 from integrations.integration_client_utils import BaseApiClient
-from integrations.tinkoff.errors import InitPaymentError
-from integrations.tinkoff.models import InitPaymentRequest, InitPaymentResponse
+from integrations.tinkoff.errors import GetPaymentStateError, InitPaymentError
+from integrations.tinkoff.models import GetStateRequest, GetStateResponse, InitPaymentRequest, InitPaymentResponse
+from integrations.tinkoff.stub import TinkoffStubTransport
 from settings import Settings
 
 
 class TinkoffClient(BaseApiClient):
     _base_url = Settings().env.tinkoff_integration.url
 
+    def _make_transport(self) -> AsyncBaseTransport | None:
+        if Settings().env.tinkoff_integration.stub_enabled:
+            return TinkoffStubTransport()
+        return super()._make_transport()
+
     async def init_payment(self, data: InitPaymentRequest) -> InitPaymentResponse:
         data.token = data.generate_token()
         response = await self.post(
@@ -23,3 +30,19 @@ class TinkoffClient(BaseApiClient):
             raise InitPaymentError(message=response_json.get('Details'))
 
         return InitPaymentResponse.model_validate(response.json())
+
+    async def get_state(self, payment_id: int) -> GetStateResponse:
+        data = GetStateRequest(payment_id=payment_id)
+        data.token = data.generate_token()
+        response = await self.post(
+            '/GetState',
+            json=data.model_dump(exclude_none=True, by_alias=True),
+        )
+
+        response.raise_for_status()
+
+        if (response_json := response.json()) and response_json.get('ErrorCode') != '0':
+            logger.error(response.json())
+            raise GetPaymentStateError(message=response_json.get('Details'))
+
+        return GetStateResponse.model_validate(response.json())
@@ -3,3 +3,7 @@ from errors import ServerError
 
 class InitPaymentError(ServerError):
     pass
+
+
+class GetPaymentStateError(ServerError):
+    pass
@@ -79,6 +79,17 @@ class InitPaymentResponse(BasePascalModel):
     payment_url: str = Field(alias='PaymentURL')
 
 
+class GetStateRequest(BasePaymentModel):
+    payment_id: int
+
+
+class GetStateResponse(BasePascalModel):
+    terminal_key: str
+    status: str
+    payment_id: int
+    order_id: UUID
+
+
 class PaymentStatusNotification(BasePaymentModel):
     amount: int
     card_id: int
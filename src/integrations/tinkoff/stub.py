@@ -0,0 +1,52 @@
+from itertools import count
+from uuid import uuid4
+
+import orjson
+from httpx import AsyncBaseTransport, Request, Response
+
+from settings import Settings
+
+_PAYMENT_IDS = count(1)
+_PAYMENTS: dict[int, dict[str, str]] = {}
+
+
+class TinkoffStubTransport(AsyncBaseTransport):
+    async def handle_async_request(self, request: Request) -> Response:
+        data = orjson.loads(request.content)
+        terminal_key = Settings().env.tinkoff_integration.terminal_key
+
+        if request.url.path.endswith('/Init'):
+            payment_id = next(_PAYMENT_IDS)
+            _PAYMENTS[payment_id] = {'Status': 'NEW', 'OrderId': data['OrderId']}
+            return Response(
+                200,
+                json={
+                    'Success': True,
+                    'ErrorCode': '0',
+                    'TerminalKey': terminal_key,
+                    'Status': 'NEW',
+                    'PaymentId': payment_id,
+                    'OrderId': data['OrderId'],
+                    'Amount': data['Amount'],
+                    'PaymentURL': f'{Settings().env.tinkoff_integration.url}/stub/{uuid4().hex}',
+                },
+            )
+
+        if request.url.path.endswith('/GetState'):
+            if (payment := _PAYMENTS.get(int(data['PaymentId']))) is None:
+                return Response(200, json={'Success': False, 'ErrorCode': '7', 'Details': 'Платеж не найден'})
+
+            if Settings().env.tinkoff_integration.stub_confirm_payments:
+                payment['Status'] = 'CONFIRMED'
+            return Response(
+                200,
+                json={
+                    'Success': True,
+                    'ErrorCode': '0',
+                    'TerminalKey': terminal_key,
+                    'PaymentId': int(data['PaymentId']),
+                    **payment,
+                },
+            )
+
+        return Response(404)
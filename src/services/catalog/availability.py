@@ -0,0 +1,164 @@
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from loguru import logger
+from singleton_decorator import singleton
+
+from integrations.redis.client import RedisClient
+from services.catalog.constants import (
+    AVAILABILITY_CHANGES_KEY,
+    AVAILABILITY_CHANGES_LIMIT,
+    AVAILABILITY_FLOOR_KEY,
+    AVAILABILITY_ITEMS_KEY,
+    AVAILABILITY_PENDING_KEY,
+    AVAILABILITY_VERSION_KEY,
+    PUBLICATION_AVAILABILITY_KEY,
+    PUBLICATION_AVAILABILITY_TTL,
+)
+from services.catalog.models import CatalogAvailability
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+AVAILABILITY_KEYS = [
+    AVAILABILITY_VERSION_KEY,
+    AVAILABILITY_FLOOR_KEY,
+    AVAILABILITY_ITEMS_KEY,
+    AVAILABILITY_CHANGES_KEY,
+    AVAILABILITY_PENDING_KEY,
+]
+
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('DEL', KEYS[3], KEYS[4])
+for i = 1, #ARGV do
+    redis.call('SADD', KEYS[3], ARGV[i])
+end
+local pending = redis.call('HGETALL', KEYS[5])
+for i = 1, #pending, 2 do
+    if pending[i + 1] == '1' then
+        redis.call('SADD', KEYS[3], pending[i])
+    else
+        redis.call('SREM', KEYS[3], pending[i])
+    end
+end
+redis.call('DEL', KEYS[5])
+redis.call('SET', KEYS[1], 1)
+redis.call('SET', KEYS[2], 1)
+return 1
+"""
+
+PUBLISH_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    for i = 2, #ARGV, 2 do
+        redis.call('HSET', KEYS[5], ARGV[i], ARGV[i + 1])
+    end
+    return 0
+end
+local changed = {}
+for i = 2, #ARGV, 2 do
+    local is_available = ARGV[i + 1] == '1'
+    if (redis.call('SISMEMBER', KEYS[3], ARGV[i]) == 1) ~= is_available then
+        table.insert(changed, i)
+    end
+end
+if #changed == 0 then
+    return tonumber(redis.call('GET', KEYS[1]))
+end
+local version = redis.call('INCR', KEYS[1])
+for _, i in ipairs(changed) do
+    if ARGV[i + 1] == '1' then
+        redis.call('SADD', KEYS[3], ARGV[i])
+    else
+        redis.call('SREM', KEYS[3], ARGV[i])
+    end
+    redis.call('ZADD', KEYS[4], version, ARGV[i])
+end
+local limit = tonumber(ARGV[1])
+if redis.call('ZCARD', KEYS[4]) > limit then
+    local trimmed = redis.call('ZRANGE', KEYS[4], -limit - 1, -limit - 1, 'WITHSCORES')
+    redis.call('ZREMRANGEBYRANK', KEYS[4], 0, -limit - 1)
+    redis.call('SET', KEYS[2], trimmed[2])
+end
+return version
+"""
+
+
+@singleton
+class AvailabilityFeed:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def seed(self, loader: Callable[[], Awaitable[list[UUID]]]) -> None:
+        available_ids = await loader()
+        if await self._redis.eval(SEED_SCRIPT, len(AVAILABILITY_KEYS), *AVAILABILITY_KEYS, *map(str, available_ids)):
+            logger.debug(f'Availability feed seeded with {len(available_ids)} items')
+
+    async def publish(self, items: dict[UUID, bool]) -> None:
+        if not items:
+            return
+
+        args = [value for item_id, is_available in items.items() for value in (str(item_id), int(is_available))]
+        version = await self._redis.eval(
+            PUBLISH_SCRIPT, len(AVAILABILITY_KEYS), *AVAILABILITY_KEYS, AVAILABILITY_CHANGES_LIMIT, *args
+        )
+        logger.debug(f'Availability feed version {version} after publishing {len(items)} items')
+
+    async def get_changes(
+        self,
+        since_version: int | None,
+        loader: Callable[[], Awaitable[list[UUID]]],
+    ) -> CatalogAvailability | None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            version, floor, changed_ids = await (
+                pipe.get(AVAILABILITY_VERSION_KEY)
+                .get(AVAILABILITY_FLOOR_KEY)
+                .zrangebyscore(AVAILABILITY_CHANGES_KEY, f'({since_version or 0}', '+inf')
+                .execute()
+            )
+
+        if version is None:
+            await self.seed(loader)
+            return await self.get_changes(since_version=since_version, loader=loader)
+
+        version, floor = int(version), int(floor)
+        if since_version == version:
+            return None
+
+        if since_version is None or not floor <= since_version < version:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                version, available_ids = await (
+                    pipe.get(AVAILABILITY_VERSION_KEY).smembers(AVAILABILITY_ITEMS_KEY).execute()
+                )
+            return CatalogAvailability(version=int(version), is_full=True, available=available_ids, unavailable=[])
+
+        flags = await self._redis.smismember(AVAILABILITY_ITEMS_KEY, changed_ids) if changed_ids else []
+        return CatalogAvailability(
+            version=version,
+            is_full=False,
+            available=[item_id for item_id, flag in zip(changed_ids, flags, strict=True) if flag],
+            unavailable=[item_id for item_id, flag in zip(changed_ids, flags, strict=True) if not flag],
+        )
+
+
+@singleton
+class PublicationAvailabilityCache:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def get(self, link: str) -> bytes | None:
+        if (payload := await self._redis.get(f'{PUBLICATION_AVAILABILITY_KEY}:{link}')) is not None:
+            return payload.encode()
+        return None
+
+    async def save(self, link: str, payload: bytes) -> None:
+        await self._redis.set(f'{PUBLICATION_AVAILABILITY_KEY}:{link}', payload, ex=PUBLICATION_AVAILABILITY_TTL)
+
+    async def invalidate(self, links: set[str]) -> None:
+        if links:
+            await self._redis.delete(*(f'{PUBLICATION_AVAILABILITY_KEY}:{link}' for link in links))
@@ -0,0 +1,38 @@
+CATALOG_VERSION_KEY = 'catalog:version'
+CATALOG_SNAPSHOT_KEY = 'catalog:snapshot'
+CATALOG_SNAPSHOT_TTL = 24 * 60 * 60
+
+AVAILABILITY_VERSION_KEY = 'availability:version'
+AVAILABILITY_FLOOR_KEY = 'availability:floor'
+AVAILABILITY_ITEMS_KEY = 'availability:items'
+AVAILABILITY_CHANGES_KEY = 'availability:changes'
+AVAILABILITY_PENDING_KEY = 'availability:pending'
+AVAILABILITY_CHANGES_LIMIT = 10_000
+PUBLICATION_AVAILABILITY_KEY = 'availability:publication'
+PUBLICATION_AVAILABILITY_TTL = 5
+
+STOCK_SHARDS_MAX_COUNT = 64
+
+INVENTORY_STOCK_KEY = 'inventory:stock'
+INVENTORY_INFLIGHT_KEY = 'inventory:inflight'
+INVENTORY_PENDING_KEY = 'inventory:pending'
+INVENTORY_RESERVATIONS_KEY = 'inventory:reservations'
+INVENTORY_DEADLINES_KEY = 'inventory:deadlines'
+INVENTORY_RESERVATION_TTL = 5 * 60
+INVENTORY_LOCK_KEY = 'inventory:lock'
+INVENTORY_LOCK_TIMEOUT = 60
+INVENTORY_UNLIMITED = 'unlimited'
+
+CATALOG_PAGE_DEFAULT_SIZE = 24
+CATALOG_PAGE_MAX_SIZE = 100
+CATALOG_CURSOR_SIZE = 3
+
+SEARCH_QUERY_MIN_LENGTH = 2
+SEARCH_QUERY_MAX_LENGTH = 100
+
+FACET_INDEX_SYNC_OVERLAP = 60
+
+RECOMMENDATIONS_KEY = 'recommendations:items'
+RECOMMENDATIONS_WATERMARK_KEY = 'recommendations:watermark'
+RECOMMENDATIONS_WATERMARK_OVERLAP = 60
+RECOMMENDATIONS_TOP_SIZE = 12
@@ -1,4 +1,4 @@
-from errors.base import BaseError
+from errors.base import BaseError, ExpectedError
 
 
 class CategoryNotFoundError(BaseError):
@@ -9,3 +9,8 @@ class CategoryNotFoundError(BaseError):
 class IncorrectItemsSectionsError(BaseError):
     status_code: int = 400
     message: str = 'Товары состоят в разных секциях'
+
+
+class PublicationNotFoundError(ExpectedError):
+    status_code: int = 404
+    message: str = 'Публикация не найдена'
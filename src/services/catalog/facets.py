@@ -0,0 +1,139 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from loguru import logger
+from singleton_decorator import singleton
+
+from database.repositories.catalog import FacetFilterDTO, FacetItemDTO
+from services.catalog.constants import FACET_INDEX_SYNC_OVERLAP
+from services.catalog.models import FacetFilter, FacetGroup, FilterFacets
+
+FacetItemsLoader = Callable[[datetime | None], Awaitable[tuple[list[FacetFilterDTO], list[FacetItemDTO]]]]
+
+
+def _iter_positions(bits: int):
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+@singleton
+class FacetIndex:
+    def __init__(self) -> None:
+        self._version: int | None = None
+        self._synced_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+        self._item_ids: list[UUID] = []
+        self._positions: dict[UUID, int] = {}
+        self._items: dict[int, FacetItemDTO] = {}
+
+        self._filters: dict[UUID, FacetFilterDTO] = {}
+        self._filter_bits: dict[UUID, int] = {}
+        self._category_bits: dict[str, int] = {}
+        self._active_bits = 0
+        self._available_bits = 0
+
+    async def sync(self, version: int, loader: FacetItemsLoader) -> None:
+        if version == self._version:
+            return
+
+        async with self._lock:
+            if version == self._version:
+                return
+
+            updated_since = self._synced_at - timedelta(seconds=FACET_INDEX_SYNC_OVERLAP) if self._synced_at else None
+            filters, items = await loader(updated_since)
+            logger.debug(f'Sync facet index to version {version} with {len(items)} changed items')
+
+            self._filters = {item.id: item for item in filters}
+            for item in items:
+                self._apply(item)
+                if self._synced_at is None or item.updated_at > self._synced_at:
+                    self._synced_at = item.updated_at
+
+            self._version = version
+
+    def _apply(self, item: FacetItemDTO) -> None:
+        if (position := self._positions.get(item.id)) is None:
+            position = self._positions[item.id] = len(self._item_ids)
+            self._item_ids.append(item.id)
+
+        bit = 1 << position
+        if previous := self._items.get(position):
+            for filter_id in previous.filter_ids:
+                self._filter_bits[filter_id] &= ~bit
+            self._category_bits[previous.category_link] &= ~bit
+        self._active_bits &= ~bit
+        self._available_bits &= ~bit
+
+        for filter_id in item.filter_ids:
+            self._filter_bits[filter_id] = self._filter_bits.get(filter_id, 0) | bit
+        self._category_bits[item.category_link] = self._category_bits.get(item.category_link, 0) | bit
+        if item.is_active:
+            self._active_bits |= bit
+        if item.is_available:
+            self._available_bits |= bit
+
+        self._items[position] = item
+
+    def _group_masks(self, filter_ids: list[UUID]) -> dict[UUID, int]:
+        masks = {}
+        for filter_id in filter_ids:
+            if selected_filter := self._filters.get(filter_id):
+                group_id = selected_filter.group_id
+                masks[group_id] = masks.get(group_id, 0) | self._filter_bits.get(filter_id, 0)
+            else:
+                masks[filter_id] = 0
+        return masks
+
+    def get_facets(
+        self,
+        *,
+        category_link: str | None = None,
+        filter_ids: list[UUID] | None = None,
+        is_available: bool | None = None,
+    ) -> FilterFacets:
+        base = self._active_bits
+        if category_link is not None:
+            base &= self._category_bits.get(category_link, 0)
+        if is_available is not None:
+            base &= self._available_bits if is_available else ~self._available_bits
+
+        group_masks = self._group_masks(filter_ids or [])
+        matched = base
+        for mask in group_masks.values():
+            matched &= mask
+
+        groups: dict[UUID, tuple[FacetGroup, int]] = {}
+        for facet_filter in self._filters.values():
+            if category_link is not None and facet_filter.category_link != category_link:
+                continue
+
+            if facet_filter.group_id not in groups:
+                group_base = base
+                for group_id, mask in group_masks.items():
+                    if group_id != facet_filter.group_id:
+                        group_base &= mask
+                groups[facet_filter.group_id] = (
+                    FacetGroup(id=facet_filter.group_id, title=facet_filter.group_title, filters=[]),
+                    group_base,
+                )
+
+            group, group_base = groups[facet_filter.group_id]
+            group.filters.append(
+                FacetFilter(
+                    id=facet_filter.id,
+                    value=facet_filter.value,
+                    count=(group_base & self._filter_bits.get(facet_filter.id, 0)).bit_count(),
+                )
+            )
+
+        return FilterFacets(
+            total=matched.bit_count(),
+            item_ids=[self._item_ids[position] for position in _iter_positions(matched)],
+            groups=[group for group, _ in groups.values()],
+        )
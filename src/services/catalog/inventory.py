@@ -0,0 +1,218 @@
+import time
+from typing import TYPE_CHECKING
+from uuid import UUID, uuid4
+
+from singleton_decorator import singleton
+
+from database.repositories.catalog import CatalogItemStockDTO
+from integrations.redis.client import RedisClient
+from services.catalog.constants import (
+    INVENTORY_DEADLINES_KEY,
+    INVENTORY_INFLIGHT_KEY,
+    INVENTORY_PENDING_KEY,
+    INVENTORY_RESERVATION_TTL,
+    INVENTORY_RESERVATIONS_KEY,
+    INVENTORY_STOCK_KEY,
+    INVENTORY_UNLIMITED,
+)
+from services.catalog.models import InventoryReservation
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+INVENTORY_KEYS = [
+    INVENTORY_STOCK_KEY,
+    INVENTORY_INFLIGHT_KEY,
+    INVENTORY_PENDING_KEY,
+    INVENTORY_RESERVATIONS_KEY,
+    INVENTORY_DEADLINES_KEY,
+]
+RESERVATION_KEYS = [INVENTORY_STOCK_KEY, INVENTORY_INFLIGHT_KEY, INVENTORY_RESERVATIONS_KEY, INVENTORY_DEADLINES_KEY]
+CONFIRM_KEYS = [INVENTORY_INFLIGHT_KEY, INVENTORY_PENDING_KEY, INVENTORY_RESERVATIONS_KEY, INVENTORY_DEADLINES_KEY]
+
+RESERVE_SCRIPT = """
+local missing = {}
+for i = 4, #ARGV, 2 do
+    if redis.call('HEXISTS', KEYS[1], ARGV[i]) == 0 then
+        table.insert(missing, ARGV[i])
+    end
+end
+if #missing > 0 then
+    return {'missing', missing}
+end
+
+local failed = {}
+for i = 4, #ARGV, 2 do
+    local stock = redis.call('HGET', KEYS[1], ARGV[i])
+    if stock ~= ARGV[1] and tonumber(stock) < tonumber(ARGV[i + 1]) then
+        table.insert(failed, ARGV[i])
+    end
+end
+if #failed > 0 then
+    return {'failed', failed}
+end
+
+local remaining = {}
+local reserved = {}
+for i = 4, #ARGV, 2 do
+    local stock = redis.call('HGET', KEYS[1], ARGV[i])
+    if stock ~= ARGV[1] then
+        stock = tostring(redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1])))
+    end
+    redis.call('HINCRBY', KEYS[2], ARGV[i], ARGV[i + 1])
+    table.insert(remaining, stock)
+    table.insert(reserved, ARGV[i] .. ':' .. ARGV[i + 1])
+end
+redis.call('HSET', KEYS[4], ARGV[2], table.concat(reserved, ','))
+redis.call('ZADD', KEYS[5], ARGV[3], ARGV[2])
+return {'reserved', remaining}
+"""
+
+CONFIRM_SCRIPT = """
+local is_tracked = redis.call('HDEL', KEYS[3], ARGV[1]) == 1
+redis.call('ZREM', KEYS[4], ARGV[1])
+for i = 2, #ARGV, 2 do
+    if is_tracked then
+        if redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1])) <= 0 then
+            redis.call('HDEL', KEYS[1], ARGV[i])
+        end
+    end
+    redis.call('HINCRBY', KEYS[2], ARGV[i], ARGV[i + 1])
+end
+"""
+
+MOVE_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    if redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1])) <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+"""
+
+RELEASE_FUNCTION = """
+local function release(reservation_id)
+    local reserved = redis.call('HGET', KEYS[3], reservation_id)
+    if not reserved then
+        return 0
+    end
+    for item_id, quantity in string.gmatch(reserved, '([^,:]+):(%d+)') do
+        if redis.call('HINCRBY', KEYS[2], item_id, -tonumber(quantity)) <= 0 then
+            redis.call('HDEL', KEYS[2], item_id)
+        end
+        local stock = redis.call('HGET', KEYS[1], item_id)
+        if stock and stock ~= ARGV[1] then
+            redis.call('HINCRBY', KEYS[1], item_id, quantity)
+        end
+    end
+    redis.call('HDEL', KEYS[3], reservation_id)
+    redis.call('ZREM', KEYS[4], reservation_id)
+    return 1
+end
+"""
+
+RELEASE_SCRIPT = f"""{RELEASE_FUNCTION}
+return release(ARGV[2])
+"""
+
+EXPIRE_SCRIPT = f"""{RELEASE_FUNCTION}
+local expired = 0
+for _, reservation_id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[4], '-inf', ARGV[2])) do
+    expired = expired + release(reservation_id)
+end
+return expired
+"""
+
+LOAD_SCRIPT = """
+local overwrite = ARGV[#ARGV] == '1'
+for i = 1, #ARGV - 2, 2 do
+    if overwrite or redis.call('HEXISTS', KEYS[1], ARGV[i]) == 0 then
+        local stock = ARGV[i + 1]
+        if stock ~= ARGV[#ARGV - 1] then
+            stock = tonumber(stock)
+                - tonumber(redis.call('HGET', KEYS[2], ARGV[i]) or 0)
+                - tonumber(redis.call('HGET', KEYS[3], ARGV[i]) or 0)
+        end
+        redis.call('HSET', KEYS[1], ARGV[i], stock)
+    end
+end
+"""
+
+
+def _pairs(items: dict[UUID, int]) -> list[str | int]:
+    return [value for item_id, quantity in items.items() for value in (str(item_id), quantity)]
+
+
+@singleton
+class InventoryEngine:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def reserve(self, items: dict[UUID, int]) -> InventoryReservation:
+        reservation_id = uuid4().hex
+        status, values = await self._redis.eval(
+            RESERVE_SCRIPT,
+            len(INVENTORY_KEYS),
+            *INVENTORY_KEYS,
+            INVENTORY_UNLIMITED,
+            reservation_id,
+            int(time.time()) + INVENTORY_RESERVATION_TTL,
+            *_pairs(items),
+        )
+
+        if status == 'missing':
+            return InventoryReservation(missing_ids=values)
+        if status == 'failed':
+            return InventoryReservation(failed_ids=values)
+        return InventoryReservation(
+            id=reservation_id,
+            remaining={
+                item_id: None if stock == INVENTORY_UNLIMITED else int(stock)
+                for item_id, stock in zip(items, values, strict=True)
+            },
+        )
+
+    async def confirm(self, reservation_id: str, items: dict[UUID, int]) -> None:
+        await self._redis.eval(CONFIRM_SCRIPT, len(CONFIRM_KEYS), *CONFIRM_KEYS, reservation_id, *_pairs(items))
+
+    async def release(self, reservation_id: str) -> None:
+        await self._redis.eval(
+            RELEASE_SCRIPT, len(RESERVATION_KEYS), *RESERVATION_KEYS, INVENTORY_UNLIMITED, reservation_id
+        )
+
+    async def expire_reservations(self) -> int:
+        return await self._redis.eval(
+            EXPIRE_SCRIPT, len(RESERVATION_KEYS), *RESERVATION_KEYS, INVENTORY_UNLIMITED, int(time.time())
+        )
+
+    async def load(self, stocks: list[CatalogItemStockDTO], *, overwrite: bool = False) -> None:
+        if not stocks:
+            return
+
+        args = [
+            value
+            for stock in stocks
+            for value in (str(stock.id), INVENTORY_UNLIMITED if stock.available is None else stock.available)
+        ]
+        await self._redis.eval(
+            LOAD_SCRIPT,
+            len(INVENTORY_KEYS),
+            *INVENTORY_KEYS,
+            *args,
+            INVENTORY_UNLIMITED,
+            int(overwrite),
+        )
+
+    async def forget(self, item_ids: list[UUID]) -> None:
+        if item_ids:
+            await self._redis.hdel(INVENTORY_STOCK_KEY, *map(str, item_ids))
+
+    async def get_loaded_item_ids(self) -> list[UUID]:
+        return [UUID(item_id) for item_id in await self._redis.hkeys(INVENTORY_STOCK_KEY)]
+
+    async def get_pending(self) -> dict[UUID, int]:
+        pending = await self._redis.hgetall(INVENTORY_PENDING_KEY)
+        return {UUID(item_id): int(quantity) for item_id, quantity in pending.items() if int(quantity) > 0}
+
+    async def acknowledge_pending(self, items: dict[UUID, int]) -> None:
+        await self._redis.eval(MOVE_SCRIPT, 1, INVENTORY_PENDING_KEY, *_pairs(items))
@@ -3,7 +3,7 @@ from uuid import UUID
 
 from pydantic import Field
 
-from database.constants import DeliveryCostType
+from database.constants import DeliveryCostType, PublicationType
 from base_objects.models import BaseEntity, SGBaseModel
 
 
@@ -18,6 +18,45 @@ class FilterGroup(SGBaseModel):
     filters: list[FilterDTO]
 
 
+class FacetFilter(FilterDTO):
+    count: int
+
+
+class FacetGroup(SGBaseModel):
+    id: UUID
+    title: str
+    filters: list[FacetFilter]
+
+
+class FilterFacets(SGBaseModel):
+    total: int
+    item_ids: list[UUID]
+    groups: list[FacetGroup]
+
+
+class CatalogAvailability(SGBaseModel):
+    version: int
+    is_full: bool
+    available: list[UUID]
+    unavailable: list[UUID]
+
+
+class ItemAvailability(SGBaseModel):
+    id: UUID
+    available: int | None
+
+
+class PublicationAvailability(SGBaseModel):
+    items: list[ItemAvailability]
+
+
+class InventoryReservation(SGBaseModel):
+    id: str | None = None
+    missing_ids: list[UUID] = Field(default_factory=list)
+    failed_ids: list[UUID] = Field(default_factory=list)
+    remaining: dict[UUID, int | None] = Field(default_factory=dict)
+
+
 class PreorderBaseInfoDTO(SGBaseModel):
     title: str
     expected_arrival: date | None
@@ -162,3 +201,27 @@ class Publication(BaseEntity):
     preorder: Preorder | None
     delivery_cost_included: DeliveryCostType | None = None
     items: list[CatalogItem]
+
+
+class PublicationList(SGBaseModel):
+    items: list[Publication]
+
+
+class CatalogListItem(CatalogItem):
+    publication_id: UUID
+    publication_link: str
+    publication_type: PublicationType
+
+
+class CatalogItemsPage(SGBaseModel):
+    items: list[CatalogListItem]
+    next_cursor: str | None = None
+
+
+class CatalogSearchPage(SGBaseModel):
+    items: list[CatalogListItem]
+    next_offset: int | None = None
+
+
+class SuggestedItems(SGBaseModel):
+    items: list[UUID]
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import orjson
+from singleton_decorator import singleton
+
+from integrations.redis.client import RedisClient
+from services.catalog.constants import RECOMMENDATIONS_KEY, RECOMMENDATIONS_WATERMARK_KEY
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+
+@singleton
+class RecommendationsCache:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def get(self, item_id: UUID) -> list[UUID]:
+        if (payload := await self._redis.hget(RECOMMENDATIONS_KEY, str(item_id))) is None:
+            return []
+        return [UUID(recommended_id) for recommended_id in orjson.loads(payload)]
+
+    async def get_watermark(self) -> datetime | None:
+        if (watermark := await self._redis.get(RECOMMENDATIONS_WATERMARK_KEY)) is None:
+            return None
+        return datetime.fromisoformat(watermark)
+
+    async def save(self, recommendations: dict[UUID, list[UUID]], watermark: datetime) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            await (
+                pipe.hset(
+                    RECOMMENDATIONS_KEY,
+                    mapping={
+                        str(item_id): orjson.dumps(recommended_ids, default=str)
+                        for item_id, recommended_ids in recommendations.items()
+                    },
+                )
+                .set(RECOMMENDATIONS_WATERMARK_KEY, watermark.isoformat())
+                .execute()
+            )
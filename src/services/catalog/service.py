@@ -1,7 +1,12 @@
+from datetime import datetime, timedelta
+from functools import partial
 from uuid import UUID, uuid4
 
+from loguru import logger
+from pydantic import TypeAdapter
+
 from constants import MAX_CART_ITEM_QUANTITY
-from database.constants import AttachmentType, DeliveryCostType, PublicationType
+from database.constants import AttachmentType, CatalogSortOrder, DeliveryCostType, PublicationType
 from database.models import (
     AttachmentORM,
     CatalogItemORM,
@@ -12,36 +17,72 @@ from database.models import (
     PublicationORM,
 )
 from database.repositories import CatalogRepository
-from database.repositories.catalog import CatalogItemCheckoutDataDTO
+from database.repositories.catalog import (
+    CatalogItemCheckoutDataDTO,
+    CatalogItemOutOfStockError,
+    CatalogItemStockDTO,
+    CatalogItemsFilterDTO,
+    CatalogItemsKeyDTO,
+    FacetFilterDTO,
+    FacetItemDTO,
+)
 
-from services.catalog.errors import IncorrectItemsSectionsError
+from errors.transport import InvalidCursorError
+from services.catalog.availability import AvailabilityFeed, PublicationAvailabilityCache
+from services.catalog.constants import (
+    CATALOG_CURSOR_SIZE,
+    RECOMMENDATIONS_TOP_SIZE,
+    RECOMMENDATIONS_WATERMARK_OVERLAP,
+)
+from services.catalog.errors import IncorrectItemsSectionsError, PublicationNotFoundError
+from services.catalog.facets import FacetIndex
+from services.catalog.inventory import InventoryEngine
 from services.catalog.models import (
     AvailableCheckoutItem,
+    CatalogAvailability,
     CatalogCategory,
-    CatalogItem,
     CatalogItemQuantity,
+    CatalogItemsPage,
+    CatalogListItem,
+    CatalogSearchPage,
     CheckoutData,
+    CreditPaymentPart,
     ShortCheckoutItem,
     CreateCatalogItemDTO,
     CreateProductDTO,
-    CreditInfo,
-    CreditPaymentPart,
     FilterDTO,
+    FilterFacets,
     FilterGroup,
+    ItemAvailability,
     PhysicalProperties,
-    Preorder,
-    Product,
     ProductDetailed,
     Publication,
+    PublicationAvailability,
+    PublicationList,
+    SuggestedItems,
 )
+from services.catalog.recommendations import RecommendationsCache
+from services.catalog.snapshot import CatalogSnapshot
 from services.catalog.utils import get_attachment_urls_by_type, prepare_filter_groups
 from services.file_manager.models import Attachment
+from services.order.constants import OrderStatus
+from settings import Settings
+from utils import decode_cursor, encode_cursor
+
+PUBLICATIONS_ADAPTER = TypeAdapter(list[Publication])
+CATALOG_LIST_ITEMS_ADAPTER = TypeAdapter(list[CatalogListItem])
 
 
 class CatalogService:
     def __init__(self, catalog_repository: CatalogRepository) -> None:
         self.catalog_repository = catalog_repository
 
+    def _invalidate_catalog_snapshot(self) -> None:
+        self.catalog_repository.add_after_commit_callback(CatalogSnapshot().invalidate)
+
+    def _publish_availability(self, items: dict[UUID, bool]) -> None:
+        self.catalog_repository.add_after_commit_callback(partial(AvailabilityFeed().publish, items))
+
     async def create_publication(
         self,
         link: str,
@@ -62,6 +103,8 @@ class CatalogService:
         if len(orm_catalog_items) == 1:
             orm_catalog_items[0].index = None
 
+        self._invalidate_catalog_snapshot()
+        self._publish_availability({item.id: item.quantity is None or item.quantity > 0 for item in orm_catalog_items})
         return await self.catalog_repository.create_publication(
             PublicationORM(
                 link=link,
@@ -102,6 +145,7 @@ class CatalogService:
             )
         )
 
+        self._invalidate_catalog_snapshot()
         return product_id
 
     async def get_product(self, product_id: UUID) -> ProductDetailed:
@@ -144,120 +188,65 @@ class CatalogService:
     async def get_publications(
         self,
     ) -> list[Publication]:
-        publications = await self.catalog_repository.get_publications()
-
-        prepared_publications = []
-        for publication in publications:
-            if not any(catalog_item.is_active for catalog_item in publication.items):
-                continue
-
-            prepared_catalog_items = []
-            for catalog_item in publication.items:
-                if not catalog_item.is_active:
-                    continue
-
-                prepared_catalog_items.append(
-                    CatalogItem(
-                        id=catalog_item.id,
-                        created_at=catalog_item.created_at,
-                        updated_at=catalog_item.updated_at,
-                        price=catalog_item.price,
-                        quantity=catalog_item.quantity,
-                        is_active=catalog_item.is_active,
-                        index=catalog_item.index,
-                        credit_info=(
-                            CreditInfo(
-                                payments=(
-                                    [
-                                        CreditPaymentPart.model_validate(credit_part)
-                                        for credit_part in catalog_item.credit_plan.parts
-                                    ]
-                                )
-                            )
-                            if catalog_item.credit_plan
-                            else None
-                        ),
-                        product=Product(
-                            id=catalog_item.product.id,
-                            created_at=catalog_item.product.created_at,
-                            updated_at=catalog_item.product.updated_at,
-                            title=catalog_item.product.title,
-                            description=catalog_item.product.description,
-                            category=CatalogCategory.model_validate(catalog_item.product.category),
-                            physical_properties=PhysicalProperties.model_validate(
-                                catalog_item.product.physical_properties
-                            ),
-                            filter_groups=prepare_filter_groups(catalog_item.product),
-                            images=get_attachment_urls_by_type(catalog_item.product.attachments, AttachmentType.IMAGE),
-                        ),
-                    )
-                )
+        return PUBLICATIONS_ADAPTER.validate_json(await self.catalog_repository.get_publications_json())
 
-            prepared_publications.append(
-                Publication(
-                    id=publication.id,
-                    created_at=publication.created_at,
-                    updated_at=publication.updated_at,
-                    link=publication.link,
-                    preorder=Preorder.model_validate(publication.preorder) if publication.type == 'preorder' else None,
-                    items=prepared_catalog_items,
-                    delivery_cost_included=publication.delivery_cost_included,
-                )
-            )
+    async def get_catalog_snapshot(self) -> bytes:
+        return await CatalogSnapshot().get(builder=self._build_catalog_snapshot)
 
-        return prepared_publications
+    async def _build_catalog_snapshot(self) -> bytes:
+        return PublicationList(items=await self.get_publications()).model_dump_json(by_alias=True).encode()
 
     async def get_publication(self, publication_id: UUID) -> Publication:
-        publication = await self.catalog_repository.read(PublicationORM, publication_id)
-
-        prepared_catalog_items = []
-        for catalog_item in publication.items:
-            if not catalog_item.is_active:
-                continue
-
-            prepared_catalog_items.append(
-                CatalogItem(
-                    id=catalog_item.id,
-                    created_at=catalog_item.created_at,
-                    updated_at=catalog_item.updated_at,
-                    price=catalog_item.price,
-                    quantity=catalog_item.quantity,
-                    is_active=catalog_item.is_active,
-                    index=catalog_item.variation_index,
-                    credit_info=(
-                        CreditInfo(
-                            payments=(
-                                [
-                                    CreditPaymentPart.model_validate(credit_part)
-                                    for credit_part in catalog_item.credit_plan.parts
-                                ]
-                            )
-                        )
-                        if catalog_item.credit_plan
-                        else None
-                    ),
-                    product=Product(
-                        id=catalog_item.product.id,
-                        created_at=catalog_item.product.created_at,
-                        updated_at=catalog_item.product.updated_at,
-                        title=catalog_item.product.title,
-                        description=catalog_item.product.description,
-                        category=CatalogCategory.model_validate(catalog_item.product.category),
-                        physical_properties=PhysicalProperties.model_validate(catalog_item.product.physical_properties),
-                        filter_groups=prepare_filter_groups(catalog_item.product),
-                        images=get_attachment_urls_by_type(catalog_item.product.attachments, AttachmentType.IMAGE),
-                    ),
-                )
+        if not (publication := await self.catalog_repository.get_publication_json(publication_id)):
+            raise PublicationNotFoundError
+
+        return Publication.model_validate_json(publication)
+
+    async def get_catalog_items_page(
+        self,
+        filters: CatalogItemsFilterDTO,
+        sort: CatalogSortOrder,
+        limit: int,
+        cursor: str | None = None,
+    ) -> CatalogItemsPage:
+        after = None
+        if cursor:
+            cursor_values = decode_cursor(cursor)
+            if len(cursor_values) != CATALOG_CURSOR_SIZE or cursor_values[0] != sort.value:
+                raise InvalidCursorError
+            try:
+                after = CatalogItemsKeyDTO(value=cursor_values[1], id=cursor_values[2])
+            except ValueError as exc:
+                raise InvalidCursorError(debug=str(exc)) from exc
+            if isinstance(after.value, datetime) != (sort == CatalogSortOrder.NEWEST):
+                raise InvalidCursorError
+
+        items = CATALOG_LIST_ITEMS_ADAPTER.validate_json(
+            await self.catalog_repository.get_catalog_items_page_json(
+                filters=filters,
+                sort=sort,
+                after=after,
+                limit=limit + 1,
             )
+        )
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last_item = items[-1]
+            sort_value = last_item.created_at if sort == CatalogSortOrder.NEWEST else last_item.price
+            next_cursor = encode_cursor([sort.value, sort_value, last_item.id])
+
+        return CatalogItemsPage(items=items, next_cursor=next_cursor)
+
+    async def search_catalog_items(self, text: str, limit: int, offset: int = 0) -> CatalogSearchPage:
+        items = CATALOG_LIST_ITEMS_ADAPTER.validate_json(
+            await self.catalog_repository.search_catalog_items_json(text=text, limit=limit + 1, offset=offset)
+        )
 
-        return Publication(
-            id=publication.id,
-            created_at=publication.created_at,
-            updated_at=publication.updated_at,
-            link=publication.link,
-            preorder=Preorder.model_validate(publication.preorder) if publication.type == 'preorder' else None,
-            delivery_cost_included=publication.delivery_cost_included,
-            items=prepared_catalog_items,
+        return CatalogSearchPage(
+            items=items[:limit],
+            next_offset=offset + limit if len(items) > limit else None,
         )
 
     async def get_filter_groups_by_category(
@@ -280,6 +269,27 @@ class CatalogService:
 
         return sorted(filters, key=lambda x: x.title)
 
+    async def get_filter_facets(
+        self,
+        *,
+        category_link: str | None = None,
+        filter_ids: list[UUID] | None = None,
+        is_available: bool | None = None,
+    ) -> FilterFacets:
+        facet_index = FacetIndex()
+        await facet_index.sync(version=await CatalogSnapshot().get_version(), loader=self._load_facet_items)
+
+        return facet_index.get_facets(category_link=category_link, filter_ids=filter_ids, is_available=is_available)
+
+    async def _load_facet_items(
+        self,
+        updated_since: datetime | None,
+    ) -> tuple[list[FacetFilterDTO], list[FacetItemDTO]]:
+        return (
+            await self.catalog_repository.get_facet_filters(),
+            await self.catalog_repository.get_facet_items(updated_since=updated_since),
+        )
+
     async def get_catalog_item_quantity(self, item_id: UUID) -> CatalogItemCheckoutDataDTO:
         return await self.catalog_repository.get_catalog_item_quantity(item_id=item_id)
 
@@ -287,15 +297,13 @@ class CatalogService:
         db_checkout_data = await self.catalog_repository.get_catalog_items_checkout_data(
             [item.id for item in checkout_items]
         )
+        if not db_checkout_data.is_single_preorder:
+            raise IncorrectItemsSectionsError
 
         result = CheckoutData()
 
-        first_item_preorder_id = next(iter(db_checkout_data.values())).preorder_id
-        if not all(item.preorder_id == first_item_preorder_id for item in db_checkout_data.values()):
-            raise IncorrectItemsSectionsError
-
         for item in checkout_items:
-            db_item = db_checkout_data.get(item.id)
+            db_item = db_checkout_data.items.get(item.id)
 
             if db_item.available is not None and item.quantity > db_item.available:
                 db_data = min(db_item.available, MAX_CART_ITEM_QUANTITY)
@@ -308,7 +316,14 @@ class CatalogService:
                         preorder_id=db_item.preorder_id,
                         price=db_item.price,
                         title=db_item.title,
-                        credit_parts=db_item.credit_parts,
+                        credit_parts=(
+                            [
+                                CreditPaymentPart(sum=part.sum, deadline=str(part.deadline))
+                                for part in db_item.credit_parts
+                            ]
+                            if db_item.credit_parts is not None
+                            else None
+                        ),
                     )
                 )
 
@@ -317,6 +332,58 @@ class CatalogService:
     async def get_available_catalog_item_ids(self) -> list[UUID]:
         return await self.catalog_repository.get_available_catalog_item_ids()
 
+    async def get_catalog_availability(self, since_version: int | None = None) -> CatalogAvailability | None:
+        return await AvailabilityFeed().get_changes(
+            since_version=since_version,
+            loader=self.catalog_repository.get_available_catalog_item_ids,
+        )
+
+    async def get_publication_availability(self, link: str) -> bytes:
+        cache = PublicationAvailabilityCache()
+        if (payload := await cache.get(link)) is not None:
+            return payload
+
+        if (items := await self.catalog_repository.get_publication_items_stock(link)) is None:
+            raise PublicationNotFoundError
+
+        payload = (
+            PublicationAvailability(items=[ItemAvailability(id=item.id, available=item.available) for item in items])
+            .model_dump_json(by_alias=True)
+            .encode()
+        )
+        await cache.save(link, payload)
+        return payload
+
+    async def get_suggested_items(self, item_id: UUID) -> SuggestedItems:
+        return SuggestedItems(items=await RecommendationsCache().get(item_id))
+
+    async def refresh_recommendations(self) -> None:
+        cache = RecommendationsCache()
+        watermark = await cache.get_watermark()
+
+        item_ids, last_updated_at = await self.catalog_repository.get_ordered_item_ids(
+            updated_since=watermark - timedelta(seconds=RECOMMENDATIONS_WATERMARK_OVERLAP) if watermark else None,
+        )
+        if not item_ids:
+            return
+
+        await self.catalog_repository.refresh_item_recommendations(
+            item_ids=item_ids,
+            excluded_order_statuses=[OrderStatus.CANCELED.value],
+        )
+        recommendations = await self.catalog_repository.get_top_recommendations(
+            item_ids=item_ids,
+            limit=RECOMMENDATIONS_TOP_SIZE,
+        )
+
+        self.catalog_repository.add_after_commit_callback(
+            partial(
+                cache.save,
+                {item_id: recommendations.get(item_id, []) for item_id in item_ids},
+                max(last_updated_at, watermark) if watermark else last_updated_at,
+            )
+        )
+
     async def add_attachments_to_product(self, attachments: list[Attachment]) -> None:
         await self.catalog_repository.add_attachments_to_product(
             [
@@ -329,16 +396,94 @@ class CatalogService:
                 for attachment in attachments
             ]
         )
+        self._invalidate_catalog_snapshot()
 
     async def reserve_catalog_items(self, items: list[ShortCheckoutItem]) -> None:
-        await self.catalog_repository.increase_catalog_items_ordered_quantity(
-            items_to_update={item.id: item.quantity for item in items}
+        items_to_reserve = {item.id: item.quantity for item in items}
+        if Settings().env.inventory_engine_enabled:
+            await self._reserve_in_inventory_engine(items_to_reserve)
+            return
+
+        reserved_items = await self.catalog_repository.increase_catalog_items_ordered_quantity(
+            items_to_update=items_to_reserve,
+        )
+        self._apply_stock_changes(reserved_items)
+
+    def _apply_stock_changes(self, items: list[CatalogItemStockDTO]) -> None:
+        if not all(item.is_available for item in items):
+            self._invalidate_catalog_snapshot()
+        self._publish_availability({item.id: item.is_available for item in items})
+        self.catalog_repository.add_after_commit_callback(
+            partial(PublicationAvailabilityCache().invalidate, {item.publication_link for item in items})
         )
 
+    async def _reserve_in_inventory_engine(self, items: dict[UUID, int]) -> None:
+        engine = InventoryEngine()
+
+        reservation = await engine.reserve(items)
+        if reservation.missing_ids:
+            await engine.load(await self.catalog_repository.get_catalog_items_stock(reservation.missing_ids))
+            reservation = await engine.reserve(items)
+
+        if reservation.missing_ids or reservation.failed_ids:
+            raise CatalogItemOutOfStockError(item_ids=reservation.missing_ids or reservation.failed_ids)
+
+        self.catalog_repository.add_after_commit_callback(partial(engine.confirm, reservation.id, items))
+        self.catalog_repository.add_rollback_callback(partial(engine.release, reservation.id))
+        self._publish_availability(
+            {item_id: remaining is None or remaining > 0 for item_id, remaining in reservation.remaining.items()}
+        )
+
+    async def release_catalog_items(self, items: dict[UUID, int]) -> None:
+        released_items = await self.catalog_repository.release_catalog_items_ordered_quantity(items)
+        if not released_items:
+            return
+
+        self._invalidate_catalog_snapshot()
+        self._apply_stock_changes(released_items)
+        if Settings().env.inventory_engine_enabled:
+            self.catalog_repository.add_after_commit_callback(
+                partial(InventoryEngine().forget, [item.id for item in released_items])
+            )
+
+    async def split_catalog_item_stock(self, item_id: UUID, shard_count: int) -> None:
+        await self.catalog_repository.split_catalog_item_stock(item_id=item_id, shard_count=shard_count)
+        if Settings().env.inventory_engine_enabled:
+            self.catalog_repository.add_after_commit_callback(partial(InventoryEngine().forget, [item_id]))
+
+    async def sync_stock_shards(self) -> None:
+        if synced_items := await self.catalog_repository.sync_stock_shards_ordered_quantity():
+            self._invalidate_catalog_snapshot()
+            self._apply_stock_changes(synced_items)
+
+    async def flush_inventory_reservations(self) -> None:
+        engine = InventoryEngine()
+        if not (pending := await engine.get_pending()):
+            return
+
+        flushed_items, oversold_ids = await self.catalog_repository.apply_catalog_items_ordered_quantity(pending)
+        if oversold_ids:
+            logger.critical(f'Inventory flush clamped oversold items: {oversold_ids}')
+        self.catalog_repository.add_after_commit_callback(partial(engine.acknowledge_pending, pending))
+        self._apply_stock_changes(flushed_items)
+
+    async def reconcile_inventory(self) -> None:
+        engine = InventoryEngine()
+        if expired := await engine.expire_reservations():
+            logger.warning(f'Released {expired} stale inventory reservations')
+
+        if not (item_ids := await engine.get_loaded_item_ids()):
+            return
+
+        stocks = await self.catalog_repository.get_catalog_items_stock(item_ids)
+        await engine.load(stocks, overwrite=True)
+        await engine.forget(list(set(item_ids) - {stock.id for stock in stocks}))
+
     async def get_categories(self) -> list[CatalogCategory]:
         return [
             CatalogCategory.model_validate(item) for item in await self.catalog_repository.read_all(ProductCategoryORM)
         ]
 
     async def create_category(self, title: str, link: str) -> UUID:
+        self._invalidate_catalog_snapshot()
         return await self.catalog_repository.create(ProductCategoryORM(title=title, link=link))
@@ -0,0 +1,51 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from singleton_decorator import singleton
+
+from integrations.redis.client import RedisClient
+from services.catalog.constants import CATALOG_SNAPSHOT_KEY, CATALOG_SNAPSHOT_TTL, CATALOG_VERSION_KEY
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+
+@singleton
+class CatalogSnapshot:
+    def __init__(self) -> None:
+        self._version: int | None = None
+        self._payload: bytes | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def get_version(self) -> int:
+        return int(await self._redis.get(CATALOG_VERSION_KEY) or 0)
+
+    async def get(self, builder: Callable[[], Awaitable[bytes]]) -> bytes:
+        version = await self.get_version()
+        if version == self._version:
+            return self._payload
+
+        async with self._lock:
+            if version == self._version:
+                return self._payload
+
+            key = f'{CATALOG_SNAPSHOT_KEY}:{version}'
+            if (payload := await self._redis.get(key)) is not None:
+                payload = payload.encode()
+            else:
+                logger.debug(f'Build catalog snapshot for version {version}')
+                payload = await builder()
+                await self._redis.set(key, payload, ex=CATALOG_SNAPSHOT_TTL)
+
+            self._version, self._payload = version, payload
+
+        return payload
+
+    async def invalidate(self) -> None:
+        await self._redis.incr(CATALOG_VERSION_KEY)
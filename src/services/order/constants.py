@@ -3,6 +3,41 @@ from enum import StrEnum
 SELF_PICKUP_ADDRESS = 'г. Москва, м. Красные Ворота, ул. Новая Басманная, д.12, с2 (выход из метро №2)'
 SELF_PICKUP_IDENTIFIER = 'Самовывоз'
 
+ORDER_EXPIRATION_GRACE_PERIOD = 15 * 60
+ORDER_EXPIRATION_BATCH_SIZE = 100
+
+ORDER_LIST_PAGE_DEFAULT_SIZE = 20
+ORDER_LIST_PAGE_MAX_SIZE = 50
+ORDER_LIST_CURSOR_SIZE = 2
+
+PAYMENT_INIT_BATCH_SIZE = 20
+PAYMENT_INIT_MAX_ATTEMPTS = 8
+PAYMENT_INIT_RETRY_DELAY = 2
+PAYMENT_INIT_CONCURRENCY = 5
+PAYMENT_INIT_RATE = 20
+
+PAYMENT_NOTIFICATION_BATCH_SIZE = 100
+
+PAYMENT_RECONCILE_BATCH_SIZE = 500
+PAYMENT_RECONCILE_CONCURRENCY = 20
+PAYMENT_RECONCILE_RATE = 50
+PAYMENT_RECONCILE_MIN_AGE = 5 * 60
+
+CREDIT_BILLING_BATCH_SIZE = 200
+CREDIT_BILLING_CONCURRENCY = 10
+CREDIT_BILLING_RATE = 20
+CREDIT_PAYMENT_LINK_TTL = 3 * 24
+
+PAYMENT_LINK_KEY = 'payment_link'
+PAYMENT_LINK_WAIT_TIMEOUT = 10
+PAYMENT_LINK_POLL_INTERVAL = 0.5
+
+IDEMPOTENCY_KEY = 'idempotency'
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IDEMPOTENCY_PENDING_TTL = 60
+IDEMPOTENCY_WAIT_TIMEOUT = 10
+IDEMPOTENCY_POLL_INTERVAL = 0.1
+
 
 class DeliveryService(StrEnum):
     CDEK = 'CDEK'
@@ -25,6 +60,12 @@ class OrderStatus(StrEnum):
     CANCELED = 'CANCELED'
 
 
+class PaymentInitStatus(StrEnum):
+    PENDING = 'PENDING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+
 class InvoiceType(StrEnum):
     INITIAL = 'INITIAL'
     CREDIT = 'CREDIT'
@@ -37,6 +78,17 @@ PAYMENT_TO_INVOICE_STATUS_MAPPING = {
     'CONFIRMED': InvoiceStatus.PAID,
 }
 
+PAYMENT_FINAL_STATUSES = [
+    'CONFIRMED',
+    'CANCELED',
+    'REJECTED',
+    'REVERSED',
+    'REFUNDED',
+    'PARTIAL_REFUNDED',
+    'DEADLINE_EXPIRED',
+    'AUTH_FAIL',
+]
+
 INVOICE_TO_ORDER_STATUS_MAPPING = {
     InvoiceStatus.PAID: OrderStatus.ACCEPTED,
 }
@@ -6,6 +6,21 @@ class InvalidCheckoutDataError(ServerError):
     message = 'Неверные данные для оформления заказа'
 
 
+class OrderNotFoundError(ExpectedError):
+    status_code = 404
+    message = 'Заказ не найден'
+
+
 class CheckoutDataIsEmptyError(ExpectedError):
     status_code = 400
     message = 'Отсутствуют данные для оформления заказа'
+
+
+class IdempotencyKeyReusedError(ExpectedError):
+    status_code = 422
+    message = 'Ключ идемпотентности уже использован для другого запроса'
+
+
+class IdempotentRequestInProgressError(ExpectedError):
+    status_code = 409
+    message = 'Запрос уже обрабатывается'
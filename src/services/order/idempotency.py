@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, TYPE_CHECKING
+
+import orjson
+from singleton_decorator import singleton
+
+from integrations.redis.client import RedisClient
+from services.order.constants import (
+    IDEMPOTENCY_KEY,
+    IDEMPOTENCY_PENDING_TTL,
+    IDEMPOTENCY_POLL_INTERVAL,
+    IDEMPOTENCY_TTL,
+    IDEMPOTENCY_WAIT_TIMEOUT,
+)
+from services.order.errors import IdempotencyKeyReusedError, IdempotentRequestInProgressError
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+
+@singleton
+class IdempotencyStore:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def begin(self, key: str, fingerprint: str) -> tuple[bool, Any]:
+        pending = orjson.dumps({'fingerprint': fingerprint, 'is_done': False})
+        if await self._redis.set(f'{IDEMPOTENCY_KEY}:{key}', pending, nx=True, ex=IDEMPOTENCY_PENDING_TTL):
+            return False, None
+
+        for _ in range(int(IDEMPOTENCY_WAIT_TIMEOUT / IDEMPOTENCY_POLL_INTERVAL)):
+            if (payload := await self._redis.get(f'{IDEMPOTENCY_KEY}:{key}')) is None:
+                return await self.begin(key, fingerprint)
+
+            stored = orjson.loads(payload)
+            if stored['fingerprint'] != fingerprint:
+                raise IdempotencyKeyReusedError
+            if stored['is_done']:
+                return True, stored['result']
+
+            await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL)
+
+        raise IdempotentRequestInProgressError
+
+    async def complete(self, key: str, fingerprint: str, result: Any) -> None:
+        payload = orjson.dumps({'fingerprint': fingerprint, 'is_done': True, 'result': result})
+        await self._redis.set(f'{IDEMPOTENCY_KEY}:{key}', payload, ex=IDEMPOTENCY_TTL)
+
+    async def abort(self, key: str) -> None:
+        await self._redis.delete(f'{IDEMPOTENCY_KEY}:{key}')
@@ -1,10 +1,11 @@
+from datetime import datetime
 from uuid import UUID
 
 from pendulum import DateTime
 
 from base_objects.models import SGBaseModel
 from database.repositories.catalog import CreditPart
-from services.order.constants import DeliveryService, InvoiceType, OrderStatus
+from services.order.constants import DeliveryService, InvoiceType, OrderStatus, PaymentInitStatus
 
 
 class Recipient(SGBaseModel):
@@ -54,7 +55,7 @@ class Credit(SGBaseModel):
 class OrderItem(SGBaseModel):
     id: UUID
     title: str
-    image: str
+    image: str | None
     quantity: int
     sum: int
     credit: Credit | None
@@ -76,3 +77,29 @@ class Order(SGBaseModel):
     preorder: PreorderInfo | None
     items: list[OrderItem]
     invoices: list[Invoice]
+
+
+class PaymentLink(SGBaseModel):
+    order_id: UUID
+    status: PaymentInitStatus
+    payment_link: str | None = None
+
+
+class OrderSummaryItem(SGBaseModel):
+    id: UUID
+    title: str
+    image: str | None
+    quantity: int
+
+
+class OrderSummary(SGBaseModel):
+    id: UUID
+    created_at: datetime
+    status: OrderStatus
+    amount: int
+    items: list[OrderSummaryItem]
+
+
+class OrderList(SGBaseModel):
+    items: list[OrderSummary]
+    next_cursor: str | None = None
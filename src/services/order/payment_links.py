@@ -0,0 +1,35 @@
+import asyncio
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from singleton_decorator import singleton
+
+from constants import HOURS_TILL_ORDER_EXPIRES
+from integrations.redis.client import RedisClient
+from services.order.constants import PAYMENT_LINK_KEY, PAYMENT_LINK_POLL_INTERVAL, PAYMENT_LINK_WAIT_TIMEOUT
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+
+@singleton
+class PaymentLinkCache:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def get(self, order_id: UUID) -> str | None:
+        return await self._redis.get(f'{PAYMENT_LINK_KEY}:{order_id}')
+
+    async def wait(self, order_id: UUID) -> str | None:
+        for _ in range(int(PAYMENT_LINK_WAIT_TIMEOUT / PAYMENT_LINK_POLL_INTERVAL)):
+            if (payment_link := await self.get(order_id)) is not None:
+                return payment_link
+            await asyncio.sleep(PAYMENT_LINK_POLL_INTERVAL)
+        return await self.get(order_id)
+
+    async def save(self, links: dict[UUID, str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for order_id, link in links.items():
+                pipe.set(f'{PAYMENT_LINK_KEY}:{order_id}', link, ex=HOURS_TILL_ORDER_EXPIRES * 60 * 60)
+            await pipe.execute()
@@ -1,38 +1,77 @@
-from uuid import UUID
+import asyncio
+from functools import partial
+from uuid import UUID, uuid4
 
 import pendulum
+from loguru import logger
+from pydantic import TypeAdapter
 
 from constants import HOURS_TILL_ORDER_EXPIRES
-from database.constants import AttachmentType
-from database.models import DeliveryORM, InvoiceORM, OrderItemORM, OrderORM, PaymentORM
-from database.repositories.order import OrderRepository
+from database.models import DeliveryORM, InvoiceORM, OrderItemORM, OrderORM, PaymentInitORM, PaymentORM
+from database.repositories.order import (
+    DueCreditInvoiceDTO,
+    OrderListKeyDTO,
+    OrderRepository,
+    PaymentStatusUpdateDTO,
+    UnsettledPaymentDTO,
+)
 from errors.auth import ForbiddenError
+from errors.transport import InvalidCursorError
+from integrations.ory_kratos.client import OryKratosAdminClient
 from integrations.ory_kratos.models import UserIdentity
+from integrations.integration_client_utils import RateLimiter
 from integrations.tinkoff.client import TinkoffClient
-from integrations.tinkoff.models import InitPaymentRequest, PaymentStatusNotification, Receipt, ReceiptItem
+from integrations.tinkoff.models import (
+    GetStateResponse,
+    InitPaymentRequest,
+    InitPaymentResponse,
+    PaymentStatusNotification,
+    Receipt,
+    ReceiptItem,
+)
 from services.catalog.models import AvailableCheckoutItem
-from services.catalog.utils import get_attachment_urls_by_type
 from services.order.constants import (
+    CREDIT_BILLING_CONCURRENCY,
+    CREDIT_BILLING_RATE,
+    CREDIT_PAYMENT_LINK_TTL,
     DELIVERY_TRACKING_LINK_MAPPING,
     INVOICE_TO_ORDER_STATUS_MAPPING,
     InvoiceStatus,
     InvoiceType,
+    ORDER_EXPIRATION_GRACE_PERIOD,
+    ORDER_LIST_CURSOR_SIZE,
     OrderStatus,
+    PAYMENT_INIT_CONCURRENCY,
+    PAYMENT_INIT_MAX_ATTEMPTS,
+    PAYMENT_INIT_RATE,
+    PAYMENT_FINAL_STATUSES,
+    PAYMENT_INIT_RETRY_DELAY,
+    PAYMENT_RECONCILE_CONCURRENCY,
+    PAYMENT_RECONCILE_MIN_AGE,
+    PAYMENT_RECONCILE_RATE,
     PAYMENT_TO_INVOICE_STATUS_MAPPING,
+    PaymentInitStatus,
 )
+from services.order.errors import OrderNotFoundError
 from services.order.models import (
     Credit,
-    CreditPart,
     Delivery,
     DeliveryPoint,
     Invoice,
     Order,
     OrderItem,
+    OrderList,
+    OrderSummary,
+    PaymentLink,
     PreorderInfo,
     Recipient,
     Tracking,
 )
-from services.order.utils import make_order_invoices_objects
+from services.order.payment_links import PaymentLinkCache
+from services.order.utils import make_order_invoices_rows
+from utils import decode_cursor, encode_cursor
+
+ORDER_SUMMARIES_ADAPTER = TypeAdapter(list[OrderSummary])
 
 
 class OrderService:
@@ -50,37 +89,59 @@ class OrderService:
         credit_items_ids: list[UUID],
         delivery_data: Delivery | None,
         checkout_items: list[AvailableCheckoutItem],
-    ) -> str:
-        invoices = make_order_invoices_objects(checkout_items, credit_items_ids)
-        order_id = await self.order_repository.create(
-            OrderORM(
-                user_id=user.id,
-                preorder_id=checkout_items[0].preorder_id,
-                status=OrderStatus.UNPAID.value,
-                delivery=(
-                    DeliveryORM(
-                        service=delivery_data.service,
-                        address=delivery_data.point.address,
-                        address_identifier=delivery_data.point.code,
-                        recipient_name=delivery_data.recipient.full_name,
-                        recipient_phone=delivery_data.recipient.phone,
-                    )
-                    if delivery_data
-                    else None
-                ),
-                order_items=[
-                    OrderItemORM(
-                        item_id=item.id,
-                        quantity=item.quantity,
-                        price=item.price,
-                        by_credit=item.id in credit_items_ids,
-                        invoices=invoices.get(str(item.id), None),
-                    )
-                    for item in checkout_items
+    ) -> UUID:
+        order_id = uuid4()
+        order_item_ids = {item.id: uuid4() for item in checkout_items}
+        initial_invoice, credit_invoices = make_order_invoices_rows(
+            order_id=order_id,
+            order_item_ids=order_item_ids,
+            checkout_items=checkout_items,
+            credit_items_ids=credit_items_ids,
+        )
+
+        delivery_id = None
+        if delivery_data:
+            delivery_id, *_ = await self.order_repository.bulk_create(
+                DeliveryORM,
+                [
+                    {
+                        'id': uuid4(),
+                        'service': delivery_data.service,
+                        'address': delivery_data.point.address,
+                        'address_identifier': delivery_data.point.code,
+                        'recipient_name': delivery_data.recipient.full_name,
+                        'recipient_phone': delivery_data.recipient.phone,
+                    }
                 ],
-                invoices=invoices,
             )
+
+        await self.order_repository.bulk_create(
+            OrderORM,
+            [
+                {
+                    'id': order_id,
+                    'user_id': user.id,
+                    'preorder_id': checkout_items[0].preorder_id,
+                    'delivery_id': delivery_id,
+                    'status': OrderStatus.UNPAID.value,
+                }
+            ],
+        )
+        await self.order_repository.bulk_create(
+            OrderItemORM,
+            [
+                {
+                    'id': order_item_ids[item.id],
+                    'order_id': order_id,
+                    'item_id': item.id,
+                    'quantity': item.quantity,
+                    'price': item.price,
+                    'by_credit': item.id in credit_items_ids,
+                }
+                for item in checkout_items
+            ],
         )
+        await self.order_repository.bulk_create(InvoiceORM, [initial_invoice, *credit_invoices])
 
         receipt_items = [
             ReceiptItem(
@@ -92,73 +153,330 @@ class OrderService:
             for item in checkout_items
         ]
 
-        init_payment_created_at = pendulum.now(tz='Europe/Moscow').replace(microsecond=0)
-        init_payment_due_date = init_payment_created_at.add(hours=HOURS_TILL_ORDER_EXPIRES)
-
-        payment = await self.tinkoff_client.init_payment(
-            InitPaymentRequest(
-                amount=sum([item.amount for item in receipt_items]),
-                order_id=invoices['INITIAL'].id,
-                description=f'Номер заказа: {order_id}',
-                data={'Phone': user.traits.phone, 'Email': user.traits.email},
-                redirect_due_date=init_payment_due_date,
-                receipt=Receipt(
-                    email=user.traits.email,
-                    phone=user.traits.phone,
-                    items=receipt_items,
-                ),
-            )
+        created_at = pendulum.now(tz='Europe/Moscow').replace(microsecond=0)
+        redirect_due_date = created_at.add(hours=HOURS_TILL_ORDER_EXPIRES)
+
+        request = InitPaymentRequest(
+            amount=sum([item.amount for item in receipt_items]),
+            order_id=initial_invoice['id'],
+            description=f'Номер заказа: {order_id}',
+            data={'Phone': user.traits.phone, 'Email': user.traits.email},
+            redirect_due_date=redirect_due_date,
+            receipt=Receipt(
+                email=user.traits.email,
+                phone=user.traits.phone,
+                items=receipt_items,
+            ),
         )
 
         await self.order_repository.create(
-            PaymentORM(
-                created_at=init_payment_created_at,
-                updated_at=init_payment_due_date,
-                invoice_id=invoices['INITIAL'].id,
-                url=payment.payment_url,
-                status=payment.status,
-                external_id=payment.payment_id,
+            PaymentInitORM(
+                order_id=order_id,
+                invoice_id=initial_invoice['id'],
+                payload=request.model_dump(mode='json', by_alias=True, exclude={'redirect_due_date'}),
+                redirect_due_date=redirect_due_date,
+                status=PaymentInitStatus.PENDING.value,
+                next_attempt_at=created_at,
             )
         )
 
-        return payment.payment_url
+        return order_id
+
+    async def process_payment_inits(self, limit: int) -> int:
+        now = pendulum.now(tz='Europe/Moscow').replace(microsecond=0)
+        payment_inits = await self.order_repository.lock_due_payment_inits(
+            status=PaymentInitStatus.PENDING.value,
+            due_before=now,
+            limit=limit,
+        )
+
+        semaphore = asyncio.Semaphore(PAYMENT_INIT_CONCURRENCY)
+        rate_limiter = RateLimiter(PAYMENT_INIT_RATE)
 
-    async def update_payment_status(self, payment_notification: PaymentStatusNotification) -> None:
-        invoice = await self.order_repository.read(InvoiceORM, payment_notification.invoice_id)
+        async def init_payment(payment_init: PaymentInitORM) -> InitPaymentResponse:
+            request = InitPaymentRequest.model_validate(
+                {**payment_init.payload, 'RedirectDueDate': pendulum.instance(payment_init.redirect_due_date)}
+            )
+            async with semaphore:
+                await rate_limiter.acquire()
+                return await self.tinkoff_client.init_payment(request)
 
-        for payment in invoice.payments:
-            if payment.external_id == payment_notification.payment_id:
-                payment.status = payment_notification.status
+        results = await asyncio.gather(*map(init_payment, payment_inits), return_exceptions=True)
 
-                if new_invoice_status := PAYMENT_TO_INVOICE_STATUS_MAPPING.get(payment.status):
-                    invoice.status = new_invoice_status.value
+        payment_links = {}
+        for payment_init, result in zip(payment_inits, results, strict=True):
+            payment_init.attempts += 1
 
-                if invoice.type == InvoiceType.INITIAL and (
-                    new_order_status := INVOICE_TO_ORDER_STATUS_MAPPING.get(invoice.status)
-                ):
-                    invoice.order.status = new_order_status.value
+            if isinstance(result, Exception):
+                logger.warning(f'Payment init for order {payment_init.order_id} failed: {result!r}')
+                payment_init.error = repr(result)
+                if payment_init.attempts >= PAYMENT_INIT_MAX_ATTEMPTS:
+                    payment_init.status = PaymentInitStatus.FAILED.value
+                else:
+                    payment_init.next_attempt_at = now.add(seconds=PAYMENT_INIT_RETRY_DELAY * 2**payment_init.attempts)
+                continue
 
-    async def get_user_order(self, order_id: UUID, user_id: UUID) -> Order:
-        order = await self.order_repository.read(
-            db_model=OrderORM,
-            ident=order_id,
+            payment_init.status = PaymentInitStatus.DONE.value
+            payment_init.error = None
+            await self.order_repository.create(
+                PaymentORM(
+                    created_at=now,
+                    updated_at=payment_init.redirect_due_date,
+                    expires_at=payment_init.redirect_due_date,
+                    invoice_id=payment_init.invoice_id,
+                    url=result.payment_url,
+                    status=result.status,
+                    external_id=result.payment_id,
+                )
+            )
+            payment_links[payment_init.order_id] = result.payment_url
+
+        if payment_links:
+            self.order_repository.add_after_commit_callback(partial(PaymentLinkCache().save, payment_links))
+
+        return len(payment_inits)
+
+    async def collect_due_credit_invoices(self, limit: int) -> int:
+        now = pendulum.now(tz='Europe/Moscow').replace(microsecond=0)
+        invoices = await self.order_repository.lock_due_credit_invoices(
+            status=InvoiceStatus.UNPAID.value,
+            invoice_type=InvoiceType.CREDIT.value,
+            due_on=now.date(),
+            billable_order_statuses=[
+                OrderStatus.ACCEPTED.value,
+                OrderStatus.ASSEMBLY.value,
+                OrderStatus.DELIVERY.value,
+                OrderStatus.FINISHED.value,
+            ],
+            final_payment_statuses=PAYMENT_FINAL_STATUSES,
+            payment_expires_after=now,
+            limit=limit,
         )
+        if not invoices:
+            return 0
+
+        semaphore = asyncio.Semaphore(CREDIT_BILLING_CONCURRENCY)
+        rate_limiter = RateLimiter(CREDIT_BILLING_RATE)
+
+        if user_ids := {invoice.user_id for invoice in invoices if not (invoice.email and invoice.phone)}:
+            async with OryKratosAdminClient() as client:
+
+                async def get_identity(user_id: UUID) -> dict | None:
+                    async with semaphore:
+                        await rate_limiter.acquire()
+                        return await client.get_identity(user_id)
+
+                identities = await asyncio.gather(*map(get_identity, user_ids))
+            contacts = {UUID(identity['id']): identity['traits'] for identity in identities if identity}
+            for invoice in invoices:
+                traits = contacts.get(invoice.user_id, {})
+                invoice.email = invoice.email or traits.get('email')
+                invoice.phone = invoice.phone or traits.get('phone')
+
+        redirect_due_date = now.add(hours=CREDIT_PAYMENT_LINK_TTL)
+
+        async def init_payment(invoice: DueCreditInvoiceDTO) -> InitPaymentResponse:
+            receipt_item = ReceiptItem(
+                name=f'{invoice.title}, платёж {invoice.credit_part_index + 1}',
+                price=invoice.amount * 100,
+                quantity=1,
+                amount=invoice.amount * 100,
+            )
+            async with semaphore:
+                await rate_limiter.acquire()
+                return await self.tinkoff_client.init_payment(
+                    InitPaymentRequest(
+                        amount=receipt_item.amount,
+                        order_id=invoice.id,
+                        description=f'Оплата рассрочки по заказу: {invoice.order_id}',
+                        data={'Phone': invoice.phone, 'Email': invoice.email},
+                        redirect_due_date=redirect_due_date,
+                        receipt=Receipt(email=invoice.email, phone=invoice.phone, items=[receipt_item]),
+                    )
+                )
+
+        results = await asyncio.gather(*map(init_payment, invoices), return_exceptions=True)
+
+        payments = []
+        for invoice, result in zip(invoices, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f'Credit payment init for invoice {invoice.id} failed: {result!r}')
+                continue
+
+            payments.append(
+                {
+                    'id': uuid4(),
+                    'created_at': now,
+                    'updated_at': now,
+                    'expires_at': redirect_due_date,
+                    'invoice_id': invoice.id,
+                    'url': result.payment_url,
+                    'status': result.status,
+                    'external_id': result.payment_id,
+                }
+            )
+
+        await self.order_repository.bulk_create(PaymentORM, payments)
+        return len(payments)
+
+    async def get_payment_link(self, order_id: UUID, user_id: UUID) -> PaymentLink:
+        state = await self.order_repository.get_payment_init_state(order_id=order_id, user_id=user_id)
+        if state is None:
+            raise OrderNotFoundError
+
+        if state.status != PaymentInitStatus.PENDING.value:
+            return PaymentLink(order_id=order_id, status=state.status, payment_link=state.payment_url)
+
+        await self.order_repository.release_connection()
+
+        if (payment_link := await PaymentLinkCache().wait(order_id)) is None:
+            return PaymentLink(order_id=order_id, status=PaymentInitStatus.PENDING)
+        return PaymentLink(order_id=order_id, status=PaymentInitStatus.DONE, payment_link=payment_link)
+
+    async def cancel_expired_orders(self, limit: int) -> tuple[list[UUID], dict[UUID, int]]:
+        expires_at = pendulum.now().subtract(hours=HOURS_TILL_ORDER_EXPIRES, seconds=ORDER_EXPIRATION_GRACE_PERIOD)
+        order_ids = await self.order_repository.lock_expired_order_ids(
+            status=OrderStatus.UNPAID.value,
+            created_before=expires_at,
+            initial_invoice_type=InvoiceType.INITIAL.value,
+            settled_invoice_statuses=[InvoiceStatus.WAITING.value, InvoiceStatus.PAID.value],
+            limit=limit,
+        )
+        if not order_ids:
+            return [], {}
+
+        released_items = await self.order_repository.cancel_orders(
+            order_ids=order_ids,
+            order_status=OrderStatus.CANCELED.value,
+            invoice_status=InvoiceStatus.CANCELED.value,
+            cancelable_invoice_statuses=[InvoiceStatus.UNPAID.value],
+        )
+        return order_ids, released_items
+
+    async def enqueue_payment_notification(self, payment_notification: PaymentStatusNotification) -> None:
+        await self.order_repository.enqueue_payment_notification(
+            invoice_id=payment_notification.invoice_id,
+            payment_id=payment_notification.payment_id,
+            status=payment_notification.status,
+        )
+
+    async def apply_payment_notifications(self, limit: int) -> int:
+        notifications = await self.order_repository.lock_pending_payment_notifications(limit=limit)
+        if not notifications:
+            return 0
+
+        payment_statuses = {
+            (notification.invoice_id, notification.payment_id): notification.status for notification in notifications
+        }
+        await self._apply_payment_statuses(
+            [
+                PaymentStatusUpdateDTO(invoice_id=invoice_id, payment_id=payment_id, status=status)
+                for (invoice_id, payment_id), status in payment_statuses.items()
+            ]
+        )
+
+        await self.order_repository.mark_payment_notifications_processed(
+            [notification.id for notification in notifications]
+        )
+        return len(notifications)
+
+    async def reconcile_payments(self, after_id: UUID | None, limit: int) -> tuple[UUID | None, int]:
+        payments = await self.order_repository.get_unsettled_payments(
+            final_statuses=PAYMENT_FINAL_STATUSES,
+            created_before=pendulum.now().subtract(seconds=PAYMENT_RECONCILE_MIN_AGE),
+            after_id=after_id,
+            limit=limit,
+        )
+        if not payments:
+            return None, 0
+
+        semaphore = asyncio.Semaphore(PAYMENT_RECONCILE_CONCURRENCY)
+        rate_limiter = RateLimiter(PAYMENT_RECONCILE_RATE)
+
+        async def get_state(payment: UnsettledPaymentDTO) -> GetStateResponse:
+            async with semaphore:
+                await rate_limiter.acquire()
+                return await self.tinkoff_client.get_state(payment.payment_id)
+
+        results = await asyncio.gather(*map(get_state, payments), return_exceptions=True)
+
+        changed = []
+        for payment, result in zip(payments, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f'Payment state check for {payment.payment_id} failed: {result!r}')
+                continue
+            if result.status != payment.status:
+                changed.append(
+                    PaymentStatusUpdateDTO(
+                        invoice_id=payment.invoice_id,
+                        payment_id=payment.payment_id,
+                        status=result.status,
+                        old_status=payment.status,
+                    )
+                )
+
+        await self._apply_payment_statuses(changed)
+        return payments[-1].id, len(changed)
+
+    async def _apply_payment_statuses(self, statuses: list[PaymentStatusUpdateDTO]) -> None:
+        payments = await self.order_repository.update_payment_statuses(statuses, final_statuses=PAYMENT_FINAL_STATUSES)
+
+        invoices = await self.order_repository.update_invoice_statuses(
+            {
+                payment.invoice_id: invoice_status.value
+                for payment in payments
+                if (invoice_status := PAYMENT_TO_INVOICE_STATUS_MAPPING.get(payment.status))
+            }
+        )
+
+        await self.order_repository.update_order_statuses(
+            {
+                invoice.order_id: order_status.value
+                for invoice in invoices
+                if invoice.type == InvoiceType.INITIAL
+                and (order_status := INVOICE_TO_ORDER_STATUS_MAPPING.get(invoice.status))
+            },
+            current_status=OrderStatus.UNPAID.value,
+        )
+
+    async def get_user_orders_page(self, user_id: UUID, limit: int, cursor: str | None = None) -> OrderList:
+        after = None
+        if cursor:
+            cursor_values = decode_cursor(cursor)
+            if len(cursor_values) != ORDER_LIST_CURSOR_SIZE:
+                raise InvalidCursorError
+            after = OrderListKeyDTO(created_at=cursor_values[0], id=cursor_values[1])
+
+        orders = ORDER_SUMMARIES_ADAPTER.validate_json(
+            await self.order_repository.get_user_orders_page_json(user_id=user_id, after=after, limit=limit + 1)
+        )
+
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor([orders[-1].created_at, orders[-1].id])
+
+        return OrderList(items=orders, next_cursor=next_cursor)
+
+    async def get_user_order(self, order_id: UUID, user_id: UUID) -> Order:
+        order = await self.order_repository.get_order_details(order_id)
+        if order is None:
+            raise OrderNotFoundError
 
         if order.user_id != user_id:
             raise ForbiddenError
 
         order_items = []
-        for item in order.order_items:
+        for item in order.items:
             credit = None
             if item.by_credit:
-                item_unpaid_invoices = [
-                    invoice for invoice in item.invoices if invoice.status == InvoiceStatus.UNPAID.value
-                ]
-
-                first_unpaid_invoice = next(iter(item_unpaid_invoices), None)
+                first_unpaid_invoice = next(
+                    (invoice for invoice in item.invoices if invoice.status == InvoiceStatus.UNPAID.value),
+                    None,
+                )
 
                 credit = Credit(
-                    payments=[CreditPart.model_validate(part) for part in item.info.credit_plan.parts],
+                    payments=item.credit_parts,
                     paid_parts=(first_unpaid_invoice.credit_part_index if first_unpaid_invoice else len(item.invoices)),
                     invoice=(
                         Invoice(
@@ -176,25 +494,28 @@ class OrderService:
             order_items.append(
                 OrderItem(
                     id=item.item_id,
-                    title=item.info.product.title,
-                    image=get_attachment_urls_by_type(item.info.product.attachments, AttachmentType.IMAGE)[0],
+                    title=item.title,
+                    image=item.image,
                     quantity=item.quantity,
                     sum=item.quantity * item.price,
                     credit=credit,
                 )
             )
 
-        formatted_preorder_date = order.preorder.created_at.strftime('%d.%m.%Y')
         return Order(
             id=order.id,
             created_at=order.created_at,
             status=order.status,
             items=order_items,
-            preorder=PreorderInfo(
-                id=order.preorder_id,
-                title=f'Предзаказ от {formatted_preorder_date}',
-                status=order.preorder.status,
-                expected_arrival=order.preorder.expected_arrival,
+            preorder=(
+                PreorderInfo(
+                    id=order.preorder.id,
+                    title=f'Предзаказ от {order.preorder.created_at.strftime("%d.%m.%Y")}',
+                    status=order.preorder.status,
+                    expected_arrival=order.preorder.expected_arrival,
+                )
+                if order.preorder
+                else None
             ),
             delivery=(
                 Delivery(
@@ -1,6 +1,6 @@
-from uuid import UUID
+from typing import Any
+from uuid import UUID, uuid4
 
-from database.models import InvoiceORM
 from services.catalog.models import AvailableCheckoutItem
 from services.order.constants import (
     InvoiceStatus,
@@ -8,52 +8,72 @@ from services.order.constants import (
 )
 
 
-def make_order_invoices_objects(
-    checkout_items: list[AvailableCheckoutItem], credit_items_ids: list[UUID]
-) -> dict[str, InvoiceORM | list[InvoiceORM]]:
+def make_invoice_row(
+    *,
+    order_id: UUID,
+    title: str,
+    invoice_type: InvoiceType,
+    amount: int,
+    order_item_id: UUID | None = None,
+    credit_part_index: int | None = None,
+) -> dict[str, Any]:
+    return {
+        'id': uuid4(),
+        'order_id': order_id,
+        'order_item_id': order_item_id,
+        'credit_part_index': credit_part_index,
+        'title': title,
+        'type': invoice_type.value,
+        'amount': amount,
+        'status': InvoiceStatus.UNPAID.value,
+    }
+
+
+def make_order_invoices_rows(
+    order_id: UUID,
+    order_item_ids: dict[UUID, UUID],
+    checkout_items: list[AvailableCheckoutItem],
+    credit_items_ids: list[UUID],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
     if not credit_items_ids:
-        return {
-            'INITIAL': InvoiceORM(
+        return (
+            make_invoice_row(
+                order_id=order_id,
                 title='Оплата заказа',
-                type=InvoiceType.INITIAL.value,
+                invoice_type=InvoiceType.INITIAL,
                 amount=sum([item.price * item.quantity for item in checkout_items]),
-                status=InvoiceStatus.UNPAID.value,
-            )
-        }
+            ),
+            [],
+        )
 
     initial_sum = 0
-    credit_item_invoices = {}
+    credit_invoices = []
 
     for item in checkout_items:
         if item.credit_parts:
-            item_invoices = []
             for index, part in enumerate(item.credit_parts):
                 if index == 0:
                     initial_sum += part.sum * item.quantity
                     continue
 
-                item_invoices.append(
-                    InvoiceORM(
+                credit_invoices.append(
+                    make_invoice_row(
+                        order_id=order_id,
                         title='Оплата рассрочки',
-                        credit_part_index=index,
-                        type=InvoiceType.CREDIT.value,
+                        invoice_type=InvoiceType.CREDIT,
                         amount=part.sum * item.quantity,
-                        status=InvoiceStatus.UNPAID.value,
+                        order_item_id=order_item_ids[item.id],
+                        credit_part_index=index,
                     )
                 )
-
-            credit_item_invoices[str(item.id)] = sorted(item_invoices, key=lambda x: x.credit_part_index)
         else:
             initial_sum += item.price * item.quantity
 
-    initial_invoice = InvoiceORM(
+    initial_invoice = make_invoice_row(
+        order_id=order_id,
         title='Оплата депозита заказа',
-        type=InvoiceType.INITIAL.value,
+        invoice_type=InvoiceType.INITIAL,
         amount=initial_sum,
-        status=InvoiceStatus.UNPAID.value,
     )
 
-    return {
-        'INITIAL': initial_invoice,
-        **credit_item_invoices,
-    }
+    return initial_invoice, credit_invoices
@@ -0,0 +1,7 @@
+WAITING_ROOM_TAIL_KEY = 'waiting_room:tail'
+WAITING_ROOM_HEAD_KEY = 'waiting_room:head'
+WAITING_ROOM_ADVANCED_AT_KEY = 'waiting_room:advanced_at'
+WAITING_ROOM_ADMISSION_USES_KEY = 'waiting_room:admission_uses'
+
+WAITING_ROOM_TICKET_SCOPE = 'ticket'
+WAITING_ROOM_ADMISSION_SCOPE = 'admission'
@@ -0,0 +1,11 @@
+from errors.base import ExpectedError
+
+
+class InvalidWaitingRoomTicketError(ExpectedError):
+    status_code: int = 400
+    message: str = 'Недействительный билет очереди'
+
+
+class WaitingRoomAdmissionRequiredError(ExpectedError):
+    status_code: int = 429
+    message: str = 'Слишком много желающих, дождитесь своей очереди'
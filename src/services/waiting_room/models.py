@@ -0,0 +1,7 @@
+from base_objects.models import SGBaseModel
+
+
+class WaitingRoomStatus(SGBaseModel):
+    ticket: str
+    position: int
+    admission_token: str | None = None
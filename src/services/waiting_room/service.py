@@ -0,0 +1,98 @@
+import time
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from integrations.redis.client import RedisClient
+from services.waiting_room.constants import (
+    WAITING_ROOM_ADMISSION_SCOPE,
+    WAITING_ROOM_ADMISSION_USES_KEY,
+    WAITING_ROOM_ADVANCED_AT_KEY,
+    WAITING_ROOM_HEAD_KEY,
+    WAITING_ROOM_TAIL_KEY,
+    WAITING_ROOM_TICKET_SCOPE,
+)
+from services.waiting_room.errors import InvalidWaitingRoomTicketError, WaitingRoomAdmissionRequiredError
+from services.waiting_room.models import WaitingRoomStatus
+from services.waiting_room.utils import sign_token, unsign_token
+from settings import Settings
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+
+WAITING_ROOM_KEYS = [WAITING_ROOM_TAIL_KEY, WAITING_ROOM_HEAD_KEY, WAITING_ROOM_ADVANCED_AT_KEY]
+
+ADVANCE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local tail = tonumber(redis.call('GET', KEYS[1]) or 0)
+local head = tonumber(redis.call('GET', KEYS[2]) or 0)
+local advanced_at = tonumber(redis.call('GET', KEYS[3]) or 0)
+
+local admitted = math.floor((now - advanced_at) * rate / 1000)
+if head + admitted >= tail then
+    head = tail
+    advanced_at = now
+elseif admitted > 0 then
+    head = head + admitted
+    advanced_at = advanced_at + math.floor(admitted * 1000 / rate)
+end
+
+redis.call('SET', KEYS[2], head)
+redis.call('SET', KEYS[3], advanced_at)
+return head
+"""
+
+
+class WaitingRoomService:
+    @property
+    def _redis(self) -> 'Redis':
+        return RedisClient().client
+
+    async def join(self, user_id: UUID) -> WaitingRoomStatus:
+        ticket_number = await self._redis.incr(WAITING_ROOM_TAIL_KEY)
+        ticket = sign_token(
+            WAITING_ROOM_TICKET_SCOPE, str(user_id), ticket_number, Settings().env.waiting_room.ticket_ttl
+        )
+        return await self._get_status(user_id=user_id, ticket_number=ticket_number, ticket=ticket)
+
+    async def get_status(self, user_id: UUID, ticket: str) -> WaitingRoomStatus:
+        if (ticket_number := unsign_token(WAITING_ROOM_TICKET_SCOPE, str(user_id), ticket)) is None:
+            raise InvalidWaitingRoomTicketError
+        return await self._get_status(user_id=user_id, ticket_number=ticket_number, ticket=ticket)
+
+    async def check_admission(self, user_id: UUID, admission_token: str | None) -> None:
+        settings = Settings().env.waiting_room
+        if not settings.enabled:
+            return
+
+        if not admission_token or (
+            (ticket_number := unsign_token(WAITING_ROOM_ADMISSION_SCOPE, str(user_id), admission_token)) is None
+        ):
+            raise WaitingRoomAdmissionRequiredError
+
+        uses_key = f'{WAITING_ROOM_ADMISSION_USES_KEY}:{ticket_number}'
+        async with self._redis.pipeline(transaction=True) as pipe:
+            uses, _ = await pipe.incr(uses_key).expire(uses_key, settings.ticket_ttl + settings.admission_ttl).execute()
+        if uses > settings.admission_max_uses:
+            raise WaitingRoomAdmissionRequiredError
+
+    async def _get_status(self, user_id: UUID, ticket_number: int, ticket: str) -> WaitingRoomStatus:
+        settings = Settings().env.waiting_room
+        head = await self._redis.eval(
+            ADVANCE_SCRIPT,
+            len(WAITING_ROOM_KEYS),
+            *WAITING_ROOM_KEYS,
+            int(time.time() * 1000),
+            settings.admission_rate,
+        )
+
+        position = max(ticket_number - head, 0)
+        return WaitingRoomStatus(
+            ticket=ticket,
+            position=position,
+            admission_token=(
+                sign_token(WAITING_ROOM_ADMISSION_SCOPE, str(user_id), ticket_number, settings.admission_ttl)
+                if not position
+                else None
+            ),
+        )
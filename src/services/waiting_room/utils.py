@@ -0,0 +1,26 @@
+import hashlib
+import hmac
+import time
+
+from settings import Settings
+
+
+def _signature(scope: str, subject: str, payload: str) -> str:
+    key = Settings().env.backend.session_secret_key.encode()
+    return hmac.new(key, f'{scope}:{subject}:{payload}'.encode(), hashlib.sha256).hexdigest()
+
+
+def sign_token(scope: str, subject: str, value: int, ttl: int) -> str:
+    payload = f'{value}:{int(time.time()) + ttl}'
+    return f'{payload}.{_signature(scope, subject, payload)}'
+
+
+def unsign_token(scope: str, subject: str, token: str) -> int | None:
+    payload, _, signature = token.rpartition('.')
+    if not hmac.compare_digest(signature, _signature(scope, subject, payload)):
+        return None
+
+    value, _, expires_at = payload.partition(':')
+    if not (value.isdigit() and expires_at.isdigit()) or int(expires_at) < time.time():
+        return None
+    return int(value)
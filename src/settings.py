@@ -65,6 +65,8 @@ class TinkoffIntegrationSettings(_BaseSettings):
     terminal_key: str
     password: str
     url: str
+    stub_enabled: bool = Field(default=False)
+    stub_confirm_payments: bool = Field(default=False)
 
 
 class CDEKIntegrationSettings(_BaseSettings):
@@ -73,6 +75,14 @@ class CDEKIntegrationSettings(_BaseSettings):
     url: str
 
 
+class WaitingRoomSettings(_BaseSettings):
+    enabled: bool = Field(default=False)
+    admission_rate: int = Field(default=20, gt=0)
+    admission_ttl: int = Field(default=15 * 60)
+    admission_max_uses: int = Field(default=3, gt=0)
+    ticket_ttl: int = Field(default=60 * 60)
+
+
 class EnvSettings(_BaseSettings):
     environment: str
     backend: BackendSettings = BackendSettings(_env_prefix='BACKEND_')
@@ -82,11 +92,14 @@ class EnvSettings(_BaseSettings):
     tinkoff_integration: TinkoffIntegrationSettings = TinkoffIntegrationSettings(_env_prefix='TINKOFF_INTEGRATION_')
     cdek_integration: CDEKIntegrationSettings = CDEKIntegrationSettings(_env_prefix='CDEK_INTEGRATION_')
     s3: S3Settings = S3Settings(_env_prefix='S3_')
+    waiting_room: WaitingRoomSettings = WaitingRoomSettings(_env_prefix='WAITING_ROOM_')
     redis_dsn: RedisDsn = Field()
     sentry_dsn: str = Field()
     debug: bool = Field(default=False)
     debug_sql_alchemy: bool = Field(default=False)
     use_test_db: bool = Field(default=False)
+    workers_enabled: bool = Field(default=True)
+    inventory_engine_enabled: bool = Field(default=False)
     public_host: AnyUrl
 
 
@@ -1 +1,7 @@
+SESSION_COOKIE_NAME = 'session'
+SESSION_KEY = 'session'
+SESSION_TTL = 14 * 24 * 60 * 60
 SESSION_CHECKOUT_DATA_KEY = 'checkout_data'
+
+WAITING_ROOM_ADMISSION_HEADER = 'X-Admission-Token'
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
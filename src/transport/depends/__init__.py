@@ -1,17 +1,25 @@
 from transport.depends.auth import get_current_user
 from transport.depends.db_session import init_ctx_db_session
+from transport.depends.etag import check_catalog_etag
 from transport.depends.services import (
     get_catalog_service,
     get_file_manager_service,
     get_order_service,
     get_user_service,
+    get_waiting_room_service,
 )
+from transport.depends.session import load_session
+from transport.depends.waiting_room import check_waiting_room_admission
 
 __all__ = [
+    'check_catalog_etag',
+    'check_waiting_room_admission',
     'get_current_user',
     'get_catalog_service',
     'get_order_service',
     'get_user_service',
+    'get_waiting_room_service',
     'get_file_manager_service',
     'init_ctx_db_session',
+    'load_session',
 ]
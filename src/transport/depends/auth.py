@@ -35,8 +35,6 @@ async def get_current_user(request: Request) -> UserIdentity | None:
         metadata_public=session['identity']['metadata_public'],
     )
 
-    request.session.update({'cart': {}})
-
     USER_IDENTITY_CTX.set(user_identity)
     scope: Scope = Scope.get_current_scope()
 
@@ -12,10 +12,12 @@ async def init_ctx_db_session(request: Request) -> None:
         yield
         if request.method != 'GET':
             await SQLAlchemyClient().get_session().commit()
+            await SQLAlchemyClient().run_after_commit_callbacks()
     except Exception as error:
         if not issubclass(type(error), ExpectedError) and request.method != 'GET':
             logger.debug('Rollback transaction')
             await SQLAlchemyClient().get_session().rollback()
+        await SQLAlchemyClient().run_rollback_callbacks()
         raise
     finally:
         await SQLAlchemyClient().close_ctx_session()
@@ -0,0 +1,22 @@
+from fastapi import HTTPException, status
+from starlette.requests import Request
+from starlette.responses import Response
+
+from services.catalog.snapshot import CatalogSnapshot
+
+
+def _parse_if_none_match(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix('W/') for tag in header.split(',')}
+
+
+async def check_catalog_etag(request: Request, response: Response) -> str:
+    etag = f'"catalog-{await CatalogSnapshot().get_version()}"'
+
+    if_none_match = _parse_if_none_match(request.headers.get('if-none-match'))
+    if etag in if_none_match or '*' in if_none_match:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    response.headers['ETag'] = etag
+    return etag
@@ -10,6 +10,7 @@ from services import CatalogService
 from services.file_manager.service import FileManagerService
 from services.order.service import OrderService
 from services.user.service import UserService
+from services.waiting_room.service import WaitingRoomService
 from transport.depends.clients import get_s3_client, get_tinkoff_client
 from transport.depends.repositories import get_catalog_repository, get_order_repository, get_user_repository
 
@@ -37,3 +38,7 @@ async def get_order_service(
     tinkoff_client: Annotated[TinkoffClient, Depends(get_tinkoff_client)],
 ) -> OrderService:
     yield OrderService(order_repository=order_repository, tinkoff_client=tinkoff_client)
+
+
+async def get_waiting_room_service() -> WaitingRoomService:
+    yield WaitingRoomService()
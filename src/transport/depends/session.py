@@ -0,0 +1,9 @@
+from starlette.requests import Request
+
+from utils import USER_IDENTITY_CTX
+
+
+async def load_session(request: Request) -> None:
+    session = await request.session.load()
+    if USER_IDENTITY_CTX.get():
+        session.pop('cart', None)
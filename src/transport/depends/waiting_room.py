@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from fastapi import Depends, Header
+
+from integrations.ory_kratos.models import UserIdentity
+from services.waiting_room.service import WaitingRoomService
+from transport.constants import WAITING_ROOM_ADMISSION_HEADER
+from transport.depends.auth import check_customer_access
+from transport.depends.services import get_waiting_room_service
+
+
+async def check_waiting_room_admission(
+    user_identity: Annotated[UserIdentity, Depends(check_customer_access)],
+    waiting_room_service: Annotated[WaitingRoomService, Depends(get_waiting_room_service)],
+    admission_token: Annotated[str | None, Header(alias=WAITING_ROOM_ADMISSION_HEADER)] = None,
+) -> None:
+    await waiting_room_service.check_admission(user_id=user_identity.id, admission_token=admission_token)
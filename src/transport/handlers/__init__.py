@@ -2,6 +2,7 @@ from transport.handlers.admin.catalog.entrypoints import admin_router
 from transport.handlers.client.catalog.entrypoints import market_router
 from transport.handlers.client.order.entrypoints import order_router
 from transport.handlers.client.user.entrypoints import user_router
+from transport.handlers.client.waiting_room.entrypoints import waiting_room_router
 from transport.handlers.internal.notifications.entrypoints import notification_router
 
 __all__ = [
@@ -10,4 +11,5 @@ __all__ = [
     'order_router',
     'market_router',
     'admin_router',
+    'waiting_room_router',
 ]
@@ -1,13 +1,13 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from base_objects.models import IdResponse
 from services import CatalogService
-from services.catalog.models import CreateProductDTO, ProductDetailed, Publication
+from services.catalog.models import CreateProductDTO, FilterFacets, ProductDetailed, Publication
 from services.file_manager.service import FileManagerService
-from transport.depends import get_catalog_service, get_file_manager_service
+from transport.depends import check_catalog_etag, get_catalog_service, get_file_manager_service
 from transport.handlers.admin.catalog.schemas import (
     CreateCategoryRequestSchema,
     CreateProductSchema,
@@ -16,6 +16,7 @@ from transport.handlers.admin.catalog.schemas import (
     GetFilterGroupsResponseSchema,
     GetProductListResponseSchema,
     GetPublicationListResponseSchema,
+    SplitCatalogItemStockRequestSchema,
 )
 from transport.handlers.admin.catalog.utils import parce_create_product_form
 from transport.middlewares.logging_middleware import FastAPILoggingRoute
@@ -79,6 +80,7 @@ async def get_product_list_entrypoint(
     '/filter-groups',
     status_code=status.HTTP_200_OK,
     response_model=GetFilterGroupsResponseSchema,
+    dependencies=[Depends(check_catalog_etag)],
 )
 async def get_filter_groups_entrypoint(
     catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
@@ -87,6 +89,25 @@ async def get_filter_groups_entrypoint(
     return GetFilterGroupsResponseSchema(items=await catalog_service.get_filter_groups_by_category(category_name))
 
 
+@admin_router.get(
+    '/filter-facets',
+    status_code=status.HTTP_200_OK,
+    response_model=FilterFacets,
+)
+async def get_filter_facets_entrypoint(
+    *,
+    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
+    category_link: str | None = None,
+    filter_ids: Annotated[list[UUID] | None, Query()] = None,
+    is_available: bool | None = None,
+) -> FilterFacets:
+    return await catalog_service.get_filter_facets(
+        category_link=category_link,
+        filter_ids=filter_ids,
+        is_available=is_available,
+    )
+
+
 @admin_router.post(
     '/publication',
     status_code=status.HTTP_201_CREATED,
@@ -109,6 +130,7 @@ async def create_publication_entrypoint(
     '/publication',
     status_code=status.HTTP_200_OK,
     response_model=Publication,
+    dependencies=[Depends(check_catalog_etag)],
 )
 async def get_publication_entrypoint(
     catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
@@ -132,6 +154,7 @@ async def get_publication_list_entrypoint(
     '/category-list',
     status_code=status.HTTP_200_OK,
     response_model=GetCategoryListResponseSchema,
+    dependencies=[Depends(check_catalog_etag)],
 )
 async def get_categories_entrypoint(
     catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
@@ -154,3 +177,16 @@ async def create_category_entrypoint(
             link=category.link,
         )
     )
+
+
+@admin_router.put(
+    '/catalog-item/stock-shards',
+    status_code=status.HTTP_200_OK,
+    response_model=IdResponse,
+)
+async def split_catalog_item_stock_entrypoint(
+    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
+    stock: SplitCatalogItemStockRequestSchema,
+) -> IdResponse:
+    await catalog_service.split_catalog_item_stock(item_id=stock.item_id, shard_count=stock.shard_count)
+    return IdResponse(id=stock.item_id)
@@ -1,8 +1,10 @@
 from uuid import UUID
 
 from fastapi import Form
+from pydantic import Field
 
 from base_objects.models import SGBaseModel
+from services.catalog.constants import STOCK_SHARDS_MAX_COUNT
 from services.catalog.models import (
     CatalogCategory,
     CreateCatalogItemDTO,
@@ -29,6 +31,11 @@ class CreatePublicationRequestSchema(SGBaseModel):
     preorder_id: UUID | None = None
 
 
+class SplitCatalogItemStockRequestSchema(SGBaseModel):
+    item_id: UUID
+    shard_count: int = Field(ge=1, le=STOCK_SHARDS_MAX_COUNT)
+
+
 class CreateCategoryRequestSchema(SGBaseModel):
     title: str
     link: str
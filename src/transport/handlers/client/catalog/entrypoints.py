@@ -1,13 +1,27 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, Depends, Query
 from starlette import status
+from starlette.responses import Response
 
-from integrations.redis.utils import query_params_key_builder
+from database.constants import CatalogSortOrder, PublicationType
+from database.repositories.catalog import CatalogItemsFilterDTO
 from services import CatalogService
-from transport.depends import get_catalog_service
+from services.catalog.constants import (
+    CATALOG_PAGE_DEFAULT_SIZE,
+    CATALOG_PAGE_MAX_SIZE,
+    SEARCH_QUERY_MAX_LENGTH,
+    SEARCH_QUERY_MIN_LENGTH,
+)
+from services.catalog.models import (
+    CatalogAvailability,
+    CatalogItemsPage,
+    CatalogSearchPage,
+    PublicationAvailability,
+    SuggestedItems,
+)
+from transport.depends import check_catalog_etag, get_catalog_service
 from transport.handlers.client.catalog.schemas import (
     GetPublicationsResponseSchema,
 )
@@ -22,39 +36,104 @@ market_router = APIRouter(tags=['market'], prefix='/market', route_class=FastAPI
     status_code=status.HTTP_200_OK,
     response_model=GetPublicationsResponseSchema,
 )
-@cache(expire=3600, namespace='catalog', key_builder=query_params_key_builder)
 async def get_catalog_entrypoint(
+    etag: Annotated[str, Depends(check_catalog_etag)],
     catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
-) -> GetPublicationsResponseSchema:
-    return GetPublicationsResponseSchema(items=await catalog_service.get_publications())
+) -> Response:
+    return Response(
+        content=await catalog_service.get_catalog_snapshot(),
+        media_type='application/json',
+        headers={'ETag': etag},
+    )
+
+
+@market_router.get(
+    path='/catalog/items',
+    summary='Get paginated and filtered catalog items',
+    status_code=status.HTTP_200_OK,
+    response_model=CatalogItemsPage,
+)
+async def get_catalog_items_entrypoint(
+    *,
+    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
+    category_link: str | None = None,
+    filter_ids: Annotated[list[UUID] | None, Query()] = None,
+    publication_type: PublicationType | None = None,
+    min_price: Annotated[int | None, Query(ge=0)] = None,
+    max_price: Annotated[int | None, Query(ge=0)] = None,
+    is_available: bool | None = None,
+    sort: CatalogSortOrder = CatalogSortOrder.NEWEST,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=CATALOG_PAGE_MAX_SIZE)] = CATALOG_PAGE_DEFAULT_SIZE,
+) -> CatalogItemsPage:
+    return await catalog_service.get_catalog_items_page(
+        filters=CatalogItemsFilterDTO(
+            category_link=category_link,
+            filter_ids=filter_ids or [],
+            publication_type=publication_type,
+            min_price=min_price,
+            max_price=max_price,
+            is_available=is_available,
+        ),
+        sort=sort,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+@market_router.get(
+    path='/search',
+    summary='Search catalog items by product title and description',
+    status_code=status.HTTP_200_OK,
+    response_model=CatalogSearchPage,
+)
+async def search_catalog_items_entrypoint(
+    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
+    query: Annotated[str, Query(min_length=SEARCH_QUERY_MIN_LENGTH, max_length=SEARCH_QUERY_MAX_LENGTH)],
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=CATALOG_PAGE_MAX_SIZE)] = CATALOG_PAGE_DEFAULT_SIZE,
+) -> CatalogSearchPage:
+    return await catalog_service.search_catalog_items(text=query, limit=limit, offset=offset)
 
 
 @market_router.get(
     path='/availability/catalog',
     summary='Get catalog items availability',
     status_code=status.HTTP_200_OK,
+    response_model=CatalogAvailability,
+    responses={status.HTTP_304_NOT_MODIFIED: {'description': 'Availability has not changed since the given version'}},
 )
 async def get_catalog_availability_entrypoint(
     catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
-) -> list[UUID]:
-    return await catalog_service.get_available_catalog_item_ids()
+    since_version: Annotated[int | None, Query(ge=0)] = None,
+) -> CatalogAvailability | Response:
+    if not (availability := await catalog_service.get_catalog_availability(since_version=since_version)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+    return availability
 
 
 @market_router.get(
     path='/availability/publication',
     summary='Get catalog items availability for publication',
     status_code=status.HTTP_200_OK,
+    response_model=PublicationAvailability,
 )
 async def get_publication_items_availability_entrypoint(
-    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],  # noqa
-    link: str,  # noqa
-) -> list[UUID]:
-    raise NotImplementedError
+    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
+    link: str,
+) -> Response:
+    return Response(content=await catalog_service.get_publication_availability(link), media_type='application/json')
 
 
 @market_router.get(
     path='/suggested-items',
+    summary='Get items frequently bought together with the given item',
     status_code=status.HTTP_200_OK,
+    response_model=SuggestedItems,
 )
-async def get_suggested_items():
-    return {'items': []}
+async def get_suggested_items(
+    catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
+    item_id: UUID,
+) -> SuggestedItems:
+    return await catalog_service.get_suggested_items(item_id=item_id)
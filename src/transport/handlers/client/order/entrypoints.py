@@ -1,18 +1,25 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from starlette import status
 from starlette.requests import Request
 
 from services import CatalogService
 from services.catalog.models import AvailableCheckoutItem
 from services.order.errors import CheckoutDataIsEmptyError, InvalidCheckoutDataError
-from services.order.models import Order
+from services.order.constants import ORDER_LIST_PAGE_DEFAULT_SIZE, ORDER_LIST_PAGE_MAX_SIZE
+from services.order.models import Order, OrderList, PaymentLink
 from services.order.service import OrderService
 from services.user.service import UserService
 from transport.constants import SESSION_CHECKOUT_DATA_KEY
-from transport.depends import get_catalog_service, get_order_service, get_user_service
+from transport.depends import (
+    check_waiting_room_admission,
+    get_catalog_service,
+    get_order_service,
+    get_user_service,
+    load_session,
+)
 from transport.depends.auth import check_customer_access
 from transport.handlers.client.order.schemas import (
     CreateOrderRequestSchema,
@@ -20,20 +27,23 @@ from transport.handlers.client.order.schemas import (
     GetCheckoutDataResponseSchema,
     MakeCheckoutRequestSchema,
 )
+from transport.handlers.client.order.utils import idempotent
 from transport.middlewares.logging_middleware import FastAPILoggingRoute
 from utils import USER_IDENTITY_CTX
 
 order_router = APIRouter(
     tags=['order'],
     route_class=FastAPILoggingRoute,
-    dependencies=[Depends(check_customer_access)],
+    dependencies=[Depends(check_customer_access), Depends(load_session)],
 )
 
 
 @order_router.post(
     path='/checkout',
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(check_waiting_room_admission)],
 )
+@idempotent
 async def make_checkout(
     request: Request,
     user_service: Annotated[UserService, Depends(get_user_service)],
@@ -75,7 +85,9 @@ async def get_checkout_data(request: Request):
     summary='Make order',
     status_code=200,
     response_model=CreateOrderResponseSchema,
+    dependencies=[Depends(check_waiting_room_admission)],
 )
+@idempotent
 async def make_order_entrypoint(
     order_service: Annotated[OrderService, Depends(get_order_service)],
     catalog_service: Annotated[CatalogService, Depends(get_catalog_service)],
@@ -95,7 +107,7 @@ async def make_order_entrypoint(
 
     await catalog_service.reserve_catalog_items(items=checkout_items)
 
-    payment_link = await order_service.create_order(
+    order_id = await order_service.create_order(
         user=USER_IDENTITY_CTX.get(),
         credit_items_ids=order.credit_ids,
         delivery_data=order.delivery_data if not is_preorder else None,
@@ -107,28 +119,31 @@ async def make_order_entrypoint(
         item_ids=[item.id for item in checkout_items],
     )
 
-    return CreateOrderResponseSchema(payment_link=payment_link)
+    return CreateOrderResponseSchema(order_id=order_id)
 
 
-#
-# @order_router.get(
-#     path='/payment-link',
-#     status_code=status.HTTP_200_OK,
-# )
-# async def get_payment_link_entrypoint(
-#     order_service: Annotated[OrderService, Depends(get_order_service)],
-#     invoice_id: UUID,
-# ):
-#     pass
-#
+@order_router.get(path='/payment-link', status_code=status.HTTP_200_OK, response_model=PaymentLink)
+async def get_payment_link_entrypoint(
+    order_service: Annotated[OrderService, Depends(get_order_service)],
+    order_id: UUID,
+) -> PaymentLink:
+    return await order_service.get_payment_link(
+        order_id=order_id,
+        user_id=USER_IDENTITY_CTX.get().id,
+    )
 
 
-@order_router.get(
-    path='/order-list',
-    status_code=status.HTTP_200_OK,
-)
-async def get_order_list_entrypoint(order_service: Annotated[OrderService, Depends(get_order_service)]):  # noqa
-    pass
+@order_router.get(path='/order-list', status_code=status.HTTP_200_OK, response_model=OrderList)
+async def get_order_list_entrypoint(
+    order_service: Annotated[OrderService, Depends(get_order_service)],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=ORDER_LIST_PAGE_MAX_SIZE)] = ORDER_LIST_PAGE_DEFAULT_SIZE,
+) -> OrderList:
+    return await order_service.get_user_orders_page(
+        user_id=USER_IDENTITY_CTX.get().id,
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 @order_router.get(path='/order', status_code=status.HTTP_200_OK, response_model=Order)
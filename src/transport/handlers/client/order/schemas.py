@@ -13,7 +13,8 @@ class CreateOrderRequestSchema(SGBaseModel):
 
 
 class CreateOrderResponseSchema(SGBaseModel):
-    payment_link: str
+    order_id: UUID
+    payment_link: str | None = None
 
 
 class MakeCheckoutRequestSchema(SGBaseModel):
@@ -0,0 +1,41 @@
+import hashlib
+from collections.abc import Awaitable, Callable
+from functools import partial, wraps
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from services.order.idempotency import IdempotencyStore
+from transport.constants import IDEMPOTENCY_KEY_HEADER
+from utils import USER_IDENTITY_CTX
+
+
+def idempotent(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs) -> Any:
+        request = kwargs['request']
+        if not (idempotency_key := request.headers.get(IDEMPOTENCY_KEY_HEADER)):
+            return await endpoint(*args, **kwargs)
+
+        store = IdempotencyStore()
+        key = f'{USER_IDENTITY_CTX.get().id}:{request.url.path}:{idempotency_key}'
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+
+        is_replay, result = await store.begin(key, fingerprint)
+        if is_replay:
+            return result
+
+        try:
+            result = await endpoint(*args, **kwargs)
+        except Exception:
+            await store.abort(key)
+            raise
+
+        SQLAlchemyClient().add_after_commit_callback(
+            partial(store.complete, key, fingerprint, jsonable_encoder(result, by_alias=True)),
+        )
+        SQLAlchemyClient().add_rollback_callback(partial(store.abort, key))
+        return result
+
+    return wrapper
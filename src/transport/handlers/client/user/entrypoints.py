@@ -10,11 +10,16 @@ from services import CatalogService
 from services.user.constants import IncrementActionType
 from services.user.models import CartItem, UserItems
 from services.user.service import UserService
-from transport.depends import get_catalog_service, get_user_service
+from transport.depends import get_catalog_service, get_user_service, load_session
 from transport.middlewares.logging_middleware import FastAPILoggingRoute
 from utils import USER_IDENTITY_CTX
 
-user_router = APIRouter(tags=['user'], prefix='/user', route_class=FastAPILoggingRoute)
+user_router = APIRouter(
+    tags=['user'],
+    prefix='/user',
+    route_class=FastAPILoggingRoute,
+    dependencies=[Depends(load_session)],
+)
 
 
 @user_router.get(
@@ -64,7 +69,7 @@ async def add_item_to_cart(
     request: Request,
 ) -> None:
     if not (user := USER_IDENTITY_CTX.get()):
-        request.session.get('cart').update({str(item_id): 1})
+        request.session.setdefault('cart', {}).update({str(item_id): 1})
         return
 
     await user_service.add_item_to_cart(user_id=user.id, item_id=item_id)
@@ -85,7 +90,7 @@ async def change_cart_item_quantity(
 
     await user_service.change_cart_item_quantity(
         item_id=item_id,
-        session_cart=request.session.get('cart'),
+        session_cart=request.session.setdefault('cart', {}),
         available_items=catalog_item_quantity.available,
         is_increment_action=action == IncrementActionType.INCREMENT,
     )
@@ -0,0 +1,41 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from starlette import status
+
+from services.waiting_room.models import WaitingRoomStatus
+from services.waiting_room.service import WaitingRoomService
+from transport.depends import get_waiting_room_service
+from transport.depends.auth import check_customer_access
+from transport.middlewares.logging_middleware import FastAPILoggingRoute
+from utils import USER_IDENTITY_CTX
+
+waiting_room_router = APIRouter(
+    tags=['waiting-room'],
+    prefix='/waiting-room',
+    route_class=FastAPILoggingRoute,
+    dependencies=[Depends(check_customer_access)],
+)
+
+
+@waiting_room_router.post(
+    path='',
+    status_code=status.HTTP_201_CREATED,
+    response_model=WaitingRoomStatus,
+)
+async def join_waiting_room_entrypoint(
+    waiting_room_service: Annotated[WaitingRoomService, Depends(get_waiting_room_service)],
+) -> WaitingRoomStatus:
+    return await waiting_room_service.join(user_id=USER_IDENTITY_CTX.get().id)
+
+
+@waiting_room_router.get(
+    path='',
+    status_code=status.HTTP_200_OK,
+    response_model=WaitingRoomStatus,
+)
+async def get_waiting_room_status_entrypoint(
+    waiting_room_service: Annotated[WaitingRoomService, Depends(get_waiting_room_service)],
+    ticket: str,
+) -> WaitingRoomStatus:
+    return await waiting_room_service.get_status(user_id=USER_IDENTITY_CTX.get().id, ticket=ticket)
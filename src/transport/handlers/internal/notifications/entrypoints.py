@@ -24,7 +24,7 @@ async def notification_handler(
     if not notification_data.verify():
         raise UnknownAnswerError
 
-    await order_service.update_payment_status(payment_notification=notification_data)
+    await order_service.enqueue_payment_notification(payment_notification=notification_data)
 
     return 'OK'
 
@@ -0,0 +1,91 @@
+from collections.abc import Iterator, MutableMapping
+from secrets import token_urlsafe
+from typing import Any
+
+import orjson
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from errors.transport import SessionNotLoadedError
+from integrations.redis.client import RedisClient
+from transport.constants import SESSION_COOKIE_NAME, SESSION_KEY, SESSION_TTL
+
+
+class RedisSession(MutableMapping):
+    def __init__(self, session_id: str | None) -> None:
+        self.session_id = session_id
+        self.payload: str | None = None
+        self._data: dict | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    async def load(self) -> 'RedisSession':
+        if self._data is None:
+            if self.session_id:
+                self.payload = await RedisClient().client.getex(f'{SESSION_KEY}:{self.session_id}', ex=SESSION_TTL)
+            self._data = orjson.loads(self.payload) if self.payload else {}
+        return self
+
+    @property
+    def _loaded_data(self) -> dict:
+        if self._data is None:
+            raise SessionNotLoadedError
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._loaded_data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._loaded_data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._loaded_data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaded_data)
+
+    def __len__(self) -> int:
+        return len(self._loaded_data)
+
+
+class RedisSessionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] not in {'http', 'websocket'}:
+            await self.app(scope, receive, send)
+            return
+
+        logger.trace('RedisSessionMiddleware')
+        session = RedisSession(HTTPConnection(scope).cookies.get(SESSION_COOKIE_NAME))
+        scope['session'] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start' and session.is_loaded:
+                await self._save_session(session, message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    async def _save_session(session: RedisSession, message: Message) -> None:
+        new_payload = orjson.dumps(dict(session)).decode() if session else None
+        headers = MutableHeaders(scope=message)
+        if new_payload is None:
+            if session.payload is not None:
+                await RedisClient().client.delete(f'{SESSION_KEY}:{session.session_id}')
+                headers.append('Set-Cookie', f'{SESSION_COOKIE_NAME}=null; path=/; Max-Age=0; httponly; samesite=lax')
+            return
+
+        session_id = session.session_id if session.payload is not None else token_urlsafe(32)
+        if new_payload != session.payload:
+            await RedisClient().client.set(f'{SESSION_KEY}:{session_id}', new_payload, ex=SESSION_TTL)
+        headers.append(
+            'Set-Cookie',
+            f'{SESSION_COOKIE_NAME}={session_id}; path=/; Max-Age={SESSION_TTL}; httponly; samesite=lax',
+        )
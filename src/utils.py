@@ -1,9 +1,11 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from contextvars import ContextVar
 from typing import Any
 
 import orjson
 from poetry.toml import TOMLFile
 
+from errors.transport import InvalidCursorError
 from integrations.ory_kratos.models import UserIdentity
 from settings import Settings
 
@@ -28,3 +30,18 @@ def dump_json(
         default=default,
         option=option,
     ).decode()
+
+
+def encode_cursor(values: list[Any]) -> str:
+    return urlsafe_b64encode(orjson.dumps(values, default=str)).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = orjson.loads(urlsafe_b64decode(cursor.encode()))
+    except ValueError as exc:
+        raise InvalidCursorError(debug=str(exc)) from exc
+
+    if not isinstance(values, list):
+        raise InvalidCursorError
+    return values
@@ -0,0 +1,23 @@
+from workers.base import PeriodicWorker
+from workers.inventory import InventoryFlushWorker, InventoryReconcileWorker
+from workers.orders import OrderExpirationWorker
+from workers.payments import CreditBillingWorker, PaymentInitWorker, PaymentNotificationWorker, PaymentReconcileWorker
+from workers.recommendations import RecommendationsWorker
+from workers.stock_shards import StockShardsSyncWorker
+
+WORKERS: list[type[PeriodicWorker]] = [
+    RecommendationsWorker,
+    InventoryFlushWorker,
+    InventoryReconcileWorker,
+    OrderExpirationWorker,
+    PaymentInitWorker,
+    PaymentNotificationWorker,
+    CreditBillingWorker,
+    PaymentReconcileWorker,
+    StockShardsSyncWorker,
+]
+
+__all__ = [
+    'WORKERS',
+    'PeriodicWorker',
+]
@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+
+from loguru import logger
+
+from integrations.redis.client import RedisClient
+from workers.constants import WORKER_LOCK_KEY
+
+
+class PeriodicWorker(ABC):
+    name: str
+    interval: int
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return True
+
+    @abstractmethod
+    async def run_once(self) -> None:
+        pass
+
+    async def _acquire_run(self) -> bool:
+        return bool(await RedisClient().client.set(f'{WORKER_LOCK_KEY}:{self.name}', 1, nx=True, ex=self.interval))
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                if await self._acquire_run():
+                    logger.debug(f'Worker {self.name} run started')
+                    await self.run_once()
+            except Exception as exc:
+                logger.error(f'Worker {self.name} run failed: {exc}')
+
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run_forever(), name=f'worker:{self.name}')
+        logger.trace(f'Worker {self.name} started')
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.trace(f'Worker {self.name} stopped')
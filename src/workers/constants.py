@@ -0,0 +1,16 @@
+WORKER_LOCK_KEY = 'worker:lock'
+
+RECOMMENDATIONS_REFRESH_INTERVAL = 10 * 60
+
+ORDER_EXPIRATION_INTERVAL = 60
+
+PAYMENT_INIT_INTERVAL = 1
+PAYMENT_NOTIFICATION_INTERVAL = 1
+
+CREDIT_BILLING_INTERVAL = 60 * 60
+PAYMENT_RECONCILE_INTERVAL = 10 * 60
+
+STOCK_SHARDS_SYNC_INTERVAL = 5
+
+INVENTORY_FLUSH_INTERVAL = 2
+INVENTORY_RECONCILE_INTERVAL = 60
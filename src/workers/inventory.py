@@ -0,0 +1,43 @@
+from abc import abstractmethod
+
+from database.repositories import CatalogRepository
+from integrations.redis.client import RedisClient
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from services import CatalogService
+from services.catalog.constants import INVENTORY_LOCK_KEY, INVENTORY_LOCK_TIMEOUT
+from settings import Settings
+from workers.base import PeriodicWorker
+from workers.constants import INVENTORY_FLUSH_INTERVAL, INVENTORY_RECONCILE_INTERVAL
+
+
+class InventoryWorker(PeriodicWorker):
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return Settings().env.inventory_engine_enabled
+
+    async def run_once(self) -> None:
+        async with (
+            RedisClient().client.lock(INVENTORY_LOCK_KEY, timeout=INVENTORY_LOCK_TIMEOUT),
+            SQLAlchemyClient().session_scope(),
+        ):
+            await self.run_locked(CatalogService(catalog_repository=CatalogRepository()))
+
+    @abstractmethod
+    async def run_locked(self, service: CatalogService) -> None:
+        pass
+
+
+class InventoryFlushWorker(InventoryWorker):
+    name = 'inventory-flush'
+    interval = INVENTORY_FLUSH_INTERVAL
+
+    async def run_locked(self, service: CatalogService) -> None:
+        await service.flush_inventory_reservations()
+
+
+class InventoryReconcileWorker(InventoryWorker):
+    name = 'inventory-reconcile'
+    interval = INVENTORY_RECONCILE_INTERVAL
+
+    async def run_locked(self, service: CatalogService) -> None:
+        await service.reconcile_inventory()
@@ -0,0 +1,34 @@
+from loguru import logger
+
+from database.repositories import CatalogRepository
+from database.repositories.order import OrderRepository
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from integrations.tinkoff.client import TinkoffClient
+from services import CatalogService
+from services.order.constants import ORDER_EXPIRATION_BATCH_SIZE
+from services.order.service import OrderService
+from workers.base import PeriodicWorker
+from workers.constants import ORDER_EXPIRATION_INTERVAL
+
+
+class OrderExpirationWorker(PeriodicWorker):
+    name = 'order-expiration'
+    interval = ORDER_EXPIRATION_INTERVAL
+
+    async def run_once(self) -> None:
+        async with TinkoffClient() as tinkoff_client:
+            order_service = OrderService(order_repository=OrderRepository(), tinkoff_client=tinkoff_client)
+            catalog_service = CatalogService(catalog_repository=CatalogRepository())
+
+            while True:
+                async with SQLAlchemyClient().session_scope():
+                    order_ids, released_items = await order_service.cancel_expired_orders(
+                        limit=ORDER_EXPIRATION_BATCH_SIZE,
+                    )
+                    if released_items:
+                        await catalog_service.release_catalog_items(released_items)
+
+                if order_ids:
+                    logger.info(f'Canceled {len(order_ids)} expired orders')
+                if len(order_ids) < ORDER_EXPIRATION_BATCH_SIZE:
+                    break
@@ -0,0 +1,97 @@
+from loguru import logger
+
+from database.repositories.order import OrderRepository
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from integrations.tinkoff.client import TinkoffClient
+from services.order.constants import (
+    CREDIT_BILLING_BATCH_SIZE,
+    PAYMENT_INIT_BATCH_SIZE,
+    PAYMENT_NOTIFICATION_BATCH_SIZE,
+    PAYMENT_RECONCILE_BATCH_SIZE,
+)
+from services.order.service import OrderService
+from workers.base import PeriodicWorker
+from workers.constants import (
+    CREDIT_BILLING_INTERVAL,
+    PAYMENT_INIT_INTERVAL,
+    PAYMENT_NOTIFICATION_INTERVAL,
+    PAYMENT_RECONCILE_INTERVAL,
+)
+
+
+class PaymentInitWorker(PeriodicWorker):
+    name = 'payment-init'
+    interval = PAYMENT_INIT_INTERVAL
+
+    async def run_once(self) -> None:
+        async with TinkoffClient() as tinkoff_client:
+            order_service = OrderService(order_repository=OrderRepository(), tinkoff_client=tinkoff_client)
+
+            while True:
+                async with SQLAlchemyClient().session_scope():
+                    processed = await order_service.process_payment_inits(limit=PAYMENT_INIT_BATCH_SIZE)
+
+                if processed:
+                    logger.info(f'Processed {processed} payment inits')
+                if processed < PAYMENT_INIT_BATCH_SIZE:
+                    break
+
+
+class PaymentNotificationWorker(PeriodicWorker):
+    name = 'payment-notification'
+    interval = PAYMENT_NOTIFICATION_INTERVAL
+
+    async def run_once(self) -> None:
+        async with TinkoffClient() as tinkoff_client:
+            order_service = OrderService(order_repository=OrderRepository(), tinkoff_client=tinkoff_client)
+
+            while True:
+                async with SQLAlchemyClient().session_scope():
+                    applied = await order_service.apply_payment_notifications(limit=PAYMENT_NOTIFICATION_BATCH_SIZE)
+
+                if applied:
+                    logger.info(f'Applied {applied} payment notifications')
+                if applied < PAYMENT_NOTIFICATION_BATCH_SIZE:
+                    break
+
+
+class CreditBillingWorker(PeriodicWorker):
+    name = 'credit-billing'
+    interval = CREDIT_BILLING_INTERVAL
+
+    async def run_once(self) -> None:
+        async with TinkoffClient() as tinkoff_client:
+            order_service = OrderService(order_repository=OrderRepository(), tinkoff_client=tinkoff_client)
+
+            while True:
+                async with SQLAlchemyClient().session_scope():
+                    collected = await order_service.collect_due_credit_invoices(limit=CREDIT_BILLING_BATCH_SIZE)
+
+                if collected:
+                    logger.info(f'Initiated {collected} credit payments')
+                if collected < CREDIT_BILLING_BATCH_SIZE:
+                    break
+
+
+class PaymentReconcileWorker(PeriodicWorker):
+    name = 'payment-reconcile'
+    interval = PAYMENT_RECONCILE_INTERVAL
+
+    async def run_once(self) -> None:
+        async with TinkoffClient() as tinkoff_client:
+            order_service = OrderService(order_repository=OrderRepository(), tinkoff_client=tinkoff_client)
+
+            after_id, reconciled = None, 0
+            while True:
+                async with SQLAlchemyClient().session_scope():
+                    after_id, changed = await order_service.reconcile_payments(
+                        after_id=after_id,
+                        limit=PAYMENT_RECONCILE_BATCH_SIZE,
+                    )
+
+                reconciled += changed
+                if after_id is None:
+                    break
+
+            if reconciled:
+                logger.info(f'Reconciled {reconciled} payments')
@@ -0,0 +1,14 @@
+from database.repositories import CatalogRepository
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from services import CatalogService
+from workers.base import PeriodicWorker
+from workers.constants import RECOMMENDATIONS_REFRESH_INTERVAL
+
+
+class RecommendationsWorker(PeriodicWorker):
+    name = 'recommendations'
+    interval = RECOMMENDATIONS_REFRESH_INTERVAL
+
+    async def run_once(self) -> None:
+        async with SQLAlchemyClient().session_scope():
+            await CatalogService(catalog_repository=CatalogRepository()).refresh_recommendations()
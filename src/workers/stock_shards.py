@@ -0,0 +1,14 @@
+from database.repositories import CatalogRepository
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from services import CatalogService
+from workers.base import PeriodicWorker
+from workers.constants import STOCK_SHARDS_SYNC_INTERVAL
+
+
+class StockShardsSyncWorker(PeriodicWorker):
+    name = 'stock-shards-sync'
+    interval = STOCK_SHARDS_SYNC_INTERVAL
+
+    async def run_once(self) -> None:
+        async with SQLAlchemyClient().session_scope():
+            await CatalogService(catalog_repository=CatalogRepository()).sync_stock_shards()
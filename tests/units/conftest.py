@@ -0,0 +1,98 @@
+import os
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from pytest_postgresql.janitor import DatabaseJanitor
+from sqlalchemy import NullPool, URL
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
+
+TEST_ENV = {
+    'ENVIRONMENT': 'test',
+    'BACKEND_SESSION_SECRET_KEY': 'test',
+    'POSTGRES_DRIVER': 'postgresql+asyncpg',
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5432',
+    'POSTGRES_USER': 'root',
+    'POSTGRES_PASSWORD': '15243',
+    'POSTGRES_DATABASE': 'test',
+    'S3_ACCESS_KEY_ID': 'test',
+    'S3_SECRET_ACCESS_KEY': 'test',
+    'S3_BUCKET_NAME': 'test',
+    'S3_ENDPOINT_URL': 'http://localhost:9000',
+    'S3_REGION_NAME': 'test',
+    'S3_PUBLIC_URL': 'http://localhost:9000',
+    'ORY_KRATOS_PUBLIC_URL': 'http://localhost:4433',
+    'ORY_KRATOS_ADMIN_URL': 'http://localhost:4434',
+    'ORY_KRATOS_SESSION_COOKIE': 'ory_kratos_session',
+    'ORY_KRATOS_ADMIN_SCHEMA': 'admin',
+    'TINKOFF_INTEGRATION_TERMINAL_KEY': 'test',
+    'TINKOFF_INTEGRATION_PASSWORD': 'test',
+    'TINKOFF_INTEGRATION_URL': 'http://localhost:8080',
+    'CDEK_INTEGRATION_CLIENT_ID': 'test',
+    'CDEK_INTEGRATION_PASSWORD': 'test',
+    'CDEK_INTEGRATION_URL': 'http://localhost:8081',
+    'REDIS_DSN': 'redis://localhost:6379',
+    'SENTRY_DSN': '',
+    'PUBLIC_HOST': 'http://localhost:8000',
+    'WORKERS_ENABLED': 'false',
+}
+
+for name, value in TEST_ENV.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+async def redis():
+    from integrations.redis.client import RedisClient
+
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    RedisClient()._client = client
+    yield client
+    await client.flushall()
+    await client.close()
+
+
+@pytest.fixture(scope='session')
+def database():
+    from settings import Settings
+
+    settings = Settings().env.postgres
+    with DatabaseJanitor(
+        user=settings.user,
+        host=settings.host,
+        port=settings.port,
+        password=settings.password,
+        dbname=f'{settings.database}_{uuid4().hex[:8]}',
+        version=16,
+    ) as janitor:
+        yield URL.create(
+            drivername=settings.driver,
+            username=settings.user,
+            password=settings.password,
+            host=settings.host,
+            port=settings.port,
+            database=janitor.dbname,
+        )
+
+
+@pytest.fixture
+async def db(database):
+    from integrations.sql_alchemy.client import SQLAlchemyClient
+    from utils import TRACE_ID
+
+    client = SQLAlchemyClient()
+    client.engine = create_async_engine(database, poolclass=NullPool)
+    client._ctx_session_manager = async_scoped_session(
+        async_sessionmaker(autoflush=True, expire_on_commit=False, bind=client.engine),
+        scopefunc=TRACE_ID.get,
+    )
+    await client.create_all_tables()
+
+    token = TRACE_ID.set(str(uuid4()))
+    yield client
+    await client.close_ctx_session()
+    await client.clear_all_tables()
+    await client.close_ctx_session()
+    await client.engine.dispose()
+    TRACE_ID.reset(token)
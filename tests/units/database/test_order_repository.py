@@ -0,0 +1,85 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from database.models import InvoiceORM, OrderORM, PaymentORM
+from database.repositories.order import OrderRepository, PaymentStatusDTO, PaymentStatusUpdateDTO
+from services.order.constants import InvoiceStatus, InvoiceType, OrderStatus, PAYMENT_FINAL_STATUSES
+
+
+@pytest.fixture
+async def invoice_id(db):
+    repository = OrderRepository()
+    order_id = await repository.create(OrderORM(user_id=uuid4(), status=OrderStatus.UNPAID.value))
+    invoice_id = await repository.create(
+        InvoiceORM(
+            order_id=order_id,
+            title='Оплата заказа',
+            type=InvoiceType.INITIAL.value,
+            amount=1000,
+            status=InvoiceStatus.UNPAID.value,
+        )
+    )
+    for payment_id, status in [(1, 'NEW'), (2, 'CONFIRMED')]:
+        await repository.create(
+            PaymentORM(invoice_id=invoice_id, url=f'https://pay/{payment_id}', status=status, external_id=payment_id)
+        )
+    return invoice_id
+
+
+async def get_payment_statuses(db) -> dict[int, str]:
+    payments = await db.get_session().execute(select(PaymentORM.external_id, PaymentORM.status))
+    return {payment_id: status for payment_id, status in payments}
+
+
+async def test_duplicate_payment_notification_is_stored_once(db):
+    repository = OrderRepository()
+    invoice_id = uuid4()
+
+    for status in ['AUTHORIZED', 'AUTHORIZED', 'CONFIRMED']:
+        await repository.enqueue_payment_notification(invoice_id=invoice_id, payment_id=1, status=status)
+
+    notifications = await repository.lock_pending_payment_notifications(limit=10)
+    assert sorted((notification.payment_id, notification.status) for notification in notifications) == [
+        (1, 'AUTHORIZED'),
+        (1, 'CONFIRMED'),
+    ]
+
+
+async def test_payment_status_is_updated(db, invoice_id):
+    updated = await OrderRepository().update_payment_statuses(
+        [PaymentStatusUpdateDTO(invoice_id=invoice_id, payment_id=1, status='AUTHORIZED')],
+        final_statuses=PAYMENT_FINAL_STATUSES,
+    )
+
+    assert updated == [PaymentStatusDTO(invoice_id=invoice_id, payment_id=1, status='AUTHORIZED')]
+    assert await get_payment_statuses(db) == {1: 'AUTHORIZED', 2: 'CONFIRMED'}
+
+
+async def test_payment_status_is_not_updated_when_old_status_changed(db, invoice_id):
+    await OrderRepository().update_payment_statuses(
+        [PaymentStatusUpdateDTO(invoice_id=invoice_id, payment_id=1, status='AUTHORIZED')],
+        final_statuses=PAYMENT_FINAL_STATUSES,
+    )
+
+    updated = await OrderRepository().update_payment_statuses(
+        [PaymentStatusUpdateDTO(invoice_id=invoice_id, payment_id=1, status='REJECTED', old_status='NEW')],
+        final_statuses=PAYMENT_FINAL_STATUSES,
+    )
+
+    assert updated == []
+    assert await get_payment_statuses(db) == {1: 'AUTHORIZED', 2: 'CONFIRMED'}
+
+
+async def test_final_payment_status_is_kept(db, invoice_id):
+    updated = await OrderRepository().update_payment_statuses(
+        [
+            PaymentStatusUpdateDTO(invoice_id=invoice_id, payment_id=2, status='AUTHORIZED'),
+            PaymentStatusUpdateDTO(invoice_id=invoice_id, payment_id=2, status='REJECTED', old_status='CONFIRMED'),
+        ],
+        final_statuses=PAYMENT_FINAL_STATUSES,
+    )
+
+    assert updated == []
+    assert await get_payment_statuses(db) == {1: 'NEW', 2: 'CONFIRMED'}
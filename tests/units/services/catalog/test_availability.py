@@ -0,0 +1,82 @@
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+
+from services.catalog.availability import AvailabilityFeed
+from services.catalog.constants import AVAILABILITY_CHANGES_KEY, AVAILABILITY_FLOOR_KEY
+from services.catalog.service import CatalogService
+from transport.handlers.client.catalog.entrypoints import get_catalog_availability_entrypoint
+
+
+@pytest.fixture
+def item_ids():
+    return [uuid4() for _ in range(3)]
+
+
+@pytest.fixture
+def loader(item_ids):
+    return AsyncMock(return_value=item_ids[:1])
+
+
+async def test_full_snapshot_is_seeded_once(redis, item_ids, loader):
+    first = await AvailabilityFeed().get_changes(since_version=None, loader=loader)
+    second = await AvailabilityFeed().get_changes(since_version=None, loader=loader)
+
+    assert first.is_full
+    assert first.version == second.version == 1
+    assert first.available == [item_ids[0]]
+    loader.assert_awaited_once()
+
+
+async def test_delta_contains_only_changed_items(redis, item_ids, loader):
+    await AvailabilityFeed().seed(loader)
+    await AvailabilityFeed().publish({item_ids[0]: True, item_ids[1]: True})
+    await AvailabilityFeed().publish({item_ids[0]: False})
+
+    changes = await AvailabilityFeed().get_changes(since_version=1, loader=loader)
+
+    assert not changes.is_full
+    assert changes.version == 3
+    assert changes.available == [item_ids[1]]
+    assert changes.unavailable == [item_ids[0]]
+
+
+async def test_publish_before_seed_is_applied_on_seed(redis, item_ids, loader):
+    await AvailabilityFeed().publish({item_ids[0]: False, item_ids[1]: True})
+
+    changes = await AvailabilityFeed().get_changes(since_version=None, loader=loader)
+
+    assert changes.version == 1
+    assert changes.available == [item_ids[1]]
+
+
+async def test_trimmed_changes_raise_floor_and_force_full_snapshot(redis, monkeypatch, item_ids, loader):
+    monkeypatch.setattr('services.catalog.availability.AVAILABILITY_CHANGES_LIMIT', 2)
+    await AvailabilityFeed().seed(loader)
+    for item_id in item_ids:
+        await AvailabilityFeed().publish({item_id: item_id != item_ids[0]})
+
+    assert await redis.zcard(AVAILABILITY_CHANGES_KEY) == 2
+    assert await redis.get(AVAILABILITY_FLOOR_KEY) == '2'
+
+    stale = await AvailabilityFeed().get_changes(since_version=1, loader=loader)
+    assert stale.is_full
+    assert sorted(stale.available) == sorted(item_ids[1:])
+
+    delta = await AvailabilityFeed().get_changes(since_version=2, loader=loader)
+    assert not delta.is_full
+    assert sorted(delta.available) == sorted(item_ids[1:])
+
+
+async def test_unchanged_version_returns_not_modified(redis, loader):
+    catalog_repository = AsyncMock(get_available_catalog_item_ids=loader)
+    await AvailabilityFeed().seed(loader)
+
+    response = await get_catalog_availability_entrypoint(
+        catalog_service=CatalogService(catalog_repository),
+        since_version=1,
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
@@ -0,0 +1,58 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from database.constants import CatalogSortOrder
+from database.repositories.catalog import CatalogItemsFilterDTO, CatalogItemsKeyDTO
+from errors.transport import InvalidCursorError
+from services.catalog.service import CatalogService
+from utils import encode_cursor
+
+
+@pytest.fixture
+def catalog_repository():
+    repository = AsyncMock()
+    repository.get_catalog_items_page_json.return_value = b'[]'
+    return repository
+
+
+async def test_cursor_is_passed_as_keyset(catalog_repository):
+    item_id = uuid4()
+
+    await CatalogService(catalog_repository).get_catalog_items_page(
+        filters=CatalogItemsFilterDTO(),
+        sort=CatalogSortOrder.PRICE_ASC,
+        limit=10,
+        cursor=encode_cursor([CatalogSortOrder.PRICE_ASC.value, 1500, item_id]),
+    )
+
+    catalog_repository.get_catalog_items_page_json.assert_awaited_once_with(
+        filters=CatalogItemsFilterDTO(),
+        sort=CatalogSortOrder.PRICE_ASC,
+        after=CatalogItemsKeyDTO(value=1500, id=item_id),
+        limit=11,
+    )
+
+
+@pytest.mark.parametrize(
+    ('sort', 'cursor_values'),
+    [
+        (CatalogSortOrder.PRICE_ASC, [CatalogSortOrder.PRICE_DESC.value, 1500, uuid4()]),
+        (CatalogSortOrder.PRICE_ASC, [CatalogSortOrder.PRICE_ASC.value, datetime.now(UTC), uuid4()]),
+        (CatalogSortOrder.NEWEST, [CatalogSortOrder.NEWEST.value, 1500, uuid4()]),
+        (CatalogSortOrder.NEWEST, [CatalogSortOrder.NEWEST.value, datetime.now(UTC)]),
+        (CatalogSortOrder.NEWEST, [CatalogSortOrder.NEWEST.value, datetime.now(UTC), 'not-an-id']),
+    ],
+)
+async def test_cursor_not_matching_sort_is_rejected(catalog_repository, sort, cursor_values):
+    with pytest.raises(InvalidCursorError):
+        await CatalogService(catalog_repository).get_catalog_items_page(
+            filters=CatalogItemsFilterDTO(),
+            sort=sort,
+            limit=10,
+            cursor=encode_cursor(cursor_values),
+        )
+
+    catalog_repository.get_catalog_items_page_json.assert_not_awaited()
@@ -0,0 +1,108 @@
+from uuid import uuid4
+
+import pytest
+
+from database.repositories.catalog import CatalogItemStockDTO
+from services.catalog.constants import (
+    INVENTORY_DEADLINES_KEY,
+    INVENTORY_INFLIGHT_KEY,
+    INVENTORY_RESERVATIONS_KEY,
+    INVENTORY_STOCK_KEY,
+    INVENTORY_UNLIMITED,
+)
+from services.catalog.inventory import InventoryEngine
+
+
+@pytest.fixture
+def item_id():
+    return uuid4()
+
+
+@pytest.fixture
+def unlimited_item_id():
+    return uuid4()
+
+
+@pytest.fixture
+async def engine(redis, item_id, unlimited_item_id):
+    engine = InventoryEngine()
+    await engine.load(
+        [
+            CatalogItemStockDTO(id=item_id, total=5, ordered=0),
+            CatalogItemStockDTO(id=unlimited_item_id, total=None, ordered=0),
+        ]
+    )
+    return engine
+
+
+async def test_reserve_takes_stock_into_flight(engine, redis, item_id, unlimited_item_id):
+    reservation = await engine.reserve({item_id: 2, unlimited_item_id: 10})
+
+    assert reservation.id is not None
+    assert reservation.remaining == {item_id: 3, unlimited_item_id: None}
+    assert await redis.hget(INVENTORY_INFLIGHT_KEY, str(item_id)) == '2'
+    assert await redis.hexists(INVENTORY_RESERVATIONS_KEY, reservation.id)
+
+
+async def test_reserve_is_all_or_nothing(engine, redis, item_id, unlimited_item_id):
+    missing_id = uuid4()
+
+    missing = await engine.reserve({item_id: 1, missing_id: 1})
+    failed = await engine.reserve({unlimited_item_id: 1, item_id: 6})
+
+    assert missing.missing_ids == [missing_id]
+    assert failed.failed_ids == [item_id]
+    assert await redis.hget(INVENTORY_STOCK_KEY, str(item_id)) == '5'
+    assert not await redis.exists(INVENTORY_INFLIGHT_KEY, INVENTORY_RESERVATIONS_KEY)
+
+
+async def test_confirm_moves_reservation_to_pending(engine, redis, item_id):
+    reservation = await engine.reserve({item_id: 2})
+
+    await engine.confirm(reservation.id, {item_id: 2})
+    await engine.release(reservation.id)
+
+    assert await engine.get_pending() == {item_id: 2}
+    assert await redis.hget(INVENTORY_STOCK_KEY, str(item_id)) == '3'
+    assert not await redis.exists(INVENTORY_INFLIGHT_KEY, INVENTORY_RESERVATIONS_KEY, INVENTORY_DEADLINES_KEY)
+
+    await engine.acknowledge_pending({item_id: 2})
+    assert await engine.get_pending() == {}
+
+
+async def test_release_returns_stock(engine, redis, item_id, unlimited_item_id):
+    reservation = await engine.reserve({item_id: 2, unlimited_item_id: 1})
+
+    await engine.release(reservation.id)
+    await engine.release(reservation.id)
+
+    assert await redis.hgetall(INVENTORY_STOCK_KEY) == {str(item_id): '5', str(unlimited_item_id): INVENTORY_UNLIMITED}
+    assert not await redis.exists(INVENTORY_INFLIGHT_KEY, INVENTORY_RESERVATIONS_KEY, INVENTORY_DEADLINES_KEY)
+
+
+async def test_expire_releases_only_stale_reservations(engine, redis, monkeypatch, item_id):
+    fresh = await engine.reserve({item_id: 1})
+    monkeypatch.setattr('services.catalog.inventory.INVENTORY_RESERVATION_TTL', -1)
+    stale = await engine.reserve({item_id: 2})
+
+    assert await engine.expire_reservations() == 1
+    assert await redis.hget(INVENTORY_STOCK_KEY, str(item_id)) == '4'
+    assert await redis.hget(INVENTORY_INFLIGHT_KEY, str(item_id)) == '1'
+
+    await engine.confirm(stale.id, {item_id: 2})
+    await engine.confirm(fresh.id, {item_id: 1})
+
+    assert await engine.get_pending() == {item_id: 3}
+    assert not await redis.exists(INVENTORY_INFLIGHT_KEY)
+
+
+async def test_load_overwrite_subtracts_inflight_and_pending(engine, redis, item_id):
+    confirmed = await engine.reserve({item_id: 1})
+    await engine.confirm(confirmed.id, {item_id: 1})
+    await engine.reserve({item_id: 2})
+
+    await engine.load([CatalogItemStockDTO(id=item_id, total=10, ordered=0)])
+    assert await redis.hget(INVENTORY_STOCK_KEY, str(item_id)) == '2'
+
+    await engine.load([CatalogItemStockDTO(id=item_id, total=10, ordered=0)], overwrite=True)
+    assert await redis.hget(INVENTORY_STOCK_KEY, str(item_id)) == '7'
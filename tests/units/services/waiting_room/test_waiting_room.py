@@ -0,0 +1,68 @@
+from uuid import uuid4
+
+import pytest
+
+from services.waiting_room.errors import InvalidWaitingRoomTicketError, WaitingRoomAdmissionRequiredError
+from services.waiting_room.service import WaitingRoomService
+from services.waiting_room.utils import sign_token, unsign_token
+from settings import Settings
+
+
+@pytest.fixture
+def waiting_room_settings(monkeypatch):
+    settings = Settings().env.waiting_room
+    monkeypatch.setattr(settings, 'enabled', True)
+    monkeypatch.setattr(settings, 'admission_max_uses', 2)
+    return settings
+
+
+def test_signed_token_round_trip():
+    token = sign_token('admission', 'user', 42, ttl=60)
+
+    assert unsign_token('admission', 'user', token) == 42
+
+
+@pytest.mark.parametrize(
+    ('scope', 'subject', 'token'),
+    [
+        ('ticket', 'user', sign_token('admission', 'user', 42, ttl=60)),
+        ('admission', 'other-user', sign_token('admission', 'user', 42, ttl=60)),
+        ('admission', 'user', sign_token('admission', 'user', 42, ttl=60).replace('42:', '43:', 1)),
+        ('admission', 'user', sign_token('admission', 'user', 42, ttl=-1)),
+        ('admission', 'user', 'garbage'),
+    ],
+)
+def test_unsign_rejects_foreign_tampered_and_expired_tokens(scope, subject, token):
+    assert unsign_token(scope, subject, token) is None
+
+
+async def test_admission_token_is_bound_to_user(redis, waiting_room_settings):
+    user_id = uuid4()
+    status = await WaitingRoomService().join(user_id)
+
+    assert status.position == 0
+    await WaitingRoomService().check_admission(user_id, status.admission_token)
+    with pytest.raises(WaitingRoomAdmissionRequiredError):
+        await WaitingRoomService().check_admission(uuid4(), status.admission_token)
+    with pytest.raises(InvalidWaitingRoomTicketError):
+        await WaitingRoomService().get_status(uuid4(), status.ticket)
+
+
+async def test_admission_token_has_limited_uses(redis, waiting_room_settings):
+    user_id = uuid4()
+    status = await WaitingRoomService().join(user_id)
+
+    for _ in range(waiting_room_settings.admission_max_uses):
+        await WaitingRoomService().check_admission(user_id, status.admission_token)
+
+    with pytest.raises(WaitingRoomAdmissionRequiredError):
+        await WaitingRoomService().check_admission(user_id, status.admission_token)
+
+
+async def test_admission_is_required_when_enabled(redis, waiting_room_settings):
+    with pytest.raises(WaitingRoomAdmissionRequiredError):
+        await WaitingRoomService().check_admission(uuid4(), None)
+
+
+async def test_admission_is_skipped_when_disabled(redis):
+    await WaitingRoomService().check_admission(uuid4(), None)
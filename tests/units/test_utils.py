@@ -0,0 +1,24 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from errors.transport import InvalidCursorError
+from utils import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    item_id = uuid4()
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+
+    assert decode_cursor(encode_cursor(['NEWEST', created_at, item_id])) == [
+        'NEWEST',
+        created_at.isoformat(),
+        str(item_id),
+    ]
+
+
+@pytest.mark.parametrize('cursor', ['garbage!', 'bm90LWpzb24=', encode_cursor({'sort': 'NEWEST'})])
+def test_decode_cursor_rejects_malformed_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
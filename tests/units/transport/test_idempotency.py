@@ -0,0 +1,108 @@
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+from integrations.ory_kratos.models import UserIdentity
+from integrations.sql_alchemy.client import SQLAlchemyClient
+from services.order.errors import IdempotencyKeyReusedError, IdempotentRequestInProgressError
+from transport.constants import IDEMPOTENCY_KEY_HEADER
+from transport.handlers.client.order.utils import idempotent
+from utils import TRACE_ID, USER_IDENTITY_CTX
+
+
+def make_request(body: bytes, idempotency_key: str = 'key') -> Request:
+    async def receive() -> dict:
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    return Request(
+        {
+            'type': 'http',
+            'method': 'POST',
+            'path': '/api/order',
+            'query_string': b'',
+            'headers': [(IDEMPOTENCY_KEY_HEADER.lower().encode(), idempotency_key.encode())],
+        },
+        receive,
+    )
+
+
+@pytest.fixture(autouse=True)
+async def request_context():
+    trace_token = TRACE_ID.set(str(uuid4()))
+    user_token = USER_IDENTITY_CTX.set(
+        UserIdentity(
+            id=uuid4(),
+            schema_id='customer',
+            state='active',
+            traits={'email': 'user@example.com', 'phone': '+79990000000', 'name': {'first': 'Test', 'last': 'User'}},
+            verified=True,
+            metadata_public=None,
+        )
+    )
+    yield
+    await SQLAlchemyClient().close_ctx_session()
+    USER_IDENTITY_CTX.reset(user_token)
+    TRACE_ID.reset(trace_token)
+
+
+@pytest.fixture
+def endpoint():
+    return AsyncMock(return_value={'order_id': str(uuid4())})
+
+
+async def test_completed_request_is_replayed(redis, endpoint):
+    handler = idempotent(endpoint)
+
+    result = await handler(request=make_request(b'{"creditIds": []}'))
+    await SQLAlchemyClient().run_after_commit_callbacks()
+    replayed = await handler(request=make_request(b'{"creditIds": []}'))
+
+    assert replayed == result
+    endpoint.assert_awaited_once()
+
+
+async def test_rolled_back_request_can_be_retried(redis, endpoint):
+    handler = idempotent(endpoint)
+
+    await handler(request=make_request(b'{}'))
+    await SQLAlchemyClient().run_rollback_callbacks()
+    await handler(request=make_request(b'{}'))
+
+    assert endpoint.await_count == 2
+
+
+async def test_key_reused_with_other_body_is_rejected(redis, endpoint):
+    handler = idempotent(endpoint)
+
+    await handler(request=make_request(b'{"creditIds": []}'))
+    await SQLAlchemyClient().run_after_commit_callbacks()
+
+    with pytest.raises(IdempotencyKeyReusedError) as exc_info:
+        await handler(request=make_request(b'{"creditIds": ["other"]}'))
+    assert exc_info.value.status_code == 422
+
+
+async def test_request_in_progress_is_rejected(redis, monkeypatch, endpoint):
+    monkeypatch.setattr('services.order.idempotency.IDEMPOTENCY_WAIT_TIMEOUT', 0.3)
+    handler = idempotent(endpoint)
+
+    await handler(request=make_request(b'{}'))
+
+    with pytest.raises(IdempotentRequestInProgressError) as exc_info:
+        await handler(request=make_request(b'{}'))
+    assert exc_info.value.status_code == 409
+    endpoint.assert_awaited_once()
+
+
+async def test_request_without_key_is_not_tracked(redis, endpoint):
+    handler = idempotent(endpoint)
+    request = make_request(b'{}')
+    request.scope['headers'] = []
+
+    await handler(request=request)
+    await handler(request=request)
+
+    assert endpoint.await_count == 2
+    assert await redis.keys() == []